@@ -0,0 +1,102 @@
+"""Transfer size and end-to-end time of /parse per Content-Encoding on generated schedules.
+
+Usage (from api-python/):
+    python benchmarks/bench_compression.py [--tasks 1000,10000] [--depth 5]
+        [--custom-fields 10] [--assignments 1] [--iterations 3]
+        [--bandwidth 100,1000] [--ndjson]
+
+Each schedule is generated with schedule_gen and POSTed to /parse through
+Flask's test client (parse cache off, so every request parses) once per
+encoding the service offers, plus identity. The server time covers parsing
+and compressing the body as it is streamed out; the client then decodes it.
+Transfer time is modelled from the body size at each ``--bandwidth`` (Mbit/s),
+and end-to-end time is server + transfer + decode. Levels and the size
+threshold come from the usual PARSE_* environment variables.
+"""
+import argparse
+import gzip
+import io
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['PARSE_CACHE_MAX_MB'] = '0'
+
+import content_encoding
+import schedule_gen
+
+
+def _decoder(encoding):
+    if encoding == content_encoding.GZIP:
+        return gzip.decompress
+    if encoding == content_encoding.BROTLI:
+        return content_encoding.brotli.decompress
+    if encoding == content_encoding.ZSTD:
+        return lambda body: content_encoding.zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    return lambda body: body
+
+
+def measure(client, data, encoding, iterations, query):
+    """Median (server s, decode s) and the (wire, decoded) sizes for one encoding."""
+    server, decode = [], []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        response = client.post(f'/parse{query}', data={'file': (io.BytesIO(data), 'schedule.xml')},
+                               content_type='multipart/form-data', headers={'Accept-Encoding': encoding})
+        body = response.get_data()
+        t1 = time.perf_counter()
+        if response.status_code != 200:
+            sys.exit(f"/parse returned {response.status_code}: {body[:500]!r}")
+        decoded = _decoder(response.headers.get('Content-Encoding'))(body)
+        decode.append(time.perf_counter() - t1)
+        server.append(t1 - t0)
+    return statistics.median(server), statistics.median(decode), len(body), len(decoded)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--tasks', default='1000,10000', help="comma-separated task counts")
+    ap.add_argument('--depth', type=int, default=5)
+    ap.add_argument('--custom-fields', type=int, default=10)
+    ap.add_argument('--assignments', type=float, default=1.0)
+    ap.add_argument('--iterations', type=int, default=3)
+    ap.add_argument('--bandwidth', default='100,1000', help="comma-separated link speeds in Mbit/s")
+    ap.add_argument('--ndjson', action='store_true', help="measure the streamed format=ndjson response")
+    args = ap.parse_args()
+
+    import mpp_parser
+    if not mpp_parser.init_jvm():
+        sys.exit("JVM failed to start")
+    client = mpp_parser.app.test_client()
+    encodings = ('identity',) + mpp_parser.response_encoder.encodings
+    bandwidths = [float(value) for value in args.bandwidth.split(',') if value.strip()]
+    query = '?format=ndjson' if args.ndjson else ''
+    levels = mpp_parser.response_encoder.stats()['levels']
+    print(f"levels {levels}, threshold {mpp_parser.response_encoder.min_bytes} bytes")
+
+    workdir = tempfile.mkdtemp(prefix='bench-compression-')
+    try:
+        header = f"{'tasks':>7} {'encoding':>8} {'wire MB':>8} {'ratio':>6} {'server s':>9} {'decode s':>9}"
+        print(header + ''.join(f" {f'e2e@{b:g}M s':>11}" for b in bandwidths))
+        for tasks in (int(value) for value in args.tasks.split(',') if value.strip()):
+            path = os.path.join(workdir, f'gen-{tasks}.xml')
+            schedule_gen.write_schedule(path, tasks, args.depth, custom_fields=args.custom_fields,
+                                        assignments=args.assignments)
+            with open(path, 'rb') as f:
+                data = f.read()
+            measure(client, data, 'identity', 1, query)  # warm-up
+            for encoding in encodings:
+                server, decode, wire, size = measure(client, data, encoding, args.iterations, query)
+                ends = [server + wire * 8 / (b * 1e6) + decode for b in bandwidths]
+                print(f"{tasks:>7} {encoding:>8} {wire / 1e6:8.2f} {size / max(1, wire):6.1f} {server:9.3f} "
+                      f"{decode:9.3f}" + ''.join(f" {end:11.3f}" for end in ends))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
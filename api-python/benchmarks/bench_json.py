@@ -0,0 +1,101 @@
+"""JSON encoding microbenchmark: stdlib vs orjson on parse results.
+
+Usage (from api-python/):
+    python benchmarks/bench_json.py [FILE | --body RESPONSE.json] [--tasks 1000,10000]
+        [--depth 5] [--custom-fields 10] [--assignments 1] [--iterations 5]
+
+Parses FILE, or schedules generated with schedule_gen at each ``--tasks``
+count, once through parse_file, then encodes the result (task_records
+nodes and all) with each available encoder of ParseJSONProvider, as the
+/parse response body. ``--body`` encodes a saved /parse response instead,
+with no JVM needed. Prints the median encode time, the speedup over the
+stdlib encoder, and whether the bytes are identical to the stdlib's (or,
+failing that, decode to the same value).
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_encoder
+
+
+def measure(provider, result, iterations):
+    """(median seconds, body) for encoding ``result`` ``iterations`` times."""
+    times = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        body = provider.dumps_bytes(result) + b'\n'
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times), body
+
+
+def compare(label, result, iterations, provider_class, app):
+    tasks = len(result.get('tasks') or ())
+    bodies = {}
+    for encoder in json_encoder.available()[::-1]:
+        provider = provider_class(app, encoder)
+        provider.dumps_bytes(result)  # warm-up
+        seconds, body = measure(provider, result, iterations)
+        bodies[encoder] = (seconds, body)
+        base_seconds, base = bodies[json_encoder.STDLIB]
+        if body == base:
+            same = 'bytes'
+        elif json.loads(body) == json.loads(base):
+            same = 'value'
+        else:
+            same = 'NO'
+        print(f"{label:>12} {tasks:>7} {encoder:>8} {len(body) / 1e6:8.2f} {seconds:9.4f} "
+              f"{base_seconds / max(seconds, 1e-9):8.1f}x {same:>9}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('path', nargs='?')
+    ap.add_argument('--body', help="a saved /parse JSON response to encode instead of parsing")
+    ap.add_argument('--tasks', default='1000,10000', help="comma-separated task counts")
+    ap.add_argument('--depth', type=int, default=5)
+    ap.add_argument('--custom-fields', type=int, default=10)
+    ap.add_argument('--assignments', type=float, default=1.0)
+    ap.add_argument('--iterations', type=int, default=5)
+    args = ap.parse_args()
+
+    if json_encoder.ORJSON not in json_encoder.available():
+        print("orjson is not installed; timing the stdlib encoder only")
+    print(f"{'input':>12} {'tasks':>7} {'encoder':>8} {'MB':>8} {'encode s':>9} {'speedup':>9} {'identical':>9}")
+    if args.body:
+        from flask import Flask
+        with open(args.body, 'rb') as f:
+            compare(os.path.basename(args.body)[:12], json.load(f), args.iterations,
+                    json_encoder.FastJSONProvider, Flask(__name__))
+        return
+
+    import mpp_parser
+    import schedule_gen
+    if not mpp_parser.init_jvm():
+        sys.exit("JVM failed to start")
+    parser = mpp_parser.ProjectParser()
+    if args.path:
+        compare(os.path.basename(args.path)[:12], parser.parse_file(args.path), args.iterations,
+                mpp_parser.ParseJSONProvider, mpp_parser.app)
+        return
+    workdir = tempfile.mkdtemp(prefix='bench-json-')
+    try:
+        for tasks in (int(value) for value in args.tasks.split(',') if value.strip()):
+            path = os.path.join(workdir, f'gen-{tasks}.xml')
+            schedule_gen.write_schedule(path, tasks, args.depth, custom_fields=args.custom_fields,
+                                        assignments=args.assignments)
+            compare('generated', parser.parse_file(path), args.iterations,
+                    mpp_parser.ParseJSONProvider, mpp_parser.app)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
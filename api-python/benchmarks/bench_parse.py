@@ -0,0 +1,168 @@
+"""Parse benchmark suite: stage timings, peak RSS and JVM heap on generated schedules.
+
+Usage (from api-python/):
+    python benchmarks/bench_parse.py [--tasks 1000,10000,100000] [--depth 5]
+        [--links 1.5] [--custom-fields 10] [--assignments 1] [--format xml|mpx]
+        [--iterations 3] [--fields PRESET] [--output bench_parse.json]
+        [--keep DIR]
+
+Each task count is generated once with schedule_gen, then parsed in a child
+process of its own so the peak RSS is that case's alone. The child parses
+the file's bytes ``iterations`` times through one ProjectParser (as /parse
+does with a pooled parser) and serializes each result, recording every
+ParseTimings stage, the body size, the JVM heap pools' peak usage and the
+process's peak RSS. Medians are printed as a table and every run is saved
+to ``--output`` as JSON, to compare against earlier runs.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import schedule_gen
+
+
+def measure(path, iterations, fields=None):
+    """Parse ``path`` ``iterations`` times in this process; returns the case's result dict."""
+    import jpype
+    import mpp_parser
+    from parse_metrics import ParseTimings
+    from task_fields import resolve_fields
+
+    if not mpp_parser.init_jvm():
+        sys.exit("JVM failed to start")
+    options = {}
+    if fields:
+        options['fields'] = resolve_fields(fields)
+    management = jpype.JClass('java.lang.management.ManagementFactory')
+    heap_pools = [pool for pool in management.getMemoryPoolMXBeans() if str(pool.getType()) == 'Heap memory']
+    parser = mpp_parser.ProjectParser()
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    runs = []
+    for _ in range(iterations):
+        for pool in heap_pools:
+            pool.resetPeakUsage()
+        timings = ParseTimings()
+        t0 = time.perf_counter()
+        res = parser.parse_file(data, timings=timings, options=options)
+        with mpp_parser.app.app_context():
+            body, stats = mpp_parser.serialize_result(res, timings)
+        runs.append({
+            'seconds': round(time.perf_counter() - t0, 6),
+            'stages': stats['stages'],
+            'counts': stats['counts'],
+            'bodyBytes': len(body),
+            'jvmHeapPeakBytes': sum(int(pool.getPeakUsage().getUsed()) for pool in heap_pools),
+        })
+        del res, body
+    return {
+        'runs': runs,
+        'peakRssBytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        'jvmHeapMaxBytes': int(jpype.JClass('java.lang.Runtime').getRuntime().maxMemory()),
+        'fieldReader': parser.field_reader.name,
+    }
+
+
+def run_case(path, iterations, fields=None):
+    """measure() in a fresh interpreter, so RSS and heap start from nothing."""
+    command = [sys.executable, os.path.abspath(__file__), '--case', path, '--iterations', str(iterations)]
+    if fields:
+        command += ['--fields', fields]
+    out = subprocess.run(command, capture_output=True, text=True)
+    if out.returncode != 0:
+        sys.exit(f"Benchmark case failed for {path}:\n{out.stderr[-4000:]}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def summarize(case):
+    runs = case['runs']
+    stages = sorted({stage for run in runs for stage in run['stages']})
+    return {
+        'seconds': statistics.median(run['seconds'] for run in runs),
+        'stages': {stage: statistics.median(run['stages'].get(stage, 0.0) for run in runs) for stage in stages},
+        'jvmHeapPeakBytes': max(run['jvmHeapPeakBytes'] for run in runs),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--tasks', default='1000,10000', help="comma-separated task counts")
+    ap.add_argument('--depth', type=int, default=5)
+    ap.add_argument('--links', type=float, default=1.5)
+    ap.add_argument('--custom-fields', type=int, default=10)
+    ap.add_argument('--assignments', type=float, default=1.0)
+    ap.add_argument('--format', choices=('xml', 'mpx'), default='xml')
+    ap.add_argument('--iterations', type=int, default=3)
+    ap.add_argument('--fields', help="fields= value to parse with (default: every field)")
+    ap.add_argument('--seed', type=int, default=1)
+    ap.add_argument('--output', default='bench_parse.json')
+    ap.add_argument('--keep', help="directory to keep (and reuse) the generated schedules in")
+    ap.add_argument('--case', help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.case:
+        print(json.dumps(measure(args.case, args.iterations, args.fields)))
+        return
+
+    workdir = args.keep or tempfile.mkdtemp(prefix='bench-parse-')
+    os.makedirs(workdir, exist_ok=True)
+    cases = []
+    try:
+        for tasks in (int(value) for value in args.tasks.split(',') if value.strip()):
+            name = (f"gen-{tasks}-d{args.depth}-l{args.links}-c{args.custom_fields}"
+                    f"-a{args.assignments}-s{args.seed}.{args.format}")
+            path = os.path.join(workdir, name)
+            if not os.path.exists(path):
+                t0 = time.perf_counter()
+                schedule = schedule_gen.write_schedule(path, tasks, args.depth, args.links, args.custom_fields,
+                                                       args.assignments, seed=args.seed)
+                print(f"generated {name} in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+            else:
+                schedule = {'tasks': tasks, 'bytes': os.path.getsize(path)}
+            case = run_case(path, args.iterations, args.fields)
+            case['schedule'] = dict(schedule, file=name)
+            case['median'] = summarize(case)
+            cases.append(case)
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'createdAt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'parameters': {
+            'depth': args.depth, 'links': args.links, 'customFields': args.custom_fields,
+            'assignments': args.assignments, 'format': args.format, 'iterations': args.iterations,
+            'fields': args.fields, 'seed': args.seed,
+        },
+        'cases': cases,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    stages = sorted({stage for case in cases for stage in case['median']['stages']})
+    print(f"\n{'tasks':>8} {'MB in':>7} {'parse s':>8} {'RSS MB':>7} {'heap MB':>8}  slowest stages (s)")
+    for case in cases:
+        median = case['median']
+        slowest = sorted(stages, key=lambda stage: -median['stages'].get(stage, 0.0))[:4]
+        print(f"{case['schedule']['tasks']:>8} {case['schedule']['bytes'] / 1e6:7.1f} {median['seconds']:8.3f} "
+              f"{case['peakRssBytes'] / 2 ** 20:7.0f} {median['jvmHeapPeakBytes'] / 2 ** 20:8.0f}  "
+              + ", ".join(f"{stage}={median['stages'][stage]:.3f}" for stage in slowest))
+    print(f"\nresults written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Per-request overhead of a fresh ProjectParser vs. a pooled one.
+
+Usage (from api-python/):
+    python benchmarks/bench_parser_pool.py [--tasks 20] [--iterations 50]
+
+Writes a small flat MSPDI schedule with schedule_gen, then times ``parse_file``
+on it with a new ``ProjectParser()`` per call (the old /parse behaviour) and
+with instances checked out of ``ParserPool``.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mpp_parser
+import schedule_gen
+from parser_pool import ParserPool
+
+
+def time_calls(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return samples
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--tasks', type=int, default=20)
+    ap.add_argument('--iterations', type=int, default=50)
+    ap.add_argument('--warmup', type=int, default=10)
+    args = ap.parse_args()
+
+    if not mpp_parser.init_jvm():
+        sys.exit("JVM failed to start")
+
+    fd, path = tempfile.mkstemp(suffix=".xml")
+    os.close(fd)
+    try:
+        schedule_gen.write_schedule(path, args.tasks, depth=1, links=1)
+        pool = ParserPool(mpp_parser.ProjectParser, 1)
+
+        def fresh():
+            mpp_parser.ProjectParser().parse_file(path)
+
+        def pooled():
+            with pool.acquire() as parser:
+                parser.parse_file(path)
+
+        time_calls(fresh, args.warmup)
+        time_calls(pooled, args.warmup)
+        results = {
+            'fresh': time_calls(fresh, args.iterations),
+            'pooled': time_calls(pooled, args.iterations),
+        }
+    finally:
+        os.remove(path)
+
+    print(f"\n{args.tasks} tasks, {args.iterations} iterations (ms per request)")
+    print(f"{'mode':<8} {'mean':>8} {'median':>8} {'p95':>8}")
+    for mode, samples in results.items():
+        samples = sorted(samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        print(f"{mode:<8} {statistics.mean(samples):8.2f} {statistics.median(samples):8.2f} {p95:8.2f}")
+    saving = statistics.mean(results['fresh']) - statistics.mean(results['pooled'])
+    print(f"saving   {saving:8.2f} ms/request")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Native critical-path engine vs. MPXJ's scheduler on a generated network.
+
+Usage (from api-python/):
+    python benchmarks/bench_schedule.py [--tasks 5000] [--links 2] [--iterations 3]
+
+Writes an MSPDI schedule with MPXJ (one summary, leaf tasks linked FS/SS/FF
+with lags to random earlier tasks), parses it with ``schedule=native`` and
+``schedule=mpxj`` and reports each engine's time from the parse summary, then
+how many leaf tasks got different early/late dates or slack.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mpp_parser
+
+COMPARED = ('earlyStart', 'earlyFinish', 'lateStart', 'lateFinish', 'totalSlack', 'isCritical')
+
+
+def write_network(path, task_count, links, seed=1):
+    import jpype
+    from org.mpxj import ProjectFile, Duration, TimeUnit, Relation, RelationType
+    LocalDateTime = jpype.JClass('java.time.LocalDateTime')
+
+    rng = random.Random(seed)
+    types = [RelationType.FINISH_START, RelationType.START_START, RelationType.FINISH_FINISH]
+    project = ProjectFile()
+    project.getProjectProperties().setProjectTitle("Schedule benchmark")
+    project.getProjectProperties().setStartDate(LocalDateTime.of(2024, 1, 1, 8, 0))
+    project.setDefaultCalendar(project.addDefaultBaseCalendar())
+    root = project.addTask()
+    root.setName("Root")
+    tasks = []
+    for i in range(task_count):
+        task = root.addTask()
+        task.setName(f"Task {i + 1}")
+        task.setDuration(Duration.getInstance(rng.randint(0, 10), TimeUnit.DAYS))
+        for predecessor in rng.sample(tasks[-50:], min(links, len(tasks[-50:]))):
+            task.addPredecessor(Relation.Builder()
+                                .predecessorTask(predecessor)
+                                .type(rng.choice(types))
+                                .lag(Duration.getInstance(rng.randint(0, 2), TimeUnit.DAYS)))
+        tasks.append(task)
+    from org.mpxj.mspdi import MSPDIWriter
+    MSPDIWriter().write(project, path)
+
+
+def run(path, engine):
+    parser = mpp_parser.ProjectParser()
+    events = list(parser.iter_parse(path, options={'schedule': engine}))
+    tasks = [payload for kind, payload in events if kind == 'task']
+    summary = events[-1][1]
+    return tasks, summary['schedule']
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--tasks', type=int, default=5000)
+    ap.add_argument('--links', type=int, default=2)
+    ap.add_argument('--iterations', type=int, default=3)
+    args = ap.parse_args()
+
+    if not mpp_parser.init_jvm():
+        sys.exit("JVM failed to start")
+
+    fd, path = tempfile.mkstemp(suffix=".xml")
+    os.close(fd)
+    try:
+        write_network(path, args.tasks, args.links)
+        seconds = {'native': [], 'mpxj': []}
+        results = {}
+        for _ in range(args.iterations):
+            for engine in seconds:
+                tasks, info = run(path, engine)
+                if info.get('error'):
+                    sys.exit(f"{engine} scheduling failed: {info['error']}")
+                seconds[engine].append(info['seconds'] * 1000.0)
+                results[engine] = tasks
+    finally:
+        os.remove(path)
+
+    print(f"\n{args.tasks} tasks, ~{args.links} links each, {args.iterations} iterations (ms per schedule)")
+    print(f"{'engine':<8} {'mean':>9} {'median':>9}")
+    for engine, samples in seconds.items():
+        print(f"{engine:<8} {statistics.mean(samples):9.2f} {statistics.median(samples):9.2f}")
+    print(f"speedup  {statistics.mean(seconds['mpxj']) / max(statistics.mean(seconds['native']), 1e-9):9.1f}x")
+
+    leaves = [(n, m) for n, m in zip(results['native'], results['mpxj']) if not n['is_summary']]
+    for key in COMPARED:
+        differ = sum(1 for n, m in leaves if n.get(key) != m.get(key))
+        print(f"{key:<12} {differ} of {len(leaves)} leaf tasks differ")
+
+
+if __name__ == '__main__':
+    main()
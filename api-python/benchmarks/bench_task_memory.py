@@ -0,0 +1,85 @@
+"""Retained memory per task: plain task dicts vs parse_file's compact records.
+
+Usage (from api-python/):
+    python benchmarks/bench_task_memory.py [FILE] [--tasks 10000] [--depth 5]
+        [--custom-fields 10] [--assignments 1]
+
+Parses FILE (or a schedule generated with schedule_gen) twice under
+tracemalloc: once collecting iter_parse's task dicts as parse_file used to,
+once through parse_file, which keeps task_records.Record nodes. Reports the
+bytes still held per task after each parse, the peak during it, and the
+time to encode the result as JSON.
+"""
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import schedule_gen
+
+
+def _collect_dicts(parser, path):
+    result = {'success': True, 'tasks': []}
+    for kind, payload in parser.iter_parse(path):
+        if kind == 'task':
+            result['tasks'].append(payload)
+        else:
+            result[kind] = payload
+    return result
+
+
+def measure(parse, path):
+    """(retained bytes, peak bytes, result) for one traced parse of ``path``."""
+    gc.collect()
+    tracemalloc.start()
+    result = parse(path)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained, peak, result
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('path', nargs='?')
+    ap.add_argument('--tasks', type=int, default=10000)
+    ap.add_argument('--depth', type=int, default=5)
+    ap.add_argument('--custom-fields', type=int, default=10)
+    ap.add_argument('--assignments', type=float, default=1.0)
+    args = ap.parse_args()
+
+    import mpp_parser
+    if not mpp_parser.init_jvm():
+        sys.exit("JVM failed to start")
+    path = args.path
+    workdir = None
+    if path is None:
+        workdir = tempfile.mkdtemp(prefix='bench-memory-')
+        path = os.path.join(workdir, 'schedule.xml')
+        schedule_gen.write_schedule(path, args.tasks, args.depth, custom_fields=args.custom_fields,
+                                    assignments=args.assignments)
+    parser = mpp_parser.ProjectParser()
+    parser.parse_file(path)  # warm the JVM classes and the field reader
+
+    print(f"{'nodes':>8} {'tasks':>7} {'retained B/task':>16} {'peak B/task':>12} {'encode s':>9}")
+    for label, parse in (('dicts', lambda p: _collect_dicts(parser, p)), ('records', parser.parse_file)):
+        retained, peak, result = measure(parse, path)
+        tasks = max(1, len(result['tasks']))
+        with mpp_parser.app.app_context():
+            t0 = time.perf_counter()
+            mpp_parser.app.json.response(result).get_data()
+            encode = time.perf_counter() - t0
+        print(f"{label:>8} {len(result['tasks']):>7} {retained / tasks:16.0f} {peak / tasks:12.0f} {encode:9.3f}")
+        del result
+    if workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
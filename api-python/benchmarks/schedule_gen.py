@@ -0,0 +1,177 @@
+"""Synthetic schedules for the parser benchmarks, written with MPXJ.
+
+Usage (from api-python/):
+    python benchmarks/schedule_gen.py OUT.xml|OUT.mpx [--tasks 10000] [--depth 5]
+        [--links 1.5] [--custom-fields 10] [--assignments 1] [--seed 1]
+
+The outline is ``depth`` levels deep (the first branch always reaches it),
+summary tasks get roughly tasks ** (1 / depth) children each, and leaf tasks
+carry durations, work, costs, progress and baseline values. ``links`` is the
+mean number of predecessors per leaf (FS/SS/FF with small lags, always on
+an earlier leaf, so the network is acyclic). ``custom_fields`` aliased text
+and number fields are filled on about half the leaves; the first two use the
+aliases the parser maps to canonical keys. ``assignments`` is the mean
+number of resource assignments per leaf.
+"""
+import argparse
+import os
+import random
+
+import jpype
+import jpype.imports  # noqa: F401
+import mpxj  # noqa: F401  (puts the MPXJ jars on the JVM classpath)
+
+# Aliases the parser maps to canonical node keys come first.
+CUSTOM_ALIASES = ('Baseline Count', 'Actual UOM')
+# MPX files only define Text1-10 and Number1-5.
+MPX_TEXT_FIELDS = 10
+MPX_NUMBER_FIELDS = 5
+
+
+def start_jvm(max_heap='2g'):
+    """Start the JVM for writing (generation of 100k-task files needs more than the service's heap)."""
+    if not jpype.isJVMStarted():
+        jpype.startJVM(f"-Xmx{max_heap}", convertStrings=True)
+
+
+def _custom_fields(count, mpx):
+    """(TaskField, alias, is_number) for up to ``count`` custom fields, alternating number and text."""
+    from org.mpxj import TaskField
+    limits = {True: MPX_NUMBER_FIELDS if mpx else 20, False: MPX_TEXT_FIELDS if mpx else 30}
+    used = {True: 0, False: 0}
+    fields = []
+    for i in range(count):
+        is_number = i % 2 == 0
+        if used[is_number] >= limits[is_number]:
+            is_number = not is_number
+            if used[is_number] >= limits[is_number]:
+                break
+        used[is_number] += 1
+        field = TaskField.valueOf(f"{'NUMBER' if is_number else 'TEXT'}{used[is_number]}")
+        alias = CUSTOM_ALIASES[i] if i < len(CUSTOM_ALIASES) else f"Field {i + 1}"
+        fields.append((field, alias, is_number))
+    return fields
+
+
+def write_schedule(path, tasks=1000, depth=4, links=1.5, custom_fields=0, assignments=0.0,
+                   resources=None, seed=1):
+    """Write a generated schedule to ``path`` (MPX for a .mpx suffix, else MSPDI); returns its stats."""
+    start_jvm()
+    from org.mpxj import ProjectFile, Duration, TimeUnit, Relation, RelationType
+    Double = jpype.JClass('java.lang.Double')
+    LocalDateTime = jpype.JClass('java.time.LocalDateTime')
+
+    rng = random.Random(seed)
+    mpx = path.lower().endswith('.mpx')
+    depth = max(1, depth)
+    fanout = max(2, round(tasks ** (1.0 / depth)))
+    start = LocalDateTime.of(2024, 1, 1, 8, 0)
+
+    project = ProjectFile()
+    props = project.getProjectProperties()
+    props.setProjectTitle(f"Generated {tasks} tasks")
+    props.setStartDate(start)
+    project.setDefaultCalendar(project.addDefaultBaseCalendar())
+
+    fields = _custom_fields(custom_fields, mpx)
+    for field, alias, _ in fields:
+        project.getCustomFields().getOrCreate(field).setAlias(alias)
+
+    resource_count = resources if resources is not None else max(10, tasks // 50)
+    pool = []
+    if assignments > 0:
+        for i in range(resource_count):
+            resource = project.addResource()
+            resource.setName(f"Resource {i + 1}")
+            pool.append(resource)
+
+    types = (RelationType.FINISH_START, RelationType.FINISH_START, RelationType.START_START,
+             RelationType.FINISH_FINISH)
+    # Open summaries by outline level: each new task goes under the deepest
+    # one that still wants children, and becomes a summary itself with
+    # probability 1 / fanout while the depth allows.
+    root = project.addTask()
+    root.setName("Program")
+    open_summaries = [[root, fanout]]
+    leaves = []
+    link_count = assignment_count = 0
+    for i in range(1, tasks):
+        while len(open_summaries) > 1 and open_summaries[-1][1] <= 0:
+            open_summaries.pop()
+        parent = open_summaries[-1]
+        parent[1] -= 1
+        task = parent[0].addTask()
+        level = len(open_summaries)
+        task.setName(f"{'Summary' if level < depth else 'Task'} {i}")
+        if level < depth and (len(leaves) == 0 or rng.random() < 1.0 / fanout):
+            open_summaries.append([task, fanout])
+            continue
+
+        days = rng.randint(0, 10)
+        hours = days * 8.0
+        done = rng.choice((0, 0, 25, 50, 100)) if days else 0
+        task.setDuration(Duration.getInstance(days, TimeUnit.DAYS))
+        task.setStart(start)
+        task.setWork(Duration.getInstance(hours, TimeUnit.HOURS))
+        task.setBaselineWork(Duration.getInstance(hours, TimeUnit.HOURS))
+        task.setActualWork(Duration.getInstance(hours * done / 100.0, TimeUnit.HOURS))
+        task.setRemainingWork(Duration.getInstance(hours * (100 - done) / 100.0, TimeUnit.HOURS))
+        cost = float(rng.randint(0, 2000))
+        task.setBaselineCost(Double(cost))
+        task.setActualCost(Double(cost * done / 100.0))
+        task.setRemainingCost(Double(cost * (100 - done) / 100.0))
+        task.setPercentageComplete(Double(float(done)))
+        for field, _, is_number in fields:
+            if rng.random() < 0.5:
+                task.set(field, Double(float(rng.randint(1, 50))) if is_number else f"value {rng.randint(1, 20)}")
+        if pool:
+            for resource in rng.sample(pool, min(len(pool), int(assignments) + (rng.random() < assignments % 1))):
+                assignment = task.addResourceAssignment(resource)
+                assignment.setWork(Duration.getInstance(hours, TimeUnit.HOURS))
+                assignment_count += 1
+        recent = leaves[-50:]
+        wanted = int(links) + (rng.random() < links % 1)
+        for predecessor in rng.sample(recent, min(len(recent), wanted)):
+            task.addPredecessor(Relation.Builder()
+                                .predecessorTask(predecessor)
+                                .type(rng.choice(types))
+                                .lag(Duration.getInstance(rng.randint(0, 2), TimeUnit.DAYS)))
+            link_count += 1
+        leaves.append(task)
+
+    if mpx:
+        from org.mpxj.mpx import MPXWriter
+        MPXWriter().write(project, path)
+    else:
+        from org.mpxj.mspdi import MSPDIWriter
+        MSPDIWriter().write(project, path)
+    return {
+        'tasks': tasks,
+        'leaves': len(leaves),
+        'depth': depth,
+        'links': link_count,
+        'customFields': len(fields),
+        'resources': len(pool),
+        'assignments': assignment_count,
+        'bytes': os.path.getsize(path),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('path')
+    ap.add_argument('--tasks', type=int, default=10000)
+    ap.add_argument('--depth', type=int, default=5)
+    ap.add_argument('--links', type=float, default=1.5)
+    ap.add_argument('--custom-fields', type=int, default=10)
+    ap.add_argument('--assignments', type=float, default=1.0)
+    ap.add_argument('--resources', type=int)
+    ap.add_argument('--seed', type=int, default=1)
+    args = ap.parse_args()
+    stats = write_schedule(args.path, args.tasks, args.depth, args.links, args.custom_fields,
+                           args.assignments, args.resources, args.seed)
+    print(", ".join(f"{key}={value}" for key, value in stats.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,297 @@
+import json
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from relations import TYPE_NAMES
+
+# format= values producing a columnar body instead of one dict per task.
+COLUMNS = 'columns'
+ARROW = 'arrow'
+FORMATS = (COLUMNS, ARROW)
+ARROW_MIME = 'application/vnd.apache.arrow.stream'
+# Every Arrow IPC stream message starts with the continuation marker.
+_ARROW_MAGIC = b'\xff\xff\xff\xff'
+
+STRING = 'string'
+FLOAT = 'float64'
+INT = 'int64'
+BOOL = 'bool'
+DATE = 'date'
+DICTIONARY = 'dictionary'
+VALUE = 'value'  # custom field values: numbers or text
+
+TASK_TYPES = {}
+TASK_TYPES.update(dict.fromkeys((
+    'id', 'name', 'parent_id', 'comments', 'wbsCode', 'outlineNumber', 'contact', 'manager',
+    'hyperlinkAddress', 'hyperlinkSubAddress', 'subprojectFile',
+), STRING))
+TASK_TYPES.update(dict.fromkeys((
+    'hierarchy_type', 'assignedResource', 'constraintType', 'priority', 'calendarName', 'folder',
+), DICTIONARY))
+TASK_TYPES.update(dict.fromkeys((
+    'startDate', 'endDate', 'constraintDate', 'baselineStartDate', 'baselineEndDate',
+    'actualStartDate', 'actualEndDate', 'earlyStart', 'earlyFinish', 'lateStart', 'lateFinish', 'deadline',
+), DATE))
+TASK_TYPES.update(dict.fromkeys(('outline_level', 'calendarUniqueId', 'subprojectTaskId'), INT))
+TASK_TYPES.update(dict.fromkeys((
+    'is_summary', 'isCritical', 'isMilestone', 'isEstimated', 'isRecurring', 'isExternal',
+), BOOL))
+TASK_TYPES.update(dict.fromkeys((
+    'percentComplete', 'baselineHours', 'actualHours', 'projectedHours', 'remainingHours',
+    'baselineCost', 'actualCost', 'remainingCost', 'totalSlack', 'duration', 'baselineDuration',
+    'actualDuration', 'remainingDuration', 'freeSlack', 'cost', 'fixedCost', 'costVariance',
+    'workVariance', 'durationVariance', 'percentWorkComplete', 'physicalPercentComplete',
+), FLOAT))
+
+ROLLUP_TYPES = dict(TASK_TYPES, leafTasks=INT, criticalTasks=INT)
+
+ASSIGNMENT_TYPES = {'resourceName': DICTIONARY, 'resourceId': DICTIONARY, 'resource': INT, 'start': DATE, 'finish': DATE}
+
+# Task keys carried outside the task columns (edge table, assignment table,
+# sparse custom fields, summary-task rollups).
+NESTED_KEYS = ('predecessors', 'successors', 'resourceAssignments', 'customFields', 'rollup')
+
+
+def arrow_available():
+    return pa is not None
+
+
+def body_mimetype(body):
+    """Content type of a serialized parse body (Arrow stream or JSON)."""
+    return ARROW_MIME if body[:4] == _ARROW_MAGIC else 'application/json'
+
+
+class _Table:
+    """Append-only struct-of-arrays; a key first seen late is back-filled with None."""
+
+    __slots__ = ('columns', 'rows')
+
+    def __init__(self):
+        self.columns = {}
+        self.rows = 0
+
+    def append(self, record, skip=()):
+        row = self.rows
+        columns = self.columns
+        appended = 0
+        for key, value in record.items():
+            if key in skip:
+                continue
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * row
+            column.append(value)
+            appended += 1
+        self.rows = row + 1
+        if appended != len(columns):
+            for column in columns.values():
+                if len(column) == row:
+                    column.append(None)
+
+
+def _dictionary_encode(values):
+    lookup = {}
+    indices = []
+    for value in values:
+        if value is None:
+            indices.append(None)
+            continue
+        index = lookup.get(value)
+        if index is None:
+            index = lookup[value] = len(lookup)
+        indices.append(index)
+    return {'dictionary': list(lookup), 'indices': indices}
+
+
+def _json_columns(table, types, default):
+    schema = {}
+    columns = {}
+    for key, values in table.columns.items():
+        kind = types.get(key, default)
+        schema[key] = kind
+        if all(value is None for value in values):
+            columns[key] = None  # all-null column
+        elif kind == DICTIONARY:
+            columns[key] = _dictionary_encode(values)
+        else:
+            columns[key] = values
+    return schema, columns
+
+
+class ColumnarResult:
+    """A parse as columns: built from iter_parse events, serialized as JSON or Arrow.
+
+    Tasks become one array per field (dictionary-encoded for repetitive
+    strings, all-null fields collapsed to null); dependencies are the shared
+    edge table, resource assignments a child table indexed by CSR offsets, and
+    custom fields sparse (rows, values) pairs per alias, and rollups (when
+    requested) a table over the summary rows.
+    """
+
+    def __init__(self, output_format=COLUMNS):
+        self.format = output_format
+        self.project = None
+        self.summary = None
+        self.edges = None
+        self.resources = None
+        self.tasks = _Table()
+        self.assignments = _Table()
+        self.assignment_offsets = [0]
+        self.custom = {}
+        self.rollups = _Table()
+        self.rollup_rows = []
+
+    @property
+    def task_count(self):
+        return self.tasks.rows
+
+    def add(self, kind, payload):
+        if kind == 'task':
+            self.add_task(payload)
+        elif kind in ('project', 'summary', 'edges', 'resources'):
+            setattr(self, kind, payload)
+
+    def add_task(self, node):
+        row = self.tasks.rows
+        self.tasks.append(node, NESTED_KEYS)
+        for assignment in node.get('resourceAssignments') or ():
+            self.assignments.append(assignment)
+        self.assignment_offsets.append(self.assignments.rows)
+        for alias, value in (node.get('customFields') or {}).items():
+            rows, values = self.custom.setdefault(alias, ([], []))
+            rows.append(row)
+            values.append(value)
+        rollup = node.get('rollup')
+        if rollup is not None:
+            self.rollup_rows.append(row)
+            self.rollups.append(rollup)
+
+    def _rollup_columns(self):
+        schema, columns = _json_columns(self.rollups, ROLLUP_TYPES, FLOAT)
+        return {'rows': self.rollup_rows, 'schema': schema, 'columns': columns}
+
+    def to_dict(self):
+        schema, columns = _json_columns(self.tasks, TASK_TYPES, VALUE)
+        assignment_schema, assignment_columns = _json_columns(self.assignments, ASSIGNMENT_TYPES, FLOAT)
+        result = {
+            'success': True,
+            'format': COLUMNS,
+            'project': self.project,
+            'taskCount': self.tasks.rows,
+            'schema': schema,
+            'columns': columns,
+            'edges': self.edges,
+            'assignments': {
+                'count': self.assignments.rows,
+                'offsets': self.assignment_offsets,
+                'schema': assignment_schema,
+                'columns': assignment_columns,
+            },
+            'customFields': {alias: {'rows': rows, 'values': values} for alias, (rows, values) in self.custom.items()},
+            'summary': self.summary,
+        }
+        if self.resources is not None:
+            result['resources'] = self.resources
+        if self.rollup_rows:
+            result['rollups'] = self._rollup_columns()
+        return result
+
+    def to_arrow(self, timings=None):
+        """Arrow IPC stream of one table, one row per task.
+
+        Dependencies (predecessor side) and resource assignments are
+        list<struct> columns, custom fields are "custom:<alias>" columns, and
+        project, summary, unresolved endpoints, the resource table and
+        rollups are JSON schema metadata.
+        """
+        if pa is None:
+            raise RuntimeError("Arrow output requires pyarrow")
+        names = []
+        arrays = []
+        for key, values in self.tasks.columns.items():
+            names.append(key)
+            arrays.append(_arrow_array(values, TASK_TYPES.get(key, VALUE)))
+
+        names.append('predecessors')
+        arrays.append(self._arrow_predecessors())
+        names.append('resourceAssignments')
+        struct = _arrow_struct(self.assignments, ASSIGNMENT_TYPES)
+        arrays.append(pa.ListArray.from_arrays(pa.array(self.assignment_offsets, pa.int32()), struct))
+
+        for alias, (rows, values) in self.custom.items():
+            dense = [None] * self.tasks.rows
+            for row, value in zip(rows, values):
+                dense[row] = value
+            names.append(f'custom:{alias}')
+            arrays.append(_arrow_array(dense, VALUE))
+
+        metadata = {'format': ARROW, 'project': self.project, 'summary': self.summary}
+        if self.edges and self.edges.get('unresolved'):
+            metadata['unresolved'] = self.edges['unresolved']
+        if self.resources is not None:
+            metadata['resources'] = self.resources
+        if self.rollup_rows:
+            metadata['rollups'] = self._rollup_columns()
+        if timings is not None:
+            metadata['timings'] = timings
+        table = pa.Table.from_arrays(arrays, names=names, metadata={
+            key: json.dumps(value, separators=(',', ':')) for key, value in metadata.items()
+        })
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    def _arrow_predecessors(self):
+        edges = self.edges or {'from': [], 'to': [], 'type': [], 'lagDays': []}
+        by_target = [[] for _ in range(self.tasks.rows)]
+        for edge, target in enumerate(edges['to']):
+            if target >= 0:
+                by_target[target].append(edge)
+        order = [edge for group in by_target for edge in group]
+        offsets = [0]
+        for group in by_target:
+            offsets.append(offsets[-1] + len(group))
+        struct = pa.StructArray.from_arrays([
+            pa.array([edges['from'][e] for e in order], pa.int32()),
+            pa.DictionaryArray.from_arrays(
+                pa.array([edges['type'][e] for e in order], pa.int8()), pa.array(TYPE_NAMES, pa.string())),
+            pa.array([edges['lagDays'][e] for e in order], pa.float64()),
+        ], names=['task', 'relationship', 'lagDays'])
+        return pa.ListArray.from_arrays(pa.array(offsets, pa.int32()), struct)
+
+
+def _arrow_struct(table, types):
+    if not table.columns:
+        return pa.array([], pa.struct([]))
+    return pa.StructArray.from_arrays(
+        [_arrow_array(values, types.get(key, FLOAT)) for key, values in table.columns.items()],
+        names=list(table.columns),
+    )
+
+
+def _arrow_array(values, kind):
+    if all(value is None for value in values):
+        return pa.nulls(len(values))
+    if kind == FLOAT:
+        return pa.array(values, pa.float64())
+    if kind == INT:
+        return pa.array(values, pa.int64())
+    if kind == BOOL:
+        return pa.array(values, pa.bool_())
+    if kind == DICTIONARY:
+        return pa.array(values, pa.string()).dictionary_encode()
+    if kind == DATE:
+        strings = pa.array(values, pa.string())
+        try:
+            return strings.cast(pa.timestamp('s'))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            return strings
+    if kind == VALUE:
+        if all(value is None or (isinstance(value, (int, float)) and not isinstance(value, bool)) for value in values):
+            return pa.array(values, pa.float64())
+        return pa.array([None if value is None else str(value) for value in values], pa.string())
+    return pa.array(values, pa.string())
@@ -0,0 +1,132 @@
+import threading
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP = 'gzip'
+BROTLI = 'br'
+ZSTD = 'zstd'
+# Server preference when the client weighs several encodings equally.
+ENCODINGS = (ZSTD, BROTLI, GZIP)
+DEFAULT_LEVELS = {GZIP: 6, BROTLI: 4, ZSTD: 3}
+# Uncompressed bytes handed to the compressor at a time.
+CHUNK_BYTES = 256 * 1024
+
+
+def available():
+    """Encodings whose compressor is importable here (gzip always is)."""
+    return tuple(e for e in ENCODINGS if e == GZIP or (e == BROTLI and brotli) or (e == ZSTD and zstandard))
+
+
+def _compressor(encoding, level):
+    """(compress, flush, finish) callables for one response body.
+
+    ``flush`` emits everything compressed so far, keeping the history, so the
+    client can decode it before the body ends.
+    """
+    if encoding == GZIP:
+        c = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return c.compress, lambda: c.flush(zlib.Z_SYNC_FLUSH), c.flush
+    if encoding == BROTLI:
+        c = brotli.Compressor(quality=level)
+        return c.process, c.flush, c.finish
+    c = zstandard.ZstdCompressor(level=level).compressobj()
+    return c.compress, lambda: c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK), c.flush
+
+
+class ResponseEncoder:
+    """Content-Encoding negotiation for parse responses.
+
+    Picks the best of ``encodings`` the request's Accept-Encoding allows and
+    compresses the body as it is sent, CHUNK_BYTES of input at a time, so a
+    compressed copy of a large body is never held next to the original.
+    Bodies under ``min_bytes`` go out as they are; streamed bodies (whose
+    size is unknown up front) are always compressed, flushing after each
+    chunk so every NDJSON line reaches the client as soon as it is written.
+    """
+
+    def __init__(self, encodings=ENCODINGS, levels=None, min_bytes=0):
+        self.encodings = tuple(e for e in encodings if e in available())
+        self.levels = dict(DEFAULT_LEVELS, **(levels or {}))
+        self.min_bytes = int(min_bytes or 0)
+        self._lock = threading.Lock()
+        self._responses = dict.fromkeys(self.encodings, 0)
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+    @property
+    def enabled(self):
+        return bool(self.encodings)
+
+    def negotiate(self, accept_encodings):
+        """Encoding to use for a werkzeug ``request.accept_encodings``; None for identity."""
+        if not self.encodings:
+            return None
+        return accept_encodings.best_match(self.encodings)
+
+    def encode(self, response, accept_encodings):
+        """Compress ``response`` in place when negotiated and worth it; returns it."""
+        if not self.enabled or response.status_code != 200 or 'Content-Encoding' in response.headers:
+            return response
+        response.vary.add('Accept-Encoding')
+        if not response.is_streamed:
+            if response.direct_passthrough or response.calculate_content_length() < self.min_bytes:
+                return response
+        encoding = self.negotiate(accept_encodings)
+        if encoding is None:
+            return response
+        streamed = response.is_streamed
+        if streamed:
+            chunks = response.response
+        else:
+            body = response.get_data()
+            chunks = (body[i:i + CHUNK_BYTES] for i in range(0, len(body), CHUNK_BYTES))
+        response.response = self._compress(chunks, encoding, streamed)
+        response.headers['Content-Encoding'] = encoding
+        response.headers.pop('Content-Length', None)
+        return response
+
+    def _compress(self, chunks, encoding, flush_chunks=False):
+        compress, flush, finish = _compressor(encoding, self.levels[encoding])
+        size_in = size_out = 0
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                size_in += len(chunk)
+                out = compress(chunk)
+                if flush_chunks:
+                    out += flush()
+                if out:
+                    size_out += len(out)
+                    yield out
+            out = finish()
+            size_out += len(out)
+            yield out
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close()
+            with self._lock:
+                self._responses[encoding] += 1
+                self._bytes_in += size_in
+                self._bytes_out += size_out
+
+    def stats(self):
+        with self._lock:
+            return {
+                'encodings': list(self.encodings),
+                'levels': {e: self.levels[e] for e in self.encodings},
+                'minBytes': self.min_bytes,
+                'responses': dict(self._responses),
+                'bytesIn': self._bytes_in,
+                'bytesOut': self._bytes_out,
+            }
@@ -0,0 +1,508 @@
+import re
+
+import numpy as np
+
+# schedule= request option: the built-in engine, MPXJ's scheduler (for
+# cross-checking), or no scheduling at all. Absent, the legacy analyzer call
+# is kept so the default output does not change.
+NATIVE = 'native'
+MPXJ = 'mpxj'
+NONE = 'none'
+ENGINES = (NATIVE, MPXJ, NONE)
+
+# Relation type codes, as in relations.TYPE_NAMES.
+FS, SS, FF, SF = 0, 1, 2, 3
+
+# Standard calendar: Monday-Friday, 08:00-12:00 and 13:00-17:00.
+HOURS_PER_DAY = 8.0
+MORNING_START = 8 * 60
+MORNING_HOURS = 4.0
+AFTERNOON_START = 13 * 60
+
+# Task fields the native engine fills in.
+SCHEDULE_KEYS = ('earlyStart', 'earlyFinish', 'lateStart', 'lateFinish', 'totalSlack', 'freeSlack', 'isCritical')
+
+# Constraint names (as MPXJ's ConstraintType) -> which bounds they set.
+CONSTRAINTS = {
+    'AS_SOON_AS_POSSIBLE': (),
+    'START_NO_EARLIER_THAN': ('start_floor',),
+    'FINISH_NO_EARLIER_THAN': ('finish_floor',),
+    'START_NO_LATER_THAN': ('start_cap',),
+    'FINISH_NO_LATER_THAN': ('finish_cap',),
+    'MUST_START_ON': ('start_floor', 'start_cap'),
+    'MUST_FINISH_ON': ('finish_floor', 'finish_cap'),
+}
+_BOUND_DEFAULTS = {'start_floor': 0.0, 'finish_floor': -np.inf, 'start_cap': np.inf, 'finish_cap': np.inf}
+
+_DATE = re.compile(r'^(\d{4}-\d{2}-\d{2})(?:[T ](\d{2}):(\d{2}))?')
+
+
+class CycleError(ValueError):
+    pass
+
+
+class Schedule:
+    """Critical-path times per task, in working hours from the project start.
+
+    Arrays are indexed like the parse's tasks. Tasks left unscheduled (part of
+    a dependency cycle, or summaries without scheduled children) hold NaN.
+    """
+
+    __slots__ = ('duration', 'early_start', 'early_finish', 'late_start', 'late_finish',
+                 'total_slack', 'free_slack', 'finish', 'cycle_tasks')
+
+    def __init__(self, duration, early_start, early_finish, late_start, late_finish, total_slack, free_slack,
+                 finish, cycle_tasks):
+        self.duration = duration
+        self.early_start = early_start
+        self.early_finish = early_finish
+        self.late_start = late_start
+        self.late_finish = late_finish
+        self.total_slack = total_slack
+        self.free_slack = free_slack
+        self.finish = finish
+        self.cycle_tasks = cycle_tasks
+
+    @property
+    def critical(self):
+        return self.total_slack <= 1e-9
+
+    def columns(self, start_date, rows=None):
+        """Task fields as output columns: ISO dates, slack in days, critical flags.
+
+        ``rows`` limits the columns to those task positions. Milestones (zero
+        duration) on a day boundary show both early dates at the next morning
+        and both late dates at the evening before, as MPXJ's scheduler reports
+        them.
+        """
+        def pick(values):
+            return values if rows is None else values[rows]
+
+        scheduled = ~np.isnan(pick(self.early_start))
+        milestone = pick(self.duration) == 0
+        return {
+            'earlyStart': _dates(pick(self.early_start), start_date, finish=False),
+            'earlyFinish': _dates(pick(self.early_finish), start_date, finish=~milestone),
+            'lateStart': _dates(pick(self.late_start), start_date, finish=milestone),
+            'lateFinish': _dates(pick(self.late_finish), start_date, finish=True),
+            'totalSlack': _days(pick(self.total_slack)),
+            'freeSlack': _days(pick(self.free_slack)),
+            'isCritical': np.where(scheduled, pick(self.critical), None).tolist(),
+        }
+
+    def finish_date(self, start_date):
+        return _dates(np.array([self.finish]), start_date, finish=True)[0]
+
+    def changed_rows(self, other):
+        """Task positions whose times or slack differ from ``other`` (same network)."""
+        changed = np.zeros(len(self.early_start), dtype=bool)
+        for name in ('early_start', 'early_finish', 'late_start', 'late_finish', 'total_slack', 'free_slack'):
+            mine = getattr(self, name)
+            theirs = getattr(other, name)
+            changed |= ~((mine == theirs) | (np.isnan(mine) & np.isnan(theirs)))
+        return np.flatnonzero(changed)
+
+
+def _days(hours):
+    days = np.round(hours / HOURS_PER_DAY, 6)
+    return np.where(np.isnan(days), None, days).tolist()
+
+
+def _dates(hours, start_date, finish):
+    """Working-hour offsets to 'YYYY-MM-DDTHH:MM' on the standard calendar.
+
+    A finish exactly on a day boundary is 17:00 of the day before, a start
+    there is 08:00 of the day after, as Microsoft Project shows them.
+    ``finish`` is a flag or a per-value mask.
+    """
+    missing = np.isnan(hours)
+    values = np.where(missing, 0.0, hours)
+    days = np.where(finish, np.ceil(values / HOURS_PER_DAY) - 1, np.floor(values / HOURS_PER_DAY))
+    rest = values - days * HOURS_PER_DAY
+    morning = np.where(finish, rest <= MORNING_HOURS, rest < MORNING_HOURS)
+    minutes = np.where(morning, MORNING_START + rest * 60, AFTERNOON_START + (rest - MORNING_HOURS) * 60)
+    dates = np.busday_offset(_start_day(start_date), days.astype(np.int64))
+    stamps = dates.astype('datetime64[m]') + np.round(minutes).astype(np.int64).astype('timedelta64[m]')
+    text = np.datetime_as_string(stamps, unit='m')
+    return np.where(missing, None, text).tolist()
+
+
+def _start_day(start_date):
+    return np.busday_offset(np.datetime64(str(start_date)[:10], 'D'), 0, roll='forward')
+
+
+def working_hours(date, start_date):
+    """Inverse of the date output: 'YYYY-MM-DD[THH:MM]' as working hours from the project start.
+
+    Times outside working hours snap to the nearest working time; a date
+    without a time is the start of that day. Raises ValueError.
+    """
+    match = _DATE.match(str(date or ''))
+    if not match:
+        raise ValueError(f"Invalid date {date!r}; expected YYYY-MM-DDTHH:MM")
+    day, hh, mm = match.groups()
+    days = int(np.busday_count(_start_day(start_date), np.datetime64(day, 'D')))
+    minutes = int(hh or 8) * 60 + int(mm or 0)
+    if minutes <= AFTERNOON_START:
+        within = min(max(minutes - MORNING_START, 0), MORNING_HOURS * 60)
+    else:
+        within = MORNING_HOURS * 60 + min(minutes - AFTERNOON_START, MORNING_HOURS * 60)
+    return days * HOURS_PER_DAY + within / 60.0
+
+
+def _csr(keys, task_count):
+    """Edge order and row offsets grouping edges by ``keys`` (a task end)."""
+    order = np.argsort(keys, kind='stable')
+    offsets = np.zeros(task_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=task_count), out=offsets[1:])
+    return order, offsets
+
+
+def _gather(order, offsets, rows):
+    """Edge numbers in the CSR rows ``rows``."""
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    total = int(counts.sum())
+    if not total:
+        return np.empty(0, dtype=np.int64)
+    ends = np.cumsum(counts)
+    return order[np.repeat(starts - (ends - counts), counts) + np.arange(total)]
+
+
+def _closure(order, offsets, ends, seeds, task_count):
+    """Mask of ``seeds`` and every task reachable from them along the CSR edges to ``ends``."""
+    mask = np.zeros(task_count, dtype=bool)
+    frontier = np.unique(np.asarray(seeds, dtype=np.int64))
+    mask[frontier] = True
+    while frontier.size:
+        reached = ends[_gather(order, offsets, frontier)]
+        frontier = np.unique(reached[~mask[reached]])
+        mask[frontier] = True
+    return mask
+
+
+def _levels(task_count, source, target, mask=None):
+    """Kahn's algorithm a whole frontier at a time, over edges inside ``mask``.
+
+    Returns the out-edges of each successive frontier (so every edge comes
+    after all edges into its source) and a mask of tasks reached.
+    """
+    inner = np.arange(len(source)) if mask is None else np.flatnonzero(mask[source] & mask[target])
+    order, offsets = _csr(source[inner], task_count)
+    order = inner[order]
+    indegree = np.bincount(target[inner], minlength=task_count)
+    reached = np.zeros(task_count, dtype=bool)
+    frontier = np.flatnonzero(indegree == 0 if mask is None else mask & (indegree == 0))
+    levels = []
+    while frontier.size:
+        reached[frontier] = True
+        edges = _gather(order, offsets, frontier)
+        if not edges.size:
+            break
+        levels.append(edges)
+        heads = target[edges]
+        indegree -= np.bincount(heads, minlength=task_count)
+        heads = np.unique(heads)
+        frontier = heads[indegree[heads] == 0]
+    return levels, reached
+
+
+class Network:
+    """A dependency network and its latest critical-path times.
+
+    ``durations`` and ``lag`` are in working hours; ``source``/``target``/
+    ``types`` are the edge table arrays (see relations.EdgeTable). Edges to
+    tasks outside the parse (-1), to inactive tasks (summaries) and self-links
+    are ignored. ``parent`` (task positions, -1 at the top) rolls summaries
+    up (``depth``, e.g. TaskIndex.hierarchy.depth, saves recomputing it).
+    Tasks start no earlier than hour 0.
+
+    After ``schedule()``, the set_*/add_link/remove_link patches record which
+    tasks they touch, and ``reschedule()`` reruns the forward pass over their
+    successors only and the backward pass over their predecessors
+    (everything, if the project finish moved).
+    """
+
+    def __init__(self, durations, source, target, types, lag, active=None, parent=None, depth=None):
+        self.duration = np.nan_to_num(np.asarray(durations, dtype=np.float64))
+        task_count = self.task_count = len(self.duration)
+        self.active = np.ones(task_count, dtype=bool) if active is None else np.asarray(active, dtype=bool)
+        self.parent = None if parent is None else np.asarray(parent, dtype=np.int64)
+        if parent is None:
+            self.depth = None
+        else:
+            self.depth = outline_depth(self.parent) if depth is None else np.asarray(depth, dtype=np.int64)
+        for name, default in _BOUND_DEFAULTS.items():
+            setattr(self, name, np.full(task_count, default))
+
+        source = np.asarray(source, dtype=np.int64)
+        target = np.asarray(target, dtype=np.int64)
+        keep = (source >= 0) & (target >= 0) & (source != target)
+        keep[keep] = self.active[source[keep]] & self.active[target[keep]]
+        self._set_edges(source[keep], target[keep], np.asarray(types, dtype=np.int64)[keep],
+                        np.nan_to_num(np.asarray(lag, dtype=np.float64))[keep])
+
+        self.early_start = np.zeros(task_count)
+        self.late_finish = np.zeros(task_count)
+        self.free_slack = np.zeros(task_count)
+        self.reached = np.zeros(task_count, dtype=bool)
+        self.finish = 0.0
+        self.result = None
+        self._forward_seeds = set()
+        self._backward_seeds = set()
+
+    def copy(self):
+        other = Network.__new__(Network)
+        for name, value in self.__dict__.items():
+            if isinstance(value, (np.ndarray, set)):
+                value = value.copy()
+            other.__dict__[name] = value
+        return other
+
+    def _set_edges(self, source, target, types, lag):
+        self.source = source
+        self.target = target
+        self.types = types
+        self.lag = lag
+        self.from_finish = (types == FS) | (types == FF)
+        self.to_finish = (types == FF) | (types == SF)
+        self._out = self._in = self._levels = None
+
+    def _out_edges(self):
+        if self._out is None:
+            self._out = _csr(self.source, self.task_count)
+        return self._out
+
+    def _in_edges(self):
+        if self._in is None:
+            self._in = _csr(self.target, self.task_count)
+        return self._in
+
+    def _all_levels(self):
+        """(levels, reached) over the whole network, kept until the links change."""
+        if self._levels is None:
+            self._levels = _levels(self.task_count, self.source, self.target)
+        return self._levels
+
+    # -- patches ---------------------------------------------------------
+
+    def _check_task(self, task, what):
+        if not 0 <= task < self.task_count:
+            raise ValueError(f"No task at position {task}")
+        if not self.active[task]:
+            raise ValueError(f"Summary tasks are not scheduled directly ({what})")
+
+    def set_duration(self, task, hours):
+        self._check_task(task, 'duration')
+        if hours < 0:
+            raise ValueError("Durations cannot be negative")
+        self.duration[task] = hours
+        self._forward_seeds.add(task)
+        self._backward_seeds.add(task)
+
+    def set_constraint(self, task, name, hours=None):
+        """Apply constraint ``name`` (a CONSTRAINTS key) at ``hours``, replacing any earlier one."""
+        self._check_task(task, 'constraint')
+        bounds = CONSTRAINTS.get(name)
+        if bounds is None:
+            raise ValueError(f"constraint type must be one of: {', '.join(CONSTRAINTS)}")
+        if bounds and hours is None:
+            raise ValueError(f"{name} needs a date")
+        for bound, default in _BOUND_DEFAULTS.items():
+            getattr(self, bound)[task] = hours if bound in bounds else default
+        self._forward_seeds.add(task)
+        self._backward_seeds.add(task)
+
+    def add_link(self, source, target, relation_type=FS, lag=0.0):
+        self._check_task(source, 'link')
+        self._check_task(target, 'link')
+        if source == target:
+            raise ValueError("A task cannot depend on itself")
+        self._set_edges(np.append(self.source, source), np.append(self.target, target),
+                        np.append(self.types, relation_type), np.append(self.lag, lag))
+        self._forward_seeds.add(target)
+        self._backward_seeds.add(source)
+
+    def remove_link(self, source, target, relation_type=None):
+        """Drop the links from ``source`` to ``target`` (of one type if given); returns how many."""
+        match = (self.source == source) & (self.target == target)
+        if relation_type is not None:
+            match &= self.types == relation_type
+        removed = int(match.sum())
+        if removed:
+            keep = ~match
+            self._set_edges(self.source[keep], self.target[keep], self.types[keep], self.lag[keep])
+            self._forward_seeds.add(target)
+            self._backward_seeds.add(source)
+        return removed
+
+    # -- passes ----------------------------------------------------------
+
+    def _early_bound(self, tasks):
+        return np.maximum(self.start_floor[tasks], self.finish_floor[tasks] - self.duration[tasks])
+
+    def _late_bound(self, tasks):
+        return np.minimum(self.finish, np.minimum(self.finish_cap[tasks], self.start_cap[tasks] + self.duration[tasks]))
+
+    def _relax_forward(self, edges):
+        s = self.source[edges]
+        t = self.target[edges]
+        anchor = self.early_start[s] + np.where(self.from_finish[edges], self.duration[s], 0.0)
+        np.maximum.at(self.early_start, t,
+                      anchor + self.lag[edges] - np.where(self.to_finish[edges], self.duration[t], 0.0))
+
+    def _relax_backward(self, edges):
+        s = self.source[edges]
+        t = self.target[edges]
+        anchor = self.late_finish[t] - np.where(self.to_finish[edges], 0.0, self.duration[t])
+        np.minimum.at(self.late_finish, s,
+                      anchor - self.lag[edges] + np.where(self.from_finish[edges], 0.0, self.duration[s]))
+
+    def _forward(self, mask, levels):
+        self.early_start[mask] = self._early_bound(mask)
+        self._relax_forward(np.flatnonzero(mask[self.target] & ~mask[self.source]))
+        for edges in levels:
+            self._relax_forward(edges)
+
+    def _backward(self, mask, levels):
+        self.late_finish[mask] = self._late_bound(mask)
+        self._relax_backward(np.flatnonzero(mask[self.source] & ~mask[self.target]))
+        for edges in reversed(levels):
+            self._relax_backward(edges)
+
+    def _free(self, mask):
+        """Free slack for ``mask``: how far each task can slip before it delays any successor."""
+        early_finish = self.early_start + self.duration
+        self.free_slack[mask] = self.finish - early_finish[mask]
+        edges = np.flatnonzero(mask[self.source] & self.reached[self.target])
+        s = self.source[edges]
+        t = self.target[edges]
+        successor = np.where(self.to_finish[edges], early_finish[t], self.early_start[t])
+        predecessor = np.where(self.from_finish[edges], early_finish[s], self.early_start[s])
+        np.minimum.at(self.free_slack, s, successor - self.lag[edges] - predecessor)
+        self.free_slack[mask] = np.maximum(self.free_slack[mask], 0.0)
+
+    def _project_finish(self):
+        scheduled = self.reached & self.active
+        return float((self.early_start + self.duration)[scheduled].max()) if scheduled.any() else 0.0
+
+    def schedule(self):
+        """Full forward and backward pass; returns the Schedule."""
+        everything = np.ones(self.task_count, dtype=bool)
+        levels, self.reached = self._all_levels()
+        self._forward(everything, levels)
+        self.finish = self._project_finish()
+        self._backward(everything, levels)
+        self._free(everything)
+        self._forward_seeds.clear()
+        self._backward_seeds.clear()
+        self.result = self._snapshot()
+        return self.result
+
+    def reschedule(self):
+        """Recompute after patches, touching only the affected tasks.
+
+        Returns (Schedule, forward count, backward count), the counts being how
+        many tasks each pass revisited. Raises CycleError if a patch closed a
+        dependency cycle.
+        """
+        if self.result is None or self.result.cycle_tasks:
+            cycles = self.result.cycle_tasks if self.result is not None else 0
+            result = self.schedule()
+            if result.cycle_tasks > cycles:
+                raise CycleError("The change creates a dependency cycle")
+            return result, self.task_count, self.task_count
+        if not (self._forward_seeds or self._backward_seeds):
+            return self.result, 0, 0
+
+        order, offsets = self._out_edges()
+        forward = _closure(order, offsets, self.target, sorted(self._forward_seeds), self.task_count)
+        levels, reached = _levels(self.task_count, self.source, self.target, forward)
+        if (forward & ~reached).any():
+            raise CycleError("The change creates a dependency cycle")
+        self._forward(forward, levels)
+        finish = self._project_finish()
+
+        if finish != self.finish:
+            self.finish = finish
+            backward = np.ones(self.task_count, dtype=bool)
+            levels, _ = self._all_levels()
+        else:
+            # Late dates depend only on successors, so only the patched
+            # tasks' predecessors can move.
+            order, offsets = self._in_edges()
+            backward = _closure(order, offsets, self.source, sorted(self._backward_seeds), self.task_count)
+            levels, _ = _levels(self.task_count, self.source, self.target, backward)
+        self._backward(backward, levels)
+
+        # Free slack depends on a task's own finish and its successors' starts.
+        touched = forward | backward
+        touched[self.source[touched[self.target]]] = True
+        self._free(touched)
+
+        self._forward_seeds.clear()
+        self._backward_seeds.clear()
+        self.result = self._snapshot()
+        return self.result, int(forward.sum()), int(backward.sum())
+
+    def _snapshot(self):
+        early_start = self.early_start.copy()
+        early_finish = early_start + self.duration
+        late_finish = self.late_finish.copy()
+        late_start = late_finish - self.duration
+        result = Schedule(self.duration.copy(), early_start, early_finish, late_start, late_finish,
+                          late_start - early_start, self.free_slack.copy(), self.finish,
+                          int((self.active & ~self.reached).sum()))
+        unscheduled = ~(self.reached & self.active)
+        for values in (result.early_start, result.early_finish, result.late_start,
+                       result.late_finish, result.total_slack, result.free_slack):
+            values[unscheduled] = np.nan
+        if self.parent is not None:
+            roll_up(result, self.parent, self.depth)
+        return result
+
+
+def schedule(durations, source, target, types, lag, active=None, parent=None):
+    """One full critical-path pass (see Network); returns the Schedule."""
+    return Network(durations, source, target, types, lag, active, parent).schedule()
+
+
+def outline_depth(parent):
+    """Number of ancestors of each task, following ``parent`` links."""
+    parent = np.asarray(parent, dtype=np.int64)
+    depth = np.zeros(len(parent), dtype=np.int64)
+    up = parent.copy()
+    for _ in range(len(parent)):
+        has = up >= 0
+        if not has.any():
+            break
+        depth += has
+        up = np.where(has, parent[np.maximum(up, 0)], -1)
+    return depth
+
+
+def roll_up(result, parent, depth=None):
+    """Give summary tasks the span of their scheduled descendants.
+
+    Early/late starts are the earliest below, finishes the latest, total slack
+    the least; free slack is left unset. Deepest summaries are filled first,
+    and each summary's duration becomes its early span.
+    """
+    parent = np.asarray(parent, dtype=np.int64)
+    if not (parent >= 0).any():
+        return result
+    if depth is None:
+        depth = outline_depth(parent)
+    for level in range(int(depth.max()), 0, -1):
+        rows = np.flatnonzero((depth == level) & (parent >= 0))
+        if not rows.size:
+            continue
+        heads = parent[rows]
+        np.fmin.at(result.early_start, heads, result.early_start[rows])
+        np.fmin.at(result.late_start, heads, result.late_start[rows])
+        np.fmax.at(result.early_finish, heads, result.early_finish[rows])
+        np.fmax.at(result.late_finish, heads, result.late_finish[rows])
+        np.fmin.at(result.total_slack, heads, result.total_slack[rows])
+    heads = np.unique(parent[parent >= 0])
+    result.duration[heads] = result.early_finish[heads] - result.early_start[heads]
+    return result
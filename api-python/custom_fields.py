@@ -0,0 +1,77 @@
+import math
+
+import jpype
+
+from task_fields import int_list
+
+HELPER_CLASS = 'com.pinnacle.mpp.CustomFieldExtractor'
+
+
+def populated_field_types(project):
+    """Task field types holding a value on at least one task, or None if MPXJ cannot tell."""
+    try:
+        return set(project.getTasks().getPopulatedFields())
+    except Exception as e:
+        print(f"Populated field probe failed ({e}); reading every custom field.")
+        return None
+
+
+def unique_field_types(field_types, populated=None):
+    """``field_types`` without repeats, keeping only populated ones when ``populated`` is known."""
+    seen = []
+    for field_type in field_types:
+        if field_type in seen:
+            continue
+        if populated is not None and field_type not in populated:
+            continue
+        seen.append(field_type)
+    return seen
+
+
+def read_columns(parser, tasks, field_types):
+    """One sparse column per field type: {task position: value}, populated cells only.
+
+    Values are converted as ProjectParser._get_custom_field_value does.
+    """
+    if not field_types:
+        return []
+    if getattr(parser, 'custom_field_extractor', None) is not None:
+        try:
+            return _read_columns_java(parser, tasks, field_types)
+        except Exception as e:
+            print(f"Custom field extractor failed ({e}); reading custom fields per task.")
+    return _read_columns_python(parser, tasks, field_types)
+
+
+def _read_columns_java(parser, tasks, field_types):
+    offsets, rows, numbers, texts = parser.custom_field_extractor.extract(
+        jpype.JArray(jpype.JObject)(tasks), jpype.JArray(jpype.JObject)(field_types))
+    offsets = int_list(offsets)
+    rows = int_list(rows)
+    numbers = memoryview(numbers).tolist()
+    texts = list(texts)
+    columns = []
+    for column in range(len(field_types)):
+        values = {}
+        for cell in range(offsets[column], offsets[column + 1]):
+            number = numbers[cell]
+            if not math.isnan(number) or texts[cell] is None:
+                values[rows[cell]] = number
+                continue
+            text = str(texts[cell]).strip()
+            if text:
+                values[rows[cell]] = text
+        columns.append(values)
+    return columns
+
+
+def _read_columns_python(parser, tasks, field_types):
+    columns = []
+    for field_type in field_types:
+        values = {}
+        for row, task in enumerate(tasks):
+            value = parser._get_custom_field_value(task, field_type)
+            if value is not None:
+                values[row] = value
+        columns.append(values)
+    return columns
@@ -0,0 +1,24 @@
+# Gunicorn hooks for the MPP parser service.
+#
+# With PARSER_PRELOAD=1 each worker starts the JVM, loads the hot MPXJ classes
+# and parses fixtures/warmup.xml before it accepts traffic.
+# PARSER_PRELOAD=background does the same on a thread; /health reports
+# "warming" (HTTP 503) until it finishes.
+#
+# With PARSER_WORKER_PROCESSES > 0 warm-up starts the parse worker processes
+# instead, and worker_exit stops them with the gunicorn worker.
+
+
+def post_worker_init(worker):
+    import mpp_parser
+
+    mode = mpp_parser.preload_mode()
+    if mode:
+        mpp_parser.start_warm_up(background=mode == 'background')
+
+
+def worker_exit(server, worker):
+    import mpp_parser
+
+    if mpp_parser.worker_pool is not None:
+        mpp_parser.worker_pool.shutdown()
@@ -0,0 +1,262 @@
+package com.pinnacle.mpp;
+
+import java.lang.reflect.Method;
+import java.util.HashMap;
+import java.util.Map;
+
+import org.mpxj.Duration;
+
+/**
+ * Reads a fixed list of task getters for a slice of tasks in a single call
+ * from Python, so mpp_parser.py pays one JPype crossing per chunk instead of
+ * one per getter per task.
+ *
+ * Values are normalised the same way ProjectParser does it on the Python
+ * side: TEXT and CALENDAR columns come back in a String[] (null when the
+ * getter returned null), every other kind in a double[] (NaN when null).
+ * Both arrays are row-major: row * columnCount + slot.
+ */
+public final class BulkTaskExtractor
+{
+   public static final int TEXT = 0;
+   public static final int NUMBER = 1;
+   public static final int WORK = 2;
+   public static final int HOURS = 3;
+   public static final int BOOL = 4;
+   public static final int CALENDAR = 5;
+
+   private static final double HOURS_PER_DAY = 8.0;
+
+   private final String[] m_getters;
+   private final int[] m_kinds;
+   private final int[] m_slots;
+   private final int m_textColumns;
+   private final int m_numberColumns;
+   private final Map<Class<?>, Method[]> m_methodCache = new HashMap<Class<?>, Method[]>();
+   private final Map<Class<?>, Method> m_nameCache = new HashMap<Class<?>, Method>();
+
+   public BulkTaskExtractor(String[] getters, int[] kinds)
+   {
+      if (getters.length != kinds.length)
+      {
+         throw new IllegalArgumentException("getters and kinds must have the same length");
+      }
+      m_getters = (String[]) getters.clone();
+      m_kinds = (int[]) kinds.clone();
+      m_slots = new int[kinds.length];
+      int text = 0;
+      int number = 0;
+      for (int index = 0; index < kinds.length; index++)
+      {
+         if (isText(kinds[index]))
+         {
+            m_slots[index] = text++;
+         }
+         else
+         {
+            m_slots[index] = number++;
+         }
+      }
+      m_textColumns = text;
+      m_numberColumns = number;
+   }
+
+   public int getTextColumns()
+   {
+      return m_textColumns;
+   }
+
+   public int getNumberColumns()
+   {
+      return m_numberColumns;
+   }
+
+   /**
+    * Extract every configured column for the given tasks.
+    *
+    * @return two element array: String[] text columns, double[] numeric columns
+    */
+   public synchronized Object[] extract(Object[] tasks)
+   {
+      int rows = tasks.length;
+      String[] text = new String[rows * m_textColumns];
+      double[] numbers = new double[rows * m_numberColumns];
+
+      for (int row = 0; row < rows; row++)
+      {
+         Object task = tasks[row];
+         Method[] methods = task == null ? null : getMethods(task.getClass());
+         for (int column = 0; column < m_getters.length; column++)
+         {
+            Object value = methods == null ? null : invoke(methods[column], task);
+            int kind = m_kinds[column];
+            if (isText(kind))
+            {
+               text[row * m_textColumns + m_slots[column]] = kind == CALENDAR ? calendarName(value) : toText(value);
+            }
+            else
+            {
+               numbers[row * m_numberColumns + m_slots[column]] = toNumber(value, kind);
+            }
+         }
+      }
+
+      return new Object[]
+      {
+         text,
+         numbers
+      };
+   }
+
+   private static boolean isText(int kind)
+   {
+      return kind == TEXT || kind == CALENDAR;
+   }
+
+   private Method[] getMethods(Class<?> type)
+   {
+      Method[] methods = (Method[]) m_methodCache.get(type);
+      if (methods == null)
+      {
+         methods = new Method[m_getters.length];
+         for (int index = 0; index < m_getters.length; index++)
+         {
+            methods[index] = findMethod(type, m_getters[index]);
+         }
+         m_methodCache.put(type, methods);
+      }
+      return methods;
+   }
+
+   private static Method findMethod(Class<?> type, String name)
+   {
+      try
+      {
+         return type.getMethod(name);
+      }
+      catch (Exception ex)
+      {
+         return null;
+      }
+   }
+
+   private static Object invoke(Method method, Object target)
+   {
+      if (method == null)
+      {
+         return null;
+      }
+      try
+      {
+         return method.invoke(target);
+      }
+      catch (Exception ex)
+      {
+         return null;
+      }
+   }
+
+   private static String toText(Object value)
+   {
+      return value == null ? null : String.valueOf(value);
+   }
+
+   private String calendarName(Object value)
+   {
+      if (value == null)
+      {
+         return null;
+      }
+      Class<?> type = value.getClass();
+      Method method;
+      if (m_nameCache.containsKey(type))
+      {
+         method = (Method) m_nameCache.get(type);
+      }
+      else
+      {
+         method = findMethod(type, "getName");
+         m_nameCache.put(type, method);
+      }
+      if (method == null)
+      {
+         return String.valueOf(value);
+      }
+      Object name = invoke(method, value);
+      return name == null ? "" : String.valueOf(name);
+   }
+
+   private static double toNumber(Object value, int kind)
+   {
+      if (value == null)
+      {
+         return Double.NaN;
+      }
+
+      switch (kind)
+      {
+         case BOOL:
+         {
+            if (value instanceof Boolean)
+            {
+               return ((Boolean) value).booleanValue() ? 1.0 : 0.0;
+            }
+            return 1.0;
+         }
+
+         case WORK:
+         {
+            if (value instanceof Duration)
+            {
+               return ((Duration) value).getDuration();
+            }
+            break;
+         }
+
+         case HOURS:
+         {
+            if (value instanceof Duration)
+            {
+               return toHours((Duration) value);
+            }
+            break;
+         }
+
+         default:
+         {
+            break;
+         }
+      }
+
+      if (value instanceof Number)
+      {
+         return ((Number) value).doubleValue();
+      }
+      return 0.0;
+   }
+
+   /**
+    * Duration in hours, as ProjectParser._to_duration_hours converts it:
+    * day and week units at 8 hours per day, anything else taken as hours.
+    */
+   static double toHours(Duration duration)
+   {
+      double hours = duration.getDuration();
+      if (duration.getUnits() != null)
+      {
+         String units = String.valueOf(duration.getUnits()).toUpperCase();
+         if (units.indexOf("DAY") != -1 || units.equals("D"))
+         {
+            hours = hours * HOURS_PER_DAY;
+         }
+         else
+         {
+            if (units.indexOf("WEEK") != -1 || units.equals("W"))
+            {
+               hours = hours * HOURS_PER_DAY * 5;
+            }
+         }
+      }
+      return hours;
+   }
+}
@@ -0,0 +1,71 @@
+package com.pinnacle.mpp;
+
+import java.io.InputStream;
+import java.nio.ByteBuffer;
+
+/**
+ * InputStream over a ByteBuffer, so mpp_parser.py can hand MPXJ an upload
+ * that lives in Python memory (a direct buffer over a bytearray or mmap)
+ * without copying it into a Java byte[] or writing it to disk first.
+ *
+ * The stream reads from its own duplicate of the buffer; mark/reset are
+ * supported so readers that sniff the file header can rewind.
+ */
+public final class ByteBufferInputStream extends InputStream
+{
+   private final ByteBuffer m_buffer;
+   private int m_mark;
+
+   public ByteBufferInputStream(ByteBuffer buffer)
+   {
+      m_buffer = (ByteBuffer) buffer.duplicate();
+      m_mark = m_buffer.position();
+   }
+
+   @Override public int read()
+   {
+      return m_buffer.hasRemaining() ? (m_buffer.get() & 0xFF) : -1;
+   }
+
+   @Override public int read(byte[] b, int off, int len)
+   {
+      if (len == 0)
+      {
+         return 0;
+      }
+      if (!m_buffer.hasRemaining())
+      {
+         return -1;
+      }
+      int count = Math.min(len, m_buffer.remaining());
+      m_buffer.get(b, off, count);
+      return count;
+   }
+
+   @Override public long skip(long n)
+   {
+      int count = (int) Math.max(0, Math.min(n, m_buffer.remaining()));
+      m_buffer.position(m_buffer.position() + count);
+      return count;
+   }
+
+   @Override public int available()
+   {
+      return m_buffer.remaining();
+   }
+
+   @Override public boolean markSupported()
+   {
+      return true;
+   }
+
+   @Override public synchronized void mark(int readLimit)
+   {
+      m_mark = m_buffer.position();
+   }
+
+   @Override public synchronized void reset()
+   {
+      m_buffer.position(m_mark);
+   }
+}
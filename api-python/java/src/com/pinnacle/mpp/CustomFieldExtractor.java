@@ -0,0 +1,72 @@
+package com.pinnacle.mpp;
+
+import java.util.Arrays;
+
+import org.mpxj.FieldType;
+import org.mpxj.Task;
+
+/**
+ * Reads custom field values column by column in one call from Python,
+ * keeping only the cells that hold a value.
+ *
+ * extract() returns Object[] { int[] columnOffsets, int[] rows,
+ * double[] numbers, Object[] texts }. The cells of column c are
+ * rows/numbers/texts[columnOffsets[c] .. columnOffsets[c + 1]); a numeric
+ * cell has its value in numbers and null in texts, any other value is
+ * passed as String.valueOf(value) in texts with NaN in numbers.
+ */
+public final class CustomFieldExtractor
+{
+   private CustomFieldExtractor()
+   {
+   }
+
+   public static Object[] extract(Object[] tasks, Object[] fieldTypes)
+   {
+      int[] columnOffsets = new int[fieldTypes.length + 1];
+      int[] rows = new int[16];
+      double[] numbers = new double[16];
+      Object[] texts = new Object[16];
+      int size = 0;
+
+      for (int column = 0; column < fieldTypes.length; column++)
+      {
+         FieldType type = (FieldType) fieldTypes[column];
+         for (int row = 0; row < tasks.length; row++)
+         {
+            Object value = ((Task) tasks[row]).getCachedValue(type);
+            if (value == null)
+            {
+               continue;
+            }
+            if (size == rows.length)
+            {
+               rows = Arrays.copyOf(rows, size * 2);
+               numbers = Arrays.copyOf(numbers, size * 2);
+               texts = Arrays.copyOf(texts, size * 2);
+            }
+            rows[size] = row;
+            if (value instanceof Number)
+            {
+               numbers[size] = ((Number) value).doubleValue();
+               texts[size] = null;
+            }
+            else
+            {
+               numbers[size] = Double.NaN;
+               texts[size] = String.valueOf(value);
+            }
+            size++;
+         }
+         columnOffsets[column + 1] = size;
+      }
+
+      return new Object[]
+      {
+         columnOffsets,
+         Arrays.copyOf(rows, size),
+         Arrays.copyOf(numbers, size),
+         Arrays.copyOf(texts, size)
+      };
+   }
+}
@@ -0,0 +1,183 @@
+package com.pinnacle.mpp;
+
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.IdentityHashMap;
+import java.util.List;
+import java.util.Map;
+
+import org.mpxj.Duration;
+import org.mpxj.Relation;
+import org.mpxj.RelationType;
+import org.mpxj.Task;
+
+/**
+ * Reads every dependency of a task list exactly once (from each task's
+ * predecessor list, plus successor links to tasks outside the list, which
+ * no predecessor list in it holds) into a flat edge table, in one call from
+ * Python.
+ *
+ * extract() returns Object[] { int[] from, int[] to, int[] type,
+ * double[] lag, int[] unresolvedEdges, Object[] unresolvedTasks,
+ * double[] lagHours }. from/to
+ * are positions in the task array passed in; an endpoint that is not in
+ * that array is -1 and its Task is listed in unresolvedTasks next to the
+ * edge number. Types use the codes FS=0, SS=1, FF=2, SF=3; lag is the raw
+ * Duration value, as mpp_parser.py has always reported it, and lagHours the
+ * same lag converted as task durations are (see BulkTaskExtractor.toHours).
+ */
+public final class RelationExtractor
+{
+   public static final int FS = 0;
+   public static final int SS = 1;
+   public static final int FF = 2;
+   public static final int SF = 3;
+
+   private RelationExtractor()
+   {
+   }
+
+   public static Object[] extract(Object[] tasks)
+   {
+      Map<Object, Integer> positions = new IdentityHashMap<Object, Integer>();
+      for (int index = 0; index < tasks.length; index++)
+      {
+         positions.put(tasks[index], Integer.valueOf(index));
+      }
+
+      EdgeList edges = new EdgeList();
+      for (int index = 0; index < tasks.length; index++)
+      {
+         Task task = (Task) tasks[index];
+         List<?> predecessors = task.getPredecessors();
+         if (predecessors != null)
+         {
+            for (Object item : predecessors)
+            {
+               Relation relation = (Relation) item;
+               Task predecessor = relation.getPredecessorTask();
+               if (predecessor == null)
+               {
+                  continue;
+               }
+               Integer position = positions.get(predecessor);
+               if (position == null)
+               {
+                  edges.addUnresolved(predecessor);
+               }
+               edges.add(position == null ? -1 : position.intValue(), index, relation);
+            }
+         }
+
+         // Links into tasks in the list were read from their predecessors.
+         List<?> successors = task.getSuccessors();
+         if (successors != null)
+         {
+            for (Object item : successors)
+            {
+               Relation relation = (Relation) item;
+               Task successor = relation.getSuccessorTask();
+               if (successor == null || positions.containsKey(successor))
+               {
+                  continue;
+               }
+               edges.addUnresolved(successor);
+               edges.add(index, -1, relation);
+            }
+         }
+      }
+      return edges.toArray();
+   }
+
+   private static int typeCode(RelationType type)
+   {
+      if (type == RelationType.START_START)
+      {
+         return SS;
+      }
+      if (type == RelationType.FINISH_FINISH)
+      {
+         return FF;
+      }
+      if (type == RelationType.START_FINISH)
+      {
+         return SF;
+      }
+      return FS;
+   }
+
+   private static final class EdgeList
+   {
+      private final IntList m_from = new IntList();
+      private final IntList m_to = new IntList();
+      private final IntList m_type = new IntList();
+      private double[] m_lag = new double[16];
+      private double[] m_lagHours = new double[16];
+      private final IntList m_unresolvedEdges = new IntList();
+      private final ArrayList<Object> m_unresolvedTasks = new ArrayList<Object>();
+
+      /**
+       * Records the outside endpoint of the edge about to be added.
+       */
+      void addUnresolved(Task task)
+      {
+         m_unresolvedEdges.add(m_from.size());
+         m_unresolvedTasks.add(task);
+      }
+
+      void add(int from, int to, Relation relation)
+      {
+         int edge = m_from.size();
+         m_from.add(from);
+         m_to.add(to);
+         m_type.add(typeCode(relation.getType()));
+         if (edge == m_lag.length)
+         {
+            m_lag = Arrays.copyOf(m_lag, edge * 2);
+            m_lagHours = Arrays.copyOf(m_lagHours, edge * 2);
+         }
+         Duration duration = relation.getLag();
+         m_lag[edge] = duration == null ? 0.0 : duration.getDuration();
+         m_lagHours[edge] = duration == null ? 0.0 : BulkTaskExtractor.toHours(duration);
+      }
+
+      Object[] toArray()
+      {
+         return new Object[]
+         {
+            m_from.toArray(),
+            m_to.toArray(),
+            m_type.toArray(),
+            Arrays.copyOf(m_lag, m_from.size()),
+            m_unresolvedEdges.toArray(),
+            m_unresolvedTasks.toArray(),
+            Arrays.copyOf(m_lagHours, m_from.size())
+         };
+      }
+   }
+
+   private static final class IntList
+   {
+      private int[] m_values = new int[16];
+      private int m_size;
+
+      void add(int value)
+      {
+         if (m_size == m_values.length)
+         {
+            m_values = Arrays.copyOf(m_values, m_size * 2);
+         }
+         m_values[m_size++] = value;
+      }
+
+      int size()
+      {
+         return m_size;
+      }
+
+      int[] toArray()
+      {
+         return Arrays.copyOf(m_values, m_size);
+      }
+   }
+}
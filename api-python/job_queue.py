@@ -0,0 +1,165 @@
+import time
+import uuid
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class Job:
+    __slots__ = ('id', 'status', 'created', 'started', 'finished', 'progress', 'result', 'cache_key', 'error')
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.status = 'queued'
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.progress = {'stage': 'queued', 'tasksExtracted': 0}
+        self.result = None
+        self.cache_key = None
+        self.error = None
+
+    @property
+    def done(self):
+        return self.status in ('succeeded', 'failed')
+
+    def to_dict(self):
+        return {
+            'jobId': self.id,
+            'status': self.status,
+            'progress': dict(self.progress),
+            'createdAt': self.created,
+            'startedAt': self.started,
+            'finishedAt': self.finished,
+            'error': self.error,
+        }
+
+
+class JobManager:
+    """In-process queue of background parse jobs.
+
+    ``run(job, data)`` executes on one of ``max_workers`` threads, may update
+    ``job.progress`` as it goes and returns the serialized result body, or
+    None when the body is kept elsewhere (the parse cache, under
+    ``job.cache_key``). At most ``max_pending`` jobs may be queued or running;
+    finished jobs are dropped ``ttl`` seconds after they complete. Bodies held
+    here total at most ``max_result_bytes``, the oldest being let go first.
+    """
+
+    def __init__(self, run, max_workers=2, max_pending=32, ttl=900, max_result_bytes=64 * 1024 * 1024):
+        self._run = run
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending = max(1, int(max_pending))
+        self.ttl = float(ttl)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='parse-job')
+        self.max_result_bytes = int(max_result_bytes)
+        self._jobs = {}
+        self._held = OrderedDict()  # job id -> held result size, oldest first
+        self._held_bytes = 0
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.rejected = 0
+        self.expired = 0
+        self.results_dropped = 0
+
+    def _hold_locked(self, job, result):
+        job.result = result
+        if result is None:
+            return
+        self._held[job.id] = len(result)
+        self._held_bytes += len(result)
+        while self._held_bytes > self.max_result_bytes and self._held:
+            job_id, size = self._held.popitem(last=False)
+            self._held_bytes -= size
+            self._jobs[job_id].result = None
+            self.results_dropped += 1
+
+    def _release_locked(self, job_id):
+        size = self._held.pop(job_id, None)
+        if size is not None:
+            self._held_bytes -= size
+
+    def _sweep_locked(self):
+        cutoff = time.time() - self.ttl
+        for job_id in [j.id for j in self._jobs.values() if j.done and j.finished is not None and j.finished < cutoff]:
+            del self._jobs[job_id]
+            self._release_locked(job_id)
+            self.expired += 1
+
+    def submit(self, data, *args):
+        """Queue ``run(job, data, *args)``; raises JobQueueFull past max_pending."""
+        with self._lock:
+            self._sweep_locked()
+            pending = sum(1 for j in self._jobs.values() if not j.done)
+            if pending >= self.max_pending:
+                self.rejected += 1
+                raise JobQueueFull(f"{pending} parse jobs already pending")
+            job = Job()
+            self._jobs[job.id] = job
+            self.submitted += 1
+        self._executor.submit(self._execute, job, data, args)
+        return job
+
+    def complete(self, result=None, cache_key=None):
+        """Register an already-finished job (e.g. a parse cache hit)."""
+        job = Job()
+        job.status = 'succeeded'
+        job.started = job.finished = job.created
+        job.progress['stage'] = 'done'
+        job.cache_key = cache_key
+        with self._lock:
+            self._sweep_locked()
+            self._jobs[job.id] = job
+            self._hold_locked(job, result)
+            self.submitted += 1
+        return job
+
+    def _execute(self, job, data, args):
+        job.status = 'running'
+        job.started = time.time()
+        job.progress['stage'] = 'running'
+        try:
+            result = self._run(job, data, *args)
+        except Exception as e:
+            traceback.print_exc()
+            with self._lock:
+                job.error = str(e)
+                job.progress['stage'] = 'failed'
+                job.finished = time.time()
+                job.status = 'failed'
+            return
+        # finished is set with the status, under the lock, so a sweep never
+        # sees a done job without a finish time.
+        with self._lock:
+            self._hold_locked(job, result)
+            job.progress['stage'] = 'done'
+            job.finished = time.time()
+            job.status = 'succeeded'
+
+    def get(self, job_id):
+        with self._lock:
+            self._sweep_locked()
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {
+                'workers': self.max_workers,
+                'maxPending': self.max_pending,
+                'ttlSeconds': self.ttl,
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+                'expired': self.expired,
+                'heldResultBytes': self._held_bytes,
+                'maxResultBytes': self.max_result_bytes,
+                'resultsDropped': self.results_dropped,
+                'jobs': counts,
+            }
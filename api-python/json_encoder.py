@@ -0,0 +1,114 @@
+import codecs
+import threading
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON = 'orjson'
+STDLIB = 'stdlib'
+ENCODERS = (ORJSON, STDLIB)
+COMPACT = (',', ':')
+
+# Codec error handler turning non-ASCII characters into JSON escapes.
+_ESCAPE = 'json_encoder.escape'
+
+
+def available():
+    """Encoders usable here (stdlib always is)."""
+    return tuple(e for e in ENCODERS if e == STDLIB or (e == ORJSON and orjson))
+
+
+def _escape(error):
+    # json.dumps(ensure_ascii=True) spelling: \uXXXX, astral characters as surrogate pairs.
+    escaped = []
+    for char in error.object[error.start:error.end]:
+        code = ord(char)
+        if code > 0xFFFF:
+            code -= 0x10000
+            escaped.append(f'\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}')
+        else:
+            escaped.append(f'\\u{code:04x}')
+    return ''.join(escaped), error.end
+
+
+codecs.register_error(_ESCAPE, _escape)
+
+
+def ascii_only(body):
+    """UTF-8 JSON bytes with non-ASCII characters escaped as json.dumps would."""
+    if b'\x7f' in body:
+        # json.dumps escapes DEL too; in UTF-8 that byte is only ever DEL itself.
+        body = body.replace(b'\x7f', b'\\u007f')
+    if body.isascii():
+        return body
+    return body.decode('utf-8').encode('ascii', _ESCAPE)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider with compact output encoded by orjson.
+
+    Compact dumps (``separators=(',', ':')``, as responses and the NDJSON
+    lines use) go through orjson with the provider's sort_keys and
+    ensure_ascii honoured, so the bytes match json.dumps for the values a
+    parse emits. Dates, dataclasses and anything orjson rejects (ints past
+    64 bits, non-string keys, lone surrogates) fall back to the stdlib
+    encoder, as do indented or other non-compact dumps. Two spellings
+    differ from json.dumps: floats in exponent form drop the padding and
+    plus sign (1e-6, not 1e-06; 1e20, not 1e+20), with floats down to 1e-5 written
+    out in full (0.00001), and NaN and infinities are written as null.
+    """
+
+    def __init__(self, app, encoder=ORJSON):
+        super().__init__(app)
+        self.encoder = encoder if encoder in available() else STDLIB
+        self._lock = threading.Lock()
+        self._fast = 0
+        self._fallbacks = 0
+
+    def _orjson_option(self):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def _fast_dumps(self, obj):
+        """Compact UTF-8 JSON from orjson, or None when the stdlib encoder must be used."""
+        if self.encoder != ORJSON:
+            return None
+        try:
+            body = orjson.dumps(obj, default=self.default, option=self._orjson_option())
+        except TypeError:
+            with self._lock:
+                self._fallbacks += 1
+            return None
+        with self._lock:
+            self._fast += 1
+        return ascii_only(body) if self.ensure_ascii else body
+
+    def dumps_bytes(self, obj):
+        """Compact JSON as UTF-8 bytes, the same as ``dumps(obj, separators=COMPACT).encode()``."""
+        body = self._fast_dumps(obj)
+        if body is None:
+            body = super().dumps(obj, separators=COMPACT).encode('utf-8')
+        return body
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.keys() == {'separators'} and tuple(kwargs['separators']) == COMPACT:
+            body = self._fast_dumps(obj)
+            if body is not None:
+                return body.decode('utf-8')
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b'\n', mimetype=self.mimetype)
+
+    def stats(self):
+        with self._lock:
+            return {'encoder': self.encoder, 'fast': self._fast, 'fallbacks': self._fallbacks}
@@ -1,29 +1,120 @@
 import os
+import time
+import threading
 import traceback
 import tempfile
 import json
+import io
+import itertools
+import mmap
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager
 from flask import Flask, request, jsonify, render_template
 from flask_cors import CORS
 import jpype
 import mpxj
+from parse_cache import ParseCache
+from parser_pool import ParserPool, ParserPoolExhausted
+from worker_pool import ParseWorkerPool, WorkerPoolBusy, WorkerParseError
+from job_queue import JobManager, JobQueueFull
+from schedule_sessions import ScheduleSessions
+import parse_metrics
+from parse_metrics import ParseTimings
+from task_fields import add_helper_classpath, bulk_extract_enabled, make_field_reader, resolve_fields, STRUCTURE_FIELDS, DETAIL_FIELDS, CUSTOM_KEYS
+import relations
+import resources
+import custom_fields
+import columnar
+import content_encoding
+import json_encoder
+import parse_delta
+import cpm
+import rollups
+from task_index import collect_task_index
+from task_records import Record, RecordBuilder
+
+PARSER_VERSION = "v22-orjson-encoder"
+WARMUP_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'warmup.xml')
+BUFFER_STREAM_CLASS = 'com.pinnacle.mpp.ByteBufferInputStream'
+HOT_CLASSES = [
+    'org.mpxj.reader.UniversalProjectReader',
+    'org.mpxj.mpp.MPPReader',
+    'org.mpxj.scheduling.CriticalPathMethodAnalyzer',
+    'org.mpxj.Task',
+    'org.mpxj.Relation',
+    'org.mpxj.Duration',
+    'org.mpxj.ResourceAssignment',
+]
+
+_jvm_lock = threading.Lock()
 
 def init_jvm():
-    if not jpype.isJVMStarted():
-        try:
-            jpype.startJVM("-Xmx512m", convertStrings=True)
-            print("JVM started successfully.")
-        except Exception as e:
-            print(f"JVM Startup Error: {e}")
-            return False
+    # Concurrent first requests must not both call startJVM.
+    with _jvm_lock:
+        if not jpype.isJVMStarted():
+            try:
+                add_helper_classpath()
+                jpype.startJVM("-Xmx512m", convertStrings=True)
+                print("JVM started successfully.")
+            except Exception as e:
+                print(f"JVM Startup Error: {e}")
+                return False
     return True
 
+
+class ParseJSONProvider(json_encoder.FastJSONProvider):
+    """The fast JSON provider, also encoding the task_records.Record nodes parse_file returns."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, Record):
+            return o.to_dict()
+        return json_encoder.FastJSONProvider.default(o)
+
+
+# PARSE_JSON_ENCODER: orjson (the stdlib encoder if orjson is not installed)
+# or stdlib; see json_encoder.FastJSONProvider for how their output can differ.
+PARSE_JSON_ENCODER = os.environ.get('PARSE_JSON_ENCODER', json_encoder.ORJSON).strip().lower()
 app = Flask(__name__)
+app.json = ParseJSONProvider(app, PARSE_JSON_ENCODER)
 CORS(app)
 
+parse_cache = ParseCache(
+    os.environ.get('PARSE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'mpp-parse-cache')),
+    int(float(os.environ.get('PARSE_CACHE_MAX_MB', '256')) * 1024 * 1024),
+    PARSER_VERSION,
+)
+
 class ProjectParser:
     def __init__(self):
         from org.mpxj.reader import UniversalProjectReader
         self.reader = UniversalProjectReader()
+        try:
+            from org.mpxj.scheduling import CriticalPathMethodAnalyzer
+            self.analyzer_class = CriticalPathMethodAnalyzer
+        except Exception:
+            self.analyzer_class = None
+        self.structure_reader = make_field_reader(self, STRUCTURE_FIELDS)
+        self.field_reader = make_field_reader(self, DETAIL_FIELDS)
+        self.duration_reader = make_field_reader(self, [spec for spec in DETAIL_FIELDS if spec.key == 'duration'])
+        self.rollup_reader = make_field_reader(self, [spec for spec in DETAIL_FIELDS if spec.key in rollups.FIELD_KEYS])
+        self._projected_readers = {}
+        try:
+            self.buffer_stream_class = jpype.JClass(BUFFER_STREAM_CLASS)
+        except Exception:
+            self.buffer_stream_class = None
+        self.relation_extractor = None
+        self.custom_field_extractor = None
+        if bulk_extract_enabled():
+            try:
+                self.relation_extractor = jpype.JClass(relations.HELPER_CLASS)
+            except Exception as e:
+                print(f"Relation extractor unavailable ({e}); reading relations per task.")
+            try:
+                self.custom_field_extractor = jpype.JClass(custom_fields.HELPER_CLASS)
+            except Exception as e:
+                print(f"Custom field extractor unavailable ({e}); reading custom fields per task.")
 
     def _to_iso(self, j_date):
         if not j_date: return None
@@ -149,53 +240,30 @@ class ProjectParser:
             pass
         return fallback
 
-    def _collect_tasks(self, project):
-        candidates = []
-
-        try:
-            all_tasks = project.getAllTasks()
-            if all_tasks:
-                for t in all_tasks:
-                    if t is not None:
-                        candidates.append(t)
-        except Exception:
-            pass
-
-        try:
-            top_tasks = project.getTasks()
-            if top_tasks:
-                for t in top_tasks:
-                    if t is not None:
-                        candidates.append(t)
-        except Exception:
-            pass
-
-        def add_descendants(task):
-            try:
-                children = task.getChildTasks()
-            except Exception:
-                children = None
-            if not children:
-                return
-            for child in children:
-                if child is None:
-                    continue
-                candidates.append(child)
-                add_descendants(child)
-
-        for task in list(candidates):
-            add_descendants(task)
+    def _field_task_id(self, fields, fallback=''):
+        """Same precedence as _task_id, using values already read in bulk."""
+        if fields.get('_uniqueId') is not None:
+            return str(fields['_uniqueId'])
+        if fields.get('_taskId') is not None:
+            return f"task-{fields['_taskId']}"
+        if fields.get('outlineNumber'):
+            return f"outline-{fields['outlineNumber']}"
+        return fallback
 
-        deduped = []
-        seen = set()
-        for idx, task in enumerate(candidates):
-            stable_id = self._task_id(task, fallback=f"row-{idx + 1}")
-            if stable_id in seen:
-                continue
-            seen.add(stable_id)
-            deduped.append(task)
+    def _detail_reader(self, keep, skip=()):
+        """Field reader for the detail fields in ``keep`` (None: all) but not in ``skip``; None if there are none to read."""
+        if keep is None and not skip:
+            return self.field_reader
+        key = (None if keep is None else frozenset(keep), frozenset(skip))
+        if key not in self._projected_readers:
+            wanted, skipped = key
+            specs = [spec for spec in DETAIL_FIELDS
+                     if (wanted is None or spec.key in wanted) and spec.key not in skipped]
+            self._projected_readers[key] = make_field_reader(self, specs) if specs else None
+        return self._projected_readers[key]
 
-        return deduped
+    def _collect_tasks(self, project):
+        return collect_task_index(project)
 
     @staticmethod
     def _normalize_alias(raw):
@@ -253,17 +321,124 @@ class ProjectParser:
         except Exception:
             return None
 
-    def parse_file(self, path):
-        project = self.reader.read(path)
-
+    def _read_project(self, source):
+        """Read a file path, or upload bytes straight from memory via an InputStream.
+
+        Writable buffers (bytearray, mmap) are exposed to Java as a direct
+        ByteBuffer without copying; read-only bytes are copied once into a
+        Java byte[].
+        """
+        if isinstance(source, str):
+            return self.reader.read(source)
+        stream = None
+        if self.buffer_stream_class is not None and not isinstance(source, bytes):
+            try:
+                stream = self.buffer_stream_class(jpype.nio.convertToDirectBuffer(source))
+            except Exception:
+                stream = None
+        if stream is None:
+            stream = jpype.JClass('java.io.ByteArrayInputStream')(jpype.JArray(jpype.JByte)(source))
         try:
-            from org.mpxj.scheduling import CriticalPathMethodAnalyzer
-            analyzer = CriticalPathMethodAnalyzer()
-            analyzer.schedule(project)
-        except:
-            print("Scheduling analyzer not found or failed; continuing with raw data.")
-
-        custom_field_map, all_custom_fields = self._resolve_custom_fields(project)
+            return self.reader.read(stream)
+        finally:
+            stream.close()
+
+    def parse_file(self, source, progress=None, timings=None, options=None):
+        """Collect iter_parse into one result; ``progress`` (a dict) is updated as tasks arrive.
+
+        Task nodes are held as task_records.Record (read-only mappings with
+        shared keys and interned strings) until the result is encoded. With
+        ``options['format']`` "columns" or "arrow" the result is a
+        columnar.ColumnarResult instead of a dict.
+        """
+        if options and options.get('format') in columnar.FORMATS:
+            return self.parse_columns(source, progress=progress, timings=timings, options=options)
+        result = {'success': True}
+        all_tasks = []
+        record = RecordBuilder()
+        for kind, payload in self.iter_parse(source, timings=timings, options=options):
+            if kind == 'task':
+                all_tasks.append(record(payload))
+                if progress is not None:
+                    progress['tasksExtracted'] = len(all_tasks)
+            else:
+                result[kind] = payload
+                if kind == 'project':
+                    result['tasks'] = all_tasks
+        return result
+
+    def parse_columns(self, source, progress=None, timings=None, options=None):
+        """Build a columnar.ColumnarResult straight from iter_parse (dependencies as the edge table)."""
+        options = dict(options or {}, relations=relations.EDGES)
+        result = columnar.ColumnarResult(options.get('format', columnar.COLUMNS))
+        for kind, payload in self.iter_parse(source, timings=timings, options=options):
+            result.add(kind, payload)
+            if progress is not None and kind == 'task':
+                progress['tasksExtracted'] = result.task_count
+        return result
+
+    def iter_parse(self, source, timings=None, options=None):
+        """Yield ('project', info), one ('task', node) per task, then ('summary', summary).
+
+        ``source`` is a file path or the upload bytes. Only the light per-task
+        structure (ids, names, levels, parents, folders) is held for the whole
+        project; full task nodes are built one at a time. Stage durations and
+        counts are accumulated into ``timings`` (a ParseTimings) when given.
+
+        ``options['relations']`` selects how dependencies are reported:
+        "legacy" (default) per-task predecessors/successors lists, "edges" a
+        single ('edges', table) event before the tasks, or "both".
+        ``options['resources']`` likewise: "legacy" (default) repeats each
+        resource's name and id in its assignments, "table" has assignments
+        carry a 'resource' number into one ('resources', table) event after
+        the tasks (see resources.ResourceTable, which also lists every
+        resource's assignments), "both" does both.
+        ``options['fields']`` (see task_fields.resolve_fields) limits task
+        nodes to those keys; work for the other fields is skipped.
+        ``options['schedule']`` picks the scheduler (see cpm.ENGINES): "native"
+        fills early/late dates, slack and critical flags from the cpm module,
+        "mpxj" runs MPXJ's scheduler, "none" skips scheduling; either of the
+        first two adds a 'schedule' entry to the summary.
+        ``options['rollups']`` adds a 'rollup' entry to every node (see
+        rollups.compute; None for leaf tasks), whatever ``fields`` says.
+        """
+        options = options or {}
+        relations_mode = options.get('relations', relations.LEGACY)
+        legacy_relations = relations_mode in (relations.LEGACY, relations.BOTH)
+        resources_mode = options.get('resources', resources.LEGACY)
+        legacy_resources = resources_mode in (resources.LEGACY, resources.BOTH)
+        keep = options.get('fields')
+        schedule_engine = options.get('schedule')
+
+        def wanted(*keys):
+            return keep is None or any(key in keep for key in keys)
+        if timings is None:
+            timings = ParseTimings()
+        perf = time.perf_counter
+        t0 = perf()
+        project = self._read_project(source)
+        t1 = perf()
+        timings.add('read', t1 - t0)
+
+        schedule_info = None
+        if schedule_engine == cpm.MPXJ:
+            schedule_info = self._schedule_mpxj(project)
+        elif schedule_engine is None:
+            try:
+                analyzer = self.analyzer_class()
+                analyzer.schedule(project)
+            except:
+                print("Scheduling analyzer not found or failed; continuing with raw data.")
+        t0 = perf()
+        timings.add('schedule', t0 - t1)
+
+        custom_field_map, all_custom_fields = {}, {}
+        if wanted(*CUSTOM_KEYS):
+            custom_field_map, all_custom_fields = self._resolve_custom_fields(project)
+        populated = None
+        if custom_field_map or all_custom_fields:
+            populated = custom_fields.populated_field_types(project)
+        timings.add('custom_field_scan', perf() - t0)
 
         props = project.getProjectProperties()
         project_info = {
@@ -310,404 +485,170 @@ class ProjectParser:
                 project_info['keywords'] = str(keywords)
         except Exception:
             pass
-
-        all_tasks = []
-        tasks = self._collect_tasks(project)
-
-        for idx, task in enumerate(tasks):
-            uid = self._task_id(task, fallback=f"row-{idx + 1}")
-            name = str(task.getName() or "")
-            level = int(task.getOutlineLevel() or 0)
-
-            is_summary = bool(task.getSummary())
-            parent_task = task.getParentTask()
-            parent_id = self._task_id(parent_task, fallback='') if parent_task else None
-            if not parent_id:
-                parent_id = None
+        yield 'project', project_info
+
+        t0 = perf()
+        index = self._collect_tasks(project)
+        t1 = perf()
+        timings.add('collect', t1 - t0)
+        index, structure = self._task_structure(index)
+        tasks = index.tasks
+        outline_levels = [row['outline_level'] for row in structure]
+        max_outline = max(outline_levels) if outline_levels else 0
+        min_outline = min(outline_levels) if outline_levels else 0
+        t0 = perf()
+        timings.add('structure', t0 - t1)
+        hierarchy = index.hierarchy
+        hierarchy_types = hierarchy.types(outline_levels)
+        folders = None
+        if wanted('folder'):
+            folders = hierarchy.folders([str(row['name'] or row['id']).strip() for row in structure])
+        t1 = perf()
+        timings.add('folders', t1 - t0)
+
+        edges = relations.read_edges(self, index)
+        pred_edges = edges.group(edges.target, len(tasks))
+        succ_edges = edges.group(edges.source, len(tasks))
+        timings.add('relations', perf() - t1)
+        if relations_mode != relations.LEGACY:
+            yield 'edges', edges.to_dict()
+
+        scheduled = None
+        if schedule_engine == cpm.NATIVE:
+            t0 = perf()
+            scheduled, schedule_info = self._schedule_native(index, structure, edges, project_info['startDate'])
+            timings.add('schedule', perf() - t0)
+
+        rollup_rows = None
+        if options.get('rollups'):
+            t0 = perf()
+            rollup_rows = self._rollups(index, structure, scheduled)
+            timings.add('rollups', perf() - t0)
+
+        # Custom fields are read column-wise, once per populated field type,
+        # and shared by the canonical keys and the customFields map.
+        t0 = perf()
+        field_types = custom_fields.unique_field_types(
+            list(custom_field_map.values()) + list(all_custom_fields.values()), populated)
+        columns = custom_fields.read_columns(self, tasks, field_types)
+
+        def column_for(field_type):
+            return columns[field_types.index(field_type)] if field_type in field_types else {}
+
+        canonical_columns = [(key, column_for(ft)) for key, ft in custom_field_map.items()]
+        alias_columns = [(alias, column) for alias, column in
+                         ((alias, column_for(ft)) for alias, ft in all_custom_fields.items()) if column]
+        timings.add('custom_fields', perf() - t0)
+
+        stats = _ParseStats()
+        counts = timings.counts
+        counts['relations'] = len(edges)
+
+        # Natively scheduled columns replace MPXJ's, so they are not read at all.
+        field_reader = self._detail_reader(keep, cpm.SCHEDULE_KEYS if scheduled is not None else ())
+        field_rows = timings.timed('fields', field_reader.read(tasks)) if field_reader else itertools.repeat({})
+        read_assignments = wanted('resourceAssignments', 'assignedResource')
+        resource_table = resources.ResourceTable()
+        if read_assignments or resources_mode != resources.LEGACY:
+            t0 = perf()
+            resource_table = resources.read_resources(self, project)
+            timings.add('resources', perf() - t0)
+        read_predecessors = legacy_relations and wanted('predecessors')
+        read_successors = legacy_relations and wanted('successors')
+        for idx, (task, row, fields) in enumerate(zip(tasks, structure, field_rows)):
+            t0 = perf()
+            uid = row['id']
+            name = row['name']
+            level = row['outline_level']
+            is_summary = row['is_summary']
+            parent_id = row['parent_id']
 
             res_names = []
             resource_assignments = []
-            assignments = task.getResourceAssignments()
+            assignments = task.getResourceAssignments() if read_assignments else None
             if assignments:
                 for a in assignments:
-                    r = a.getResource()
-                    if r:
-                        res_names.append(str(r.getName() or ""))
-                        try:
-                            ra = {
-                                'resourceName': str(r.getName() or ""),
-                                'resourceId': str(r.getUniqueID()) if r.getUniqueID() is not None else str(r.getID()) if r.getID() is not None else "",
-                            }
-                            if a.getUnits() is not None:
-                                ra['units'] = self._to_float(a.getUnits())
-                            if a.getWork() and a.getWork().getDuration() is not None:
-                                ra['work'] = self._to_float(a.getWork().getDuration())
-                            if a.getActualWork() and a.getActualWork().getDuration() is not None:
-                                ra['actualWork'] = self._to_float(a.getActualWork().getDuration())
-                            if a.getRemainingWork() and a.getRemainingWork().getDuration() is not None:
-                                ra['remainingWork'] = self._to_float(a.getRemainingWork().getDuration())
-                            if a.getCost() is not None:
-                                ra['cost'] = self._to_cost(a.getCost())
-                            if a.getActualCost() is not None:
-                                ra['actualCost'] = self._to_cost(a.getActualCost())
-                            if a.getRemainingCost() is not None:
-                                ra['remainingCost'] = self._to_cost(a.getRemainingCost())
-                            if a.getStart() is not None:
-                                ra['start'] = self._to_iso(a.getStart())
-                            if a.getFinish() is not None:
-                                ra['finish'] = self._to_iso(a.getFinish())
-                            resource_assignments.append(ra)
-                        except Exception as ra_err:
-                            print(f"  Warning: Could not parse resource assignment for task {uid}: {ra_err}")
+                    resource = resource_table.resource_of(a)
+                    if resource is not None:
+                        resource_name = resource_table.name[resource]
+                        resource_id = resource_table.id[resource]
+                    else:
+                        r = a.getResource()
+                        if not r:
+                            continue
+                        resource_name = str(r.getName() or "")
+                        resource_id = str(r.getUniqueID()) if r.getUniqueID() is not None else str(r.getID()) if r.getID() is not None else ""
+                    res_names.append(resource_name)
+                    try:
+                        ra = {}
+                        if legacy_resources:
+                            ra['resourceName'] = resource_name
+                            ra['resourceId'] = resource_id
+                        if resources_mode != resources.LEGACY:
+                            ra['resource'] = resource
+                        if a.getUnits() is not None:
+                            ra['units'] = self._to_float(a.getUnits())
+                        if a.getWork() and a.getWork().getDuration() is not None:
+                            ra['work'] = self._to_float(a.getWork().getDuration())
+                        if a.getActualWork() and a.getActualWork().getDuration() is not None:
+                            ra['actualWork'] = self._to_float(a.getActualWork().getDuration())
+                        if a.getRemainingWork() and a.getRemainingWork().getDuration() is not None:
+                            ra['remainingWork'] = self._to_float(a.getRemainingWork().getDuration())
+                        if a.getCost() is not None:
+                            ra['cost'] = self._to_cost(a.getCost())
+                        if a.getActualCost() is not None:
+                            ra['actualCost'] = self._to_cost(a.getActualCost())
+                        if a.getRemainingCost() is not None:
+                            ra['remainingCost'] = self._to_cost(a.getRemainingCost())
+                        if a.getStart() is not None:
+                            ra['start'] = self._to_iso(a.getStart())
+                        if a.getFinish() is not None:
+                            ra['finish'] = self._to_iso(a.getFinish())
+                        if resource is not None and resources_mode != resources.LEGACY:
+                            resource_table.add_assignment(resource, idx, len(resource_assignments))
+                        resource_assignments.append(ra)
+                    except Exception as ra_err:
+                        print(f"  Warning: Could not parse resource assignment for task {uid}: {ra_err}")
             assigned_resource = ", ".join(filter(None, res_names))
+            t1 = perf()
+            timings.add('assignments', t1 - t0)
+
+            predecessors = successors = None
+            if read_predecessors:
+                predecessors = []
+                for e in pred_edges[idx]:
+                    p = edges.source[e]
+                    other = structure[p] if p >= 0 else edges.unresolved[e]
+                    if not other['id']:
+                        continue
+                    predecessors.append({
+                        'predecessorTaskId': other['id'],
+                        'predecessorName': other['name'],
+                        'relationship': relations.TYPE_NAMES[edges.type[e]],
+                        'lagDays': edges.lag[e],
+                        'isExternal': other['isExternal'],
+                    })
+            if read_successors:
+                successors = []
+                for e in succ_edges[idx]:
+                    t = edges.target[e]
+                    other = structure[t] if t >= 0 else edges.unresolved[e]
+                    if not other['id']:
+                        continue
+                    successors.append({
+                        'successorTaskId': other['id'],
+                        'successorName': other['name'],
+                        'relationship': relations.TYPE_NAMES[edges.type[e]],
+                        'lagDays': edges.lag[e],
+                        'isExternal': other['isExternal'],
+                    })
 
-            total_work = self._to_float(task.getWork().getDuration()) if task.getWork() else 0.0
-            actual_work = self._to_float(task.getActualWork().getDuration()) if task.getActualWork() else 0.0
-            remaining_work = self._to_float(task.getRemainingWork().getDuration()) if task.getRemainingWork() else None
-            baseline_work = self._to_float(task.getBaselineWork().getDuration()) if task.getBaselineWork() else 0.0
-
-            baseline_cost = 0.0
-            actual_cost = 0.0
-            remaining_cost = None
-            try:
-                bc = task.getBaselineCost()
-                if bc is not None:
-                    baseline_cost = self._to_cost(bc)
-                ac = task.getActualCost()
-                if ac is not None:
-                    actual_cost = self._to_cost(ac)
-                rc = task.getRemainingCost()
-                if rc is not None:
-                    remaining_cost = self._to_cost(rc)
-            except Exception:
-                pass
-
-            predecessors = []
-            try:
-                pred_relations = task.getPredecessors()
-                if pred_relations:
-                    for relation in pred_relations:
-                        try:
-                            predecessor_task, _ = self._extract_relation_tasks(relation)
-                            predecessor_id = self._task_id(predecessor_task, fallback='')
-                            if not predecessor_task or not predecessor_id:
-                                continue
-
-                            rel_type_normalized = self._normalize_relation_type(relation)
-
-                            lag_duration = relation.getLag()
-                            lag_days = 0.0
-                            if lag_duration:
-                                try:
-                                    lag_days = self._to_float(lag_duration.getDuration())
-                                except:
-                                    lag_days = 0.0
-
-                            predecessors.append({
-                                'predecessorTaskId': predecessor_id,
-                                'predecessorName': str(predecessor_task.getName() or ''),
-                                'relationship': rel_type_normalized,
-                                'lagDays': lag_days,
-                                'isExternal': bool(predecessor_task.getExternalTask())
-                            })
-                        except Exception as rel_err:
-                            print(f"  Warning: Could not parse relation for task {uid}: {rel_err}")
-            except Exception as pred_err:
-                print(f"  Warning: getPredecessors() failed for task {uid}: {pred_err}")
-
-            successors = []
-            try:
-                succ_relations = task.getSuccessors()
-                if succ_relations:
-                    for relation in succ_relations:
-                        try:
-                            _, successor_task = self._extract_relation_tasks(relation)
-                            successor_id = self._task_id(successor_task, fallback='')
-                            if not successor_task or not successor_id:
-                                continue
-
-                            rel_type_normalized = self._normalize_relation_type(relation)
-
-                            lag_duration = relation.getLag()
-                            lag_days = 0.0
-                            if lag_duration:
-                                try:
-                                    lag_days = self._to_float(lag_duration.getDuration())
-                                except:
-                                    lag_days = 0.0
-
-                            successors.append({
-                                'successorTaskId': successor_id,
-                                'successorName': str(successor_task.getName() or ''),
-                                'relationship': rel_type_normalized,
-                                'lagDays': lag_days,
-                                'isExternal': bool(successor_task.getExternalTask())
-                            })
-                        except Exception as rel_err:
-                            print(f"  Warning: Could not parse successor relation for task {uid}: {rel_err}")
-            except Exception as succ_err:
-                print(f"  Warning: getSuccessors() failed for task {uid}: {succ_err}")
-
-            wbs_code = None
-            outline_number = None
-            constraint_type = None
-            constraint_date = None
-            baseline_start_date = None
-            baseline_end_date = None
-            actual_start_date = None
-            actual_end_date = None
-            duration_hours = None
-            baseline_duration = None
-            actual_duration = None
-            remaining_duration = None
-            early_start = None
-            early_finish = None
-            late_start = None
-            late_finish = None
-            free_slack = None
-            cost = None
-            fixed_cost = None
-            cost_variance = None
-            work_variance = None
-            duration_variance = None
-            is_milestone = False
-            is_estimated = False
-            is_recurring = False
-            is_external = False
-            priority = None
-            deadline = None
-            calendar_name = None
-            calendar_unique_id = None
-            percent_work_complete = None
-            physical_percent_complete = None
-            contact = None
-            task_manager = None
-            hyperlink_address = None
-            hyperlink_sub_address = None
-            subproject_file = None
-            subproject_task_id = None
-
-            try:
-                wbs = task.getWBS()
-                if wbs is not None:
-                    wbs_code = str(wbs)
-            except Exception:
-                pass
-            try:
-                on = task.getOutlineNumber()
-                if on is not None:
-                    outline_number = str(on)
-            except Exception:
-                pass
-            try:
-                ct = task.getConstraintType()
-                if ct is not None:
-                    constraint_type = self._constraint_type_to_string(ct)
-            except Exception:
-                pass
-            try:
-                cd = task.getConstraintDate()
-                if cd is not None:
-                    constraint_date = self._to_iso(cd)
-            except Exception:
-                pass
-            try:
-                baseline_start_date = self._to_iso(task.getBaselineStart())
-            except Exception:
-                pass
-            try:
-                baseline_end_date = self._to_iso(task.getBaselineFinish())
-            except Exception:
-                pass
-            try:
-                actual_start_date = self._to_iso(task.getActualStart())
-            except Exception:
-                pass
-            try:
-                actual_end_date = self._to_iso(task.getActualFinish())
-            except Exception:
-                pass
-            try:
-                d = task.getDuration()
-                if d is not None:
-                    duration_hours = self._to_duration_hours(d)
-            except Exception:
-                pass
-            try:
-                bd = task.getBaselineDuration()
-                if bd is not None:
-                    baseline_duration = self._to_duration_hours(bd)
-            except Exception:
-                pass
-            try:
-                ad = task.getActualDuration()
-                if ad is not None:
-                    actual_duration = self._to_duration_hours(ad)
-            except Exception:
-                pass
-            try:
-                rd = task.getRemainingDuration()
-                if rd is not None:
-                    remaining_duration = self._to_duration_hours(rd)
-            except Exception:
-                pass
-            try:
-                early_start = self._to_iso(task.getEarlyStart())
-            except Exception:
-                pass
-            try:
-                early_finish = self._to_iso(task.getEarlyFinish())
-            except Exception:
-                pass
-            try:
-                late_start = self._to_iso(task.getLateStart())
-            except Exception:
-                pass
-            try:
-                late_finish = self._to_iso(task.getLateFinish())
-            except Exception:
-                pass
-            try:
-                fs = task.getFreeSlack()
-                if fs is not None and hasattr(fs, 'getDuration'):
-                    free_slack = self._to_float(fs.getDuration())
-                elif fs is not None:
-                    free_slack = self._to_float(fs)
-            except Exception:
-                pass
-            try:
-                c = task.getCost()
-                if c is not None:
-                    cost = self._to_cost(c)
-            except Exception:
-                pass
-            try:
-                fc = task.getFixedCost()
-                if fc is not None:
-                    fixed_cost = self._to_cost(fc)
-            except Exception:
-                pass
-            try:
-                cv = task.getCostVariance()
-                if cv is not None:
-                    cost_variance = self._to_cost(cv)
-            except Exception:
-                pass
-            try:
-                wv = task.getWorkVariance()
-                if wv is not None and hasattr(wv, 'getDuration'):
-                    work_variance = self._to_float(wv.getDuration())
-                elif wv is not None:
-                    work_variance = self._to_float(wv)
-            except Exception:
-                pass
-            try:
-                dv = task.getDurationVariance()
-                if dv is not None and hasattr(dv, 'getDuration'):
-                    duration_variance = self._to_float(dv.getDuration())
-                elif dv is not None:
-                    duration_variance = self._to_float(dv)
-            except Exception:
-                pass
-            try:
-                is_milestone = bool(task.getMilestone())
-            except Exception:
-                pass
-            try:
-                is_estimated = bool(task.getEstimated())
-            except Exception:
-                pass
-            try:
-                is_recurring = bool(task.getRecurring())
-            except Exception:
-                pass
-            try:
-                is_external = bool(task.getExternalTask())
-            except Exception:
-                pass
-            try:
-                p = task.getPriority()
-                if p is not None:
-                    priority = str(p) if not isinstance(p, (int, float)) else int(p)
-            except Exception:
-                pass
-            try:
-                deadline = self._to_iso(task.getDeadline())
-            except Exception:
-                pass
-            try:
-                cal = task.getCalendar()
-                if cal is not None and hasattr(cal, 'getName'):
-                    calendar_name = str(cal.getName() or "")
-                elif cal is not None:
-                    calendar_name = str(cal)
-            except Exception:
-                pass
-            try:
-                cuid = task.getCalendarUniqueID()
-                if cuid is not None:
-                    calendar_unique_id = int(cuid)
-            except Exception:
-                pass
-            try:
-                pwc = task.getPercentageWorkComplete()
-                if pwc is not None:
-                    percent_work_complete = self._to_float(pwc)
-            except Exception:
-                pass
-            try:
-                ppc = task.getPhysicalPercentComplete()
-                if ppc is not None:
-                    physical_percent_complete = self._to_float(ppc)
-            except Exception:
-                pass
-            try:
-                cont = task.getContact()
-                if cont is not None:
-                    contact = str(cont)
-            except Exception:
-                pass
-            try:
-                tm = task.getManager()
-                if tm is not None:
-                    task_manager = str(tm)
-            except Exception:
-                pass
-            try:
-                ha = task.getHyperlinkAddress()
-                if ha is not None:
-                    hyperlink_address = str(ha)
-            except Exception:
-                pass
-            try:
-                hsa = task.getHyperlinkSubAddress()
-                if hsa is not None:
-                    hyperlink_sub_address = str(hsa)
-            except Exception:
-                pass
-            try:
-                spf = task.getSubprojectFile()
-                if spf is not None:
-                    subproject_file = str(spf)
-            except Exception:
-                pass
-            try:
-                spt = task.getSubprojectTaskID()
-                if spt is not None:
-                    subproject_task_id = int(spt)
-            except Exception:
-                pass
+            t0 = perf()
+            timings.add('relations', t0 - t1)
 
             # --- Custom baseline + actual fields ---
-            canonical_vals = {}
-            for key, field_type in custom_field_map.items():
-                canonical_vals[key] = self._get_custom_field_value(task, field_type)
-
-            extra_custom = {}
-            for alias, field_type in all_custom_fields.items():
-                val = self._get_custom_field_value(task, field_type)
-                if val is not None:
-                    extra_custom[alias] = val
+            canonical_vals = {key: column.get(idx) for key, column in canonical_columns}
+            extra_custom = {alias: column[idx] for alias, column in alias_columns if idx in column}
 
             baseline_count_val = canonical_vals.get('baselineCount')
             baseline_metric_val = canonical_vals.get('baselineMetric')
@@ -715,68 +656,71 @@ class ProjectParser:
             actual_count_val = canonical_vals.get('actualCount')
             actual_metric_val = canonical_vals.get('actualMetric')
             actual_uom_val = canonical_vals.get('actualUom')
+            timings.add('custom_fields', perf() - t0)
+            counts['tasks'] += 1
+            counts['assignments'] += len(resource_assignments)
 
             node = {
                 'id': uid,
                 'name': name,
                 'outline_level': level,
-                'hierarchy_type': 'project',
+                'hierarchy_type': hierarchy_types[idx],
                 'is_summary': is_summary,
                 'parent_id': parent_id,
-                'startDate': self._to_iso(task.getStart()),
-                'endDate': self._to_iso(task.getFinish()),
-                'percentComplete': self._to_float(task.getPercentageComplete()),
-                'baselineHours': baseline_work,
-                'actualHours': actual_work,
-                'projectedHours': total_work,
-                'remainingHours': remaining_work,
-                'baselineCost': baseline_cost,
-                'actualCost': actual_cost,
-                'remainingCost': remaining_cost,
+                'startDate': fields.get('startDate'),
+                'endDate': fields.get('endDate'),
+                'percentComplete': fields.get('percentComplete'),
+                'baselineHours': fields.get('baselineHours'),
+                'actualHours': fields.get('actualHours'),
+                'projectedHours': fields.get('projectedHours'),
+                'remainingHours': fields.get('remainingHours'),
+                'baselineCost': fields.get('baselineCost'),
+                'actualCost': fields.get('actualCost'),
+                'remainingCost': fields.get('remainingCost'),
                 'assignedResource': assigned_resource,
-                'isCritical': bool(task.getCritical()),
-                'totalSlack': self._to_float(task.getTotalSlack().getDuration()) if task.getTotalSlack() else 0.0,
-                'comments': str(task.getNotes() or ""),
+                'isCritical': fields.get('isCritical'),
+                'totalSlack': fields.get('totalSlack'),
+                'comments': fields.get('comments'),
                 'predecessors': predecessors,
                 'successors': successors,
-                'wbsCode': wbs_code,
-                'outlineNumber': outline_number,
-                'constraintType': constraint_type,
-                'constraintDate': constraint_date,
-                'baselineStartDate': baseline_start_date,
-                'baselineEndDate': baseline_end_date,
-                'actualStartDate': actual_start_date,
-                'actualEndDate': actual_end_date,
-                'duration': duration_hours,
-                'baselineDuration': baseline_duration,
-                'actualDuration': actual_duration,
-                'remainingDuration': remaining_duration,
-                'earlyStart': early_start,
-                'earlyFinish': early_finish,
-                'lateStart': late_start,
-                'lateFinish': late_finish,
-                'freeSlack': free_slack,
-                'cost': cost,
-                'fixedCost': fixed_cost,
-                'costVariance': cost_variance,
-                'workVariance': work_variance,
-                'durationVariance': duration_variance,
-                'isMilestone': is_milestone,
-                'isEstimated': is_estimated,
-                'isRecurring': is_recurring,
-                'isExternal': is_external,
-                'priority': priority,
-                'deadline': deadline,
-                'calendarName': calendar_name,
-                'calendarUniqueId': calendar_unique_id,
-                'percentWorkComplete': percent_work_complete,
-                'physicalPercentComplete': physical_percent_complete,
-                'contact': contact,
-                'manager': task_manager,
-                'hyperlinkAddress': hyperlink_address,
-                'hyperlinkSubAddress': hyperlink_sub_address,
-                'subprojectFile': subproject_file,
-                'subprojectTaskId': subproject_task_id,
+                'wbsCode': fields.get('wbsCode'),
+                'outlineNumber': row['outlineNumber'],
+                'constraintType': fields.get('constraintType'),
+                'constraintDate': fields.get('constraintDate'),
+                'baselineStartDate': fields.get('baselineStartDate'),
+                'baselineEndDate': fields.get('baselineEndDate'),
+                'actualStartDate': fields.get('actualStartDate'),
+                'actualEndDate': fields.get('actualEndDate'),
+                'duration': fields.get('duration'),
+                'baselineDuration': fields.get('baselineDuration'),
+                'actualDuration': fields.get('actualDuration'),
+                'remainingDuration': fields.get('remainingDuration'),
+                'earlyStart': fields.get('earlyStart'),
+                'earlyFinish': fields.get('earlyFinish'),
+                'lateStart': fields.get('lateStart'),
+                'lateFinish': fields.get('lateFinish'),
+                'freeSlack': fields.get('freeSlack'),
+                'cost': fields.get('cost'),
+                'fixedCost': fields.get('fixedCost'),
+                'costVariance': fields.get('costVariance'),
+                'workVariance': fields.get('workVariance'),
+                'durationVariance': fields.get('durationVariance'),
+                'isMilestone': fields.get('isMilestone'),
+                'isEstimated': fields.get('isEstimated'),
+                'isRecurring': fields.get('isRecurring'),
+                'isExternal': row['isExternal'],
+                'priority': fields.get('priority'),
+                'deadline': fields.get('deadline'),
+                'calendarName': fields.get('calendarName'),
+                'calendarUniqueId': fields.get('calendarUniqueId'),
+                'percentWorkComplete': fields.get('percentWorkComplete'),
+                'physicalPercentComplete': fields.get('physicalPercentComplete'),
+                'contact': fields.get('contact'),
+                'manager': fields.get('manager'),
+                'hyperlinkAddress': fields.get('hyperlinkAddress'),
+                'hyperlinkSubAddress': fields.get('hyperlinkSubAddress'),
+                'subprojectFile': fields.get('subprojectFile'),
+                'subprojectTaskId': fields.get('subprojectTaskId'),
                 'resourceAssignments': resource_assignments,
                 'baselineCount': baseline_count_val,
                 'baselineMetric': baseline_metric_val,
@@ -786,138 +730,781 @@ class ProjectParser:
                 'actualUom': actual_uom_val,
                 'customFields': extra_custom if extra_custom else None,
             }
-            all_tasks.append(node)
+            node['folder'] = folders[idx] if folders is not None else None
+            if scheduled is not None:
+                for key, column in scheduled.items():
+                    node[key] = column[idx]
+            stats.add(
+                node,
+                len(predecessors) if predecessors is not None else len(pred_edges[idx]),
+                len(successors) if successors is not None else len(succ_edges[idx]),
+            )
+            if not legacy_relations:
+                del node['predecessors'], node['successors']
+            if keep is not None:
+                node = {key: node[key] for key in keep if key in node}
+            if rollup_rows is not None:
+                node['rollup'] = rollup_rows[idx]
+            yield 'task', node
+
+        if resources_mode != resources.LEGACY:
+            yield 'resources', resource_table.to_dict()
+        summary = stats.summary(min_outline, max_outline, len(tasks))
+        if schedule_info is not None:
+            summary['schedule'] = schedule_info
+        yield 'summary', summary
+
+    def _schedule_mpxj(self, project):
+        """Schedule with MPXJ (MicrosoftScheduler, else the legacy analyzer) to cross-check the native engine."""
+        t0 = time.perf_counter()
+        info = {'engine': cpm.MPXJ}
+        try:
+            # The scheduler rejects tasks without actual and remaining
+            # durations; treat those as not started.
+            duration_class = jpype.JClass('org.mpxj.Duration')
+            for task in project.getTasks():
+                duration = task.getDuration()
+                if duration is None:
+                    continue
+                if task.getActualDuration() is None:
+                    task.setActualDuration(duration_class.getInstance(0, duration.getUnits()))
+                if task.getRemainingDuration() is None:
+                    task.setRemainingDuration(duration)
+            scheduler = jpype.JClass('org.mpxj.cpm.MicrosoftScheduler')()
+            scheduler.schedule(project, project.getProjectProperties().getStartDate())
+        except Exception as e:
+            info['error'] = str(e)
+            if self.analyzer_class is not None:
+                try:
+                    self.analyzer_class().schedule(project)
+                    del info['error']
+                except Exception as analyzer_err:
+                    info['error'] = str(analyzer_err)
+        info['seconds'] = round(time.perf_counter() - t0, 4)
+        return info
+
+    def _native_network(self, index, structure, edges):
+        """cpm.Network over the edge table: leaf tasks scheduled, summaries rolled up."""
+        durations = [row['duration'] or 0.0 for row in self.duration_reader.read(index.tasks)]
+        active = [not row['is_summary'] for row in structure]
+        return cpm.Network(durations, edges.source, edges.target, edges.type, edges.lag_hours, active,
+                           index.parent, index.hierarchy.depth)
+
+    def _schedule_native(self, index, structure, edges, start_date):
+        """Critical path over the edge table; returns (task columns, summary info).
+
+        Leaf tasks are scheduled on the standard calendar from the project
+        start, ignoring constraints and actuals; summaries span their children.
+        """
+        t0 = time.perf_counter()
+        network = self._native_network(index, structure, edges)
+        result = network.schedule()
+        start_date = start_date or time.strftime('%Y-%m-%d')
+        columns = result.columns(start_date)
+        info = {
+            'engine': cpm.NATIVE,
+            'seconds': round(time.perf_counter() - t0, 4),
+            'criticalTasks': int((result.critical & network.active).sum()),
+            'projectFinish': result.finish_date(start_date),
+            'cycleTasks': result.cycle_tasks,
+        }
+        return columns, info
+
+    def _rollups(self, index, structure, scheduled=None):
+        """rollups.compute over the task hierarchy; critical flags come from ``scheduled`` when given."""
+        columns = self.rollup_reader.read_columns(index.tasks)
+        if scheduled is not None:
+            columns['isCritical'] = [bool(critical) for critical in scheduled['isCritical']]
+        return rollups.compute(index.hierarchy, [row['is_summary'] for row in structure], columns)
+
+    def read_network(self, source):
+        """Read a file for what-if scheduling: (project info, task structure rows, scheduled cpm.Network)."""
+        project = self._read_project(source)
+        props = project.getProjectProperties()
+        project_info = {
+            'name': str(props.getProjectTitle() or "Imported Project"),
+            'startDate': self._to_iso(props.getStartDate()),
+        }
+        index, structure = self._task_structure(self._collect_tasks(project))
+        edges = relations.read_edges(self, index)
+        network = self._native_network(index, structure, edges)
+        network.schedule()
+        return project_info, structure, network
+
+    def _task_structure(self, index):
+        """Ids, names, levels and parent ids for every task, read up front.
+
+        Tasks sharing a stable id with an earlier one are dropped (``index`` is
+        returned compacted in that case), as the old id-based dedupe did.
+        """
+        structure = []
+        drop = {}
+        for idx, fields in enumerate(self.structure_reader.read(index.tasks)):
+            task_id = self._field_task_id(fields, fallback=f"row-{idx + 1}")
+            if task_id in index.uid_index:
+                drop[idx] = index.uid_index[task_id]
+                continue
+            index.uid_index[task_id] = idx
+            structure.append({
+                'id': task_id,
+                'name': fields['name'],
+                'outline_level': fields['outline_level'],
+                'is_summary': fields['is_summary'],
+                'parent_id': None,
+                'outlineNumber': fields['outlineNumber'],
+                'isExternal': fields['isExternal'],
+            })
+        ids = [row['id'] for row in structure]
+        if drop:
+            index = index.without(drop)
+            index.uid_index = {task_id: i for i, task_id in enumerate(ids)}
+        for row, parent_idx in zip(structure, index.parent):
+            if parent_idx >= 0:
+                row['parent_id'] = ids[parent_idx]
+        return index, structure
+
+
+class _ParseStats:
+    """Running totals for the summary block, updated as each task is emitted."""
+
+    HIERARCHY_TYPES = ('project', 'unit', 'phase', 'task', 'sub_task')
 
-        outline_levels = [int(t.get('outline_level') or 0) for t in all_tasks]
-        max_outline = max(outline_levels) if outline_levels else 0
-        min_outline = min(outline_levels) if outline_levels else 0
-        hierarchy_anchor = 2
-
-        for node in all_tasks:
-            level = int(node.get('outline_level') or 0)
-            if level <= 1:
-                node['hierarchy_type'] = 'project'
-            elif level == hierarchy_anchor:
-                node['hierarchy_type'] = 'unit'
-            elif level == hierarchy_anchor + 1:
-                node['hierarchy_type'] = 'phase'
-            elif max_outline >= (hierarchy_anchor + 3) and level == max_outline:
-                node['hierarchy_type'] = 'sub_task'
-            else:
-                node['hierarchy_type'] = 'task'
-
-        for node in all_tasks:
-            if int(node.get('outline_level') or 0) <= 1 and (node.get('is_summary') or node.get('parent_id') is None):
-                node['hierarchy_type'] = 'project'
-
-        by_id = {str(t.get('id')): t for t in all_tasks}
-        folder_cache = {}
-
-        def build_folder(task_id):
-            task_id = str(task_id or '')
-            if not task_id:
-                return ''
-            if task_id in folder_cache:
-                return folder_cache[task_id]
-
-            task_node = by_id.get(task_id)
-            if not task_node:
-                folder_cache[task_id] = ''
-                return ''
-
-            parent_id = task_node.get('parent_id')
-            if not parent_id:
-                folder_cache[task_id] = ''
-                return ''
-
-            parent_node = by_id.get(str(parent_id))
-            if not parent_node:
-                folder_cache[task_id] = ''
-                return ''
-
-            parent_folder = build_folder(str(parent_id))
-            parent_name = str(parent_node.get('name') or str(parent_id)).strip()
-            if parent_folder:
-                folder_cache[task_id] = f"{parent_folder} / {parent_name}"
-            else:
-                folder_cache[task_id] = parent_name
-            return folder_cache[task_id]
-
-        for node in all_tasks:
-            node['folder'] = build_folder(str(node.get('id') or ''))
-
-        total_pred_links = sum(len(t.get('predecessors') or []) for t in all_tasks)
-        total_succ_links = sum(len(t.get('successors') or []) for t in all_tasks)
-        project_count = sum(1 for t in all_tasks if t.get('hierarchy_type') == 'project')
-        unit_count = sum(1 for t in all_tasks if t.get('hierarchy_type') == 'unit')
-        phase_count = sum(1 for t in all_tasks if t.get('hierarchy_type') == 'phase')
-        task_count = sum(1 for t in all_tasks if t.get('hierarchy_type') == 'task')
-        sub_task_count = sum(1 for t in all_tasks if t.get('hierarchy_type') == 'sub_task')
-        tasks_with_predecessors = sum(1 for t in all_tasks if (t.get('predecessors') or []))
-        tasks_with_successors = sum(1 for t in all_tasks if (t.get('successors') or []))
-        leaf_tasks = [t for t in all_tasks if not bool(t.get('is_summary'))]
-        linked_leaf_tasks = [
-            t for t in leaf_tasks
-            if (t.get('predecessors') or []) or (t.get('successors') or [])
-        ]
-        isolated_leaf_tasks = len(leaf_tasks) - len(linked_leaf_tasks)
+    def __init__(self):
+        self.rows = 0
+        self.by_type = dict.fromkeys(self.HIERARCHY_TYPES, 0)
+        self.pred_links = 0
+        self.succ_links = 0
+        self.with_predecessors = 0
+        self.with_successors = 0
+        self.leaf_tasks = 0
+        self.linked_leaf_tasks = 0
+
+    def add(self, node, preds, succs):
+        """Count ``node`` with ``preds``/``succs`` dependency links."""
+        self.rows += 1
+        htype = node.get('hierarchy_type')
+        if htype in self.by_type:
+            self.by_type[htype] += 1
+        self.pred_links += preds
+        self.succ_links += succs
+        if preds:
+            self.with_predecessors += 1
+        if succs:
+            self.with_successors += 1
+        if not bool(node.get('is_summary')):
+            self.leaf_tasks += 1
+            if preds or succs:
+                self.linked_leaf_tasks += 1
+
+    def summary(self, min_outline, max_outline, collected_count):
         coverage_percent = 0.0
-        if len(leaf_tasks) > 0:
-            coverage_percent = round((len(linked_leaf_tasks) / len(leaf_tasks)) * 100.0, 2)
-
+        if self.leaf_tasks > 0:
+            coverage_percent = round((self.linked_leaf_tasks / self.leaf_tasks) * 100.0, 2)
         return {
-            'success': True,
-            'project': project_info,
-            'tasks': all_tasks,
-            'summary': {
-                'total_rows': len(all_tasks),
-                'min_outline_level': min_outline,
-                'max_outline_level': max_outline,
-                'projects': project_count,
-                'units': unit_count,
-                'phases': phase_count,
-                'tasks': task_count,
-                'sub_tasks': sub_task_count,
-                'dependencies': {
-                    'totalPredecessorLinks': total_pred_links,
-                    'totalSuccessorLinks': total_succ_links,
-                    'tasksWithPredecessors': tasks_with_predecessors,
-                    'tasksWithSuccessors': tasks_with_successors,
-                    'totalLeafTasks': len(leaf_tasks),
-                    'linkedLeafTasks': len(linked_leaf_tasks),
-                    'isolatedLeafTasks': isolated_leaf_tasks,
-                    'coveragePercent': coverage_percent,
-                },
-                'taskCollection': {
-                    'collectedTaskCount': len(tasks),
-                    'parsedTaskCount': len(all_tasks),
-                },
-            }
+            'total_rows': self.rows,
+            'min_outline_level': min_outline,
+            'max_outline_level': max_outline,
+            'projects': self.by_type['project'],
+            'units': self.by_type['unit'],
+            'phases': self.by_type['phase'],
+            'tasks': self.by_type['task'],
+            'sub_tasks': self.by_type['sub_task'],
+            'dependencies': {
+                'totalPredecessorLinks': self.pred_links,
+                'totalSuccessorLinks': self.succ_links,
+                'tasksWithPredecessors': self.with_predecessors,
+                'tasksWithSuccessors': self.with_successors,
+                'totalLeafTasks': self.leaf_tasks,
+                'linkedLeafTasks': self.linked_leaf_tasks,
+                'isolatedLeafTasks': self.leaf_tasks - self.linked_leaf_tasks,
+                'coveragePercent': coverage_percent,
+            },
+            'taskCollection': {
+                'collectedTaskCount': collected_count,
+                'parsedTaskCount': self.rows,
+            },
         }
 
+parser_pool = ParserPool(ProjectParser, int(os.environ.get('PARSER_POOL_SIZE', '4')))
+PARSER_POOL_TIMEOUT = float(os.environ.get('PARSER_POOL_TIMEOUT', '60'))
+
+# PARSER_WORKER_PROCESSES > 0 moves JSON parses into separate processes, each
+# with its own JVM capped at PARSER_WORKER_HEAP; NDJSON streams stay in-process.
+# PARSER_WORKER_TIMEOUT bounds a whole worker parse, queueing included, and
+# stays under callParser's 120s abort.
+PARSER_WORKER_PROCESSES = int(os.environ.get('PARSER_WORKER_PROCESSES', '0'))
+worker_pool = ParseWorkerPool(
+    PARSER_WORKER_PROCESSES,
+    max_queue=int(os.environ.get('PARSER_WORKER_QUEUE', '8')),
+    max_parses=int(os.environ.get('PARSER_WORKER_MAX_PARSES', '50')),
+    max_rss_mb=float(os.environ.get('PARSER_WORKER_MAX_RSS_MB', '0')),
+    heap=os.environ.get('PARSER_WORKER_HEAP', '256m'),
+    timeout=float(os.environ.get('PARSER_WORKER_TIMEOUT', '100')),
+) if PARSER_WORKER_PROCESSES > 0 else None
+
+# PARSER_INPUT=memory (default) hands upload bytes to MPXJ as an InputStream;
+# "file" restores the old temp-file round trip. Uploads of at least
+# PARSER_MMAP_MIN_MB that werkzeug spooled to disk are memory-mapped rather
+# than read into a bytes object.
+PARSER_INPUT = os.environ.get('PARSER_INPUT', 'memory').strip().lower()
+PARSER_MMAP_MIN_BYTES = int(float(os.environ.get('PARSER_MMAP_MIN_MB', '0')) * 1024 * 1024)
+
+# Response compression: PARSE_COMPRESSION lists the encodings offered, in
+# preference order ("" disables it); br and zstd need the brotli /
+# zstandard packages. Bodies under PARSE_COMPRESSION_MIN_KB are sent as is.
+PARSE_COMPRESSION = [e.strip().lower() for e in
+                     os.environ.get('PARSE_COMPRESSION', ','.join(content_encoding.ENCODINGS)).split(',') if e.strip()]
+response_encoder = content_encoding.ResponseEncoder(
+    PARSE_COMPRESSION,
+    levels={
+        content_encoding.GZIP: int(os.environ.get('PARSE_GZIP_LEVEL', '6')),
+        content_encoding.BROTLI: int(os.environ.get('PARSE_BROTLI_QUALITY', '4')),
+        content_encoding.ZSTD: int(os.environ.get('PARSE_ZSTD_LEVEL', '3')),
+    },
+    min_bytes=int(float(os.environ.get('PARSE_COMPRESSION_MIN_KB', '32')) * 1024),
+)
+if set(PARSE_COMPRESSION) - set(response_encoder.encodings):
+    print(f"Response compression: {', '.join(sorted(set(PARSE_COMPRESSION) - set(response_encoder.encodings)))} "
+          f"unavailable; offering {', '.join(response_encoder.encodings) or 'none'}.")
+
+
+@app.after_request
+def encode_response(response):
+    return response_encoder.encode(response, request.accept_encodings)
+
+def read_upload(f):
+    if PARSER_MMAP_MIN_BYTES > 0 and PARSER_INPUT != 'file':
+        stream = f.stream
+        try:
+            size = stream.seek(0, os.SEEK_END)
+            stream.seek(0)
+            if size >= PARSER_MMAP_MIN_BYTES:
+                return mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (AttributeError, OSError, ValueError):
+            stream.seek(0)
+    return f.read()
+
+@contextmanager
+def upload_source(data):
+    """What the parser reads for an upload: the bytes, or a temp file path that is always removed."""
+    if PARSER_INPUT != 'file':
+        yield data
+        return
+    fd, path = tempfile.mkstemp(suffix=".mpp")
+    try:
+        with os.fdopen(fd, 'wb') as fh:
+            fh.write(data)
+        yield path
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def serialize_result(res, timings, include_timings=False):
+    """Body for a parse_file result (JSON, or an Arrow stream), timing the encoding; returns (body, timings dict)."""
+    t0 = time.perf_counter()
+    if isinstance(res, columnar.ColumnarResult):
+        if res.format == columnar.ARROW:
+            body = res.to_arrow(timings.to_dict() if include_timings else None)
+        else:
+            res = res.to_dict()
+    if isinstance(res, dict):
+        if include_timings:
+            res['timings'] = timings.to_dict()
+        body = app.json.response(res).get_data()
+    timings.add('serialize', time.perf_counter() - t0)
+    return body, timings.to_dict()
+
+def request_options():
+    """Parse options from the query string (only non-default values); raises ValueError."""
+    options = {}
+    mode = request.args.get('relations', '').strip().lower()
+    if mode and mode not in relations.MODES:
+        raise ValueError(f"relations must be one of: {', '.join(relations.MODES)}")
+    if mode and mode != relations.LEGACY:
+        options['relations'] = mode
+    mode = request.args.get('resources', '').strip().lower()
+    if mode and mode not in resources.MODES:
+        raise ValueError(f"resources must be one of: {', '.join(resources.MODES)}")
+    if mode and mode != resources.LEGACY:
+        options['resources'] = mode
+    output_format = request.args.get('format', '').strip().lower()
+    if not output_format and columnar.ARROW_MIME in request.accept_mimetypes.values():
+        output_format = columnar.ARROW
+    if output_format in columnar.FORMATS:
+        if output_format == columnar.ARROW and not columnar.arrow_available():
+            raise ValueError("Arrow output is not available (pyarrow is not installed)")
+        options['format'] = output_format
+    fields = resolve_fields(request.args.get('fields'))
+    if fields is not None:
+        options['fields'] = fields
+    engine = request.args.get('schedule', '').strip().lower()
+    if engine and engine not in cpm.ENGINES:
+        raise ValueError(f"schedule must be one of: {', '.join(cpm.ENGINES)}")
+    if engine:
+        options['schedule'] = engine
+    if request.args.get('rollups', '').strip().lower() in ('1', 'true', 'yes'):
+        options['rollups'] = 1
+    return options
+
+def options_variant(options):
+    """Cache key variant for ``options``; empty for the default output."""
+    return '&'.join(
+        f"{k}={','.join(v) if isinstance(v, tuple) else v}" for k, v in sorted((options or {}).items()))
+
+def parse_bytes(data, progress=None, include_timings=False, options=None):
+    """Parse uploaded bytes into a serialized /parse body (no cache) and record its metrics."""
+    if worker_pool is None and not init_jvm():
+        raise RuntimeError("JVM Init Failed")
+    try:
+        with upload_source(data) as source:
+            if worker_pool is not None:
+                if progress is not None:
+                    progress['stage'] = 'parsing'
+                # mmap objects cannot be pickled to the worker
+                body, timings = worker_pool.parse(
+                    source if isinstance(source, (str, bytes)) else bytes(source), include_timings, options)
+            else:
+                if progress is not None:
+                    progress['stage'] = 'waiting-for-parser'
+                timings = ParseTimings()
+                with parser_pool.acquire(timeout=PARSER_POOL_TIMEOUT) as parser:
+                    if progress is not None:
+                        progress['stage'] = 'parsing'
+                    res = parser.parse_file(source, progress=progress, timings=timings, options=options)
+                if progress is not None:
+                    progress['stage'] = 'serializing'
+                body, timings = serialize_result(res, timings, include_timings)
+    except (ParserPoolExhausted, WorkerPoolBusy):
+        raise
+    except Exception:
+        parse_metrics.observe_failure()
+        raise
+    parse_metrics.observe_parse(timings)
+    return body
+
+def parse_cached(data, options=None):
+    """Parse through the content-hash cache; returns (body, X-Parse-Cache value)."""
+    cache_key = parse_cache.key_for(data, options_variant(options))
+    cached = parse_cache.get(cache_key)
+    if cached is not None:
+        return cached, 'hit'
+    body = parse_bytes(data, options=options)
+    parse_cache.put(cache_key, body)
+    return body, 'miss' if parse_cache.enabled else 'disabled'
+
+def run_parse_job(job, data, options=None):
+    """Body of a /jobs parse: same output (and cache entry) as a synchronous /parse.
+
+    The result is served from the parse cache; the body is only returned, to
+    be held by the job, when the cache could not take it.
+    """
+    body = parse_bytes(data, progress=job.progress, options=options)
+    job.cache_key = parse_cache.key_for(data, options_variant(options))
+    parse_cache.put(job.cache_key, body)
+    return None if job.cache_key in parse_cache else body
+
+jobs = JobManager(
+    run_parse_job,
+    max_workers=int(os.environ.get('PARSE_JOB_WORKERS', '2')),
+    max_pending=int(os.environ.get('PARSE_JOB_MAX_PENDING', '32')),
+    ttl=float(os.environ.get('PARSE_JOB_TTL_SECONDS', '900')),
+    max_result_bytes=int(float(os.environ.get('PARSE_JOB_MAX_RESULT_MB', '64')) * 1024 * 1024),
+)
+
+warm_state = {'status': 'cold', 'seconds': None, 'error': None}
+
+def preload_mode():
+    """PARSER_PRELOAD: off (default), on/block, or background."""
+    mode = os.environ.get('PARSER_PRELOAD', '').strip().lower()
+    if mode in ('', '0', 'false', 'no', 'off'):
+        return None
+    return 'background' if mode == 'background' else 'block'
+
+def warm_up():
+    """Start the JVM, load hot MPXJ classes and run every pooled parser once.
+
+    In worker-process mode the workers are started and each parses the fixture
+    instead; the web process never starts a JVM of its own.
+    """
+    warm_state.update(status='warming', seconds=None, error=None)
+    started = time.perf_counter()
+    try:
+        if worker_pool is not None:
+            worker_pool.start()
+            # Idle workers are handed out FIFO, so this visits each one.
+            for _ in range(worker_pool.processes):
+                worker_pool.parse(WARMUP_FIXTURE)
+        elif not init_jvm():
+            raise RuntimeError("JVM Init Failed")
+        else:
+            for name in HOT_CLASSES:
+                try:
+                    jpype.JClass(name)
+                except Exception:
+                    print(f"Warm-up: class {name} not available")
+            parser_pool.prefill()
+            with ExitStack() as stack:
+                parsers = [stack.enter_context(parser_pool.acquire()) for _ in range(parser_pool.size)]
+                for parser in parsers:
+                    parser.parse_file(WARMUP_FIXTURE)
+        warm_state['status'] = 'ready'
+    except Exception as e:
+        traceback.print_exc()
+        warm_state.update(status='failed', error=str(e))
+    warm_state['seconds'] = round(time.perf_counter() - started, 3)
+    print(f"Warm-up {warm_state['status']} in {warm_state['seconds']}s")
+
+def start_warm_up(background=False):
+    if not background:
+        warm_up()
+        return
+    warm_state['status'] = 'warming'
+    threading.Thread(target=warm_up, name='parser-warm-up', daemon=True).start()
+
 @app.route('/')
 def ui():
     return render_template('index.html')
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics: parse/stage histograms, item counters, JVM heap and GC."""
+    snapshots = [('main', parse_metrics.jvm_snapshot())]
+    if worker_pool is not None:
+        snapshots += worker_pool.jvm_snapshots()
+
+    def extra(lines):
+        cache = parse_cache.stats()
+        pool = parser_pool.stats()
+        parse_metrics.gauge(lines, 'mpp_parse_cache_entries', 'Entries in the parse cache.', [([], cache['entries'])])
+        parse_metrics.gauge(lines, 'mpp_parse_cache_bytes', 'Bytes in the parse cache.', [([], cache['bytes'])])
+        parse_metrics.counter(lines, 'mpp_parse_cache_lookups_total', 'Parse cache lookups, by result.',
+                              [([('result', 'hit')], cache['hits']), ([('result', 'miss')], cache['misses'])])
+        parse_metrics.gauge(lines, 'mpp_parser_pool_in_use', 'Pooled parsers currently checked out.', [([], pool['inUse'])])
+
+    return app.response_class(
+        parse_metrics.render(snapshots, extra),
+        mimetype='text/plain; version=0.0.4',
+    )
+
 @app.route('/health')
-def health(): return jsonify(status="ok", version="v20-baseline-actual-custom-fields")
+def health():
+    # A warm-up that failed (e.g. the JVM did not start) leaves a worker that
+    # cannot parse; report it unavailable so traffic is routed elsewhere.
+    status = warm_state['status'] if warm_state['status'] in ('warming', 'failed') else 'ok'
+    return jsonify(
+        status=status,
+        version=PARSER_VERSION,
+        warmup=warm_state,
+        cache=parse_cache.stats(),
+        pool=parser_pool.stats(),
+        workers=worker_pool.stats() if worker_pool is not None else None,
+        jobs=jobs.stats(),
+        sessions=sessions.stats(),
+        compression=response_encoder.stats(),
+        json=app.json.stats(),
+    ), 503 if status != 'ok' else 200
+
+def stream_ndjson(data, options=None):
+    """Stream a parse as NDJSON: a project line, one line per task, then the summary.
+
+    Each line is {"type": <kind>, <kind>: <payload>}; the summary line also
+    carries "success": true, and a failure mid-stream ends with a "type":
+    "error" line. Tasks are serialized as they are extracted, so memory use does
+    not grow with the task count. Streamed responses bypass the parse cache.
+    """
+    held = ExitStack()
+    parser = held.enter_context(parser_pool.acquire(timeout=PARSER_POOL_TIMEOUT))
+
+    def generate():
+        timings = ParseTimings()
+        try:
+            with upload_source(data) as source:
+                for kind, payload in parser.iter_parse(source, timings=timings, options=options):
+                    line = {'type': kind, kind: payload}
+                    if kind == 'summary':
+                        line['success'] = True
+                    yield app.json.dumps_bytes(line) + b'\n'
+        except Exception as e:
+            traceback.print_exc()
+            parse_metrics.observe_failure()
+            yield app.json.dumps_bytes({'type': 'error', 'success': False, 'error': str(e)}) + b'\n'
+        else:
+            parse_metrics.observe_parse(timings.to_dict())
+
+    response = app.response_class(generate(), mimetype='application/x-ndjson')
+    response.call_on_close(held.close)
+    return response
 
 @app.route('/parse', methods=['POST'])
 def parse():
     f = request.files.get('file')
     if not f: return jsonify(success=False, error="No file uploaded"), 400
+
+    try:
+        options = request_options()
+    except ValueError as e:
+        return jsonify(success=False, error=str(e)), 400
+    since = request.args.get('since', '').strip().lower()
+    if since and (request.args.get('format') or not parse_delta.SNAPSHOT_ID.match(since)):
+        return jsonify(success=False, error="since= takes a snapshot id and returns a JSON delta (no format=)"), 400
+
+    data = read_upload(f)
+    if since:
+        return parse_delta_response(data, since, options)
+    if request.args.get('format', '').lower() == 'ndjson':
+        if not init_jvm(): return jsonify(success=False, error="JVM Init Failed"), 500
+        try:
+            return stream_ndjson(data, options)
+        except ParserPoolExhausted as e:
+            return jsonify(success=False, error=str(e)), 503
+
+    try:
+        if request.args.get('timings', '').lower() in ('1', 'true', 'yes'):
+            body, cache_status = parse_bytes(data, include_timings=True, options=options), 'bypass'
+        else:
+            body, cache_status = parse_cached(data, options)
+    except (ParserPoolExhausted, WorkerPoolBusy) as e:
+        return jsonify(success=False, error=str(e)), 503
+    except WorkerParseError as e:
+        return jsonify(success=False, error=str(e)), 500
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify(success=False, error=str(e)), 500
+    mimetype = columnar.ARROW_MIME if options.get('format') == columnar.ARROW else 'application/json'
+    response = app.response_class(body, mimetype=mimetype)
+    response.headers['X-Parse-Cache'] = cache_status
+    if not options and parse_cache.enabled:
+        response.headers['X-Parse-Snapshot'] = parse_cache.key_for(data)
+    return response
+
+def parse_delta_response(data, since, options):
+    """/parse?since=<snapshot id>: what changed since an earlier full parse still in the parse cache.
+
+    The snapshot id is the X-Parse-Snapshot header of that parse (its cache
+    key); this parse becomes the next snapshot. 404 when the old snapshot has
+    been evicted, in which case the caller should fall back to a full parse.
+    """
+    previous = parse_cache.get(since)
+    if previous is None:
+        return jsonify(success=False, error="Snapshot not found; request a full parse"), 404
+    try:
+        body, cache_status = parse_cached(data)
+    except (ParserPoolExhausted, WorkerPoolBusy) as e:
+        return jsonify(success=False, error=str(e)), 503
+    except WorkerParseError as e:
+        return jsonify(success=False, error=str(e)), 500
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify(success=False, error=str(e)), 500
+    snapshot_id = parse_cache.key_for(data)
+    delta = parse_delta.diff(json.loads(previous), json.loads(body), options.get('fields'))
+    delta['since'] = since
+    delta['snapshotId'] = snapshot_id
+    response = jsonify(delta)
+    response.headers['X-Parse-Cache'] = cache_status
+    response.headers['X-Parse-Snapshot'] = snapshot_id
+    return response
+
+PARSE_BATCH_MAX_FILES = int(os.environ.get('PARSE_BATCH_MAX_FILES', '100'))
+PARSE_BATCH_MAX_BYTES = int(float(os.environ.get('PARSE_BATCH_MAX_MB', '512')) * 1024 * 1024)
+
+def _batch_uploads():
+    """(fileName, bytes) for every uploaded file; .zip uploads are expanded."""
+    uploads = []
+    total = 0
+    for f in request.files.getlist('files') + request.files.getlist('file'):
+        data = f.read()
+        name = f.filename or 'upload'
+        if name.lower().endswith('.zip'):
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                for info in archive.infolist():
+                    base = os.path.basename(info.filename)
+                    if info.is_dir() or not base or base.startswith('.') or info.filename.startswith('__MACOSX/'):
+                        continue
+                    total += info.file_size
+                    if total > PARSE_BATCH_MAX_BYTES:
+                        raise ValueError(f"Batch exceeds {PARSE_BATCH_MAX_BYTES // (1024 * 1024)} MB uncompressed")
+                    uploads.append((info.filename, archive.read(info)))
+        else:
+            total += len(data)
+            if total > PARSE_BATCH_MAX_BYTES:
+                raise ValueError(f"Batch exceeds {PARSE_BATCH_MAX_BYTES // (1024 * 1024)} MB")
+            uploads.append((name, data))
+        if len(uploads) > PARSE_BATCH_MAX_FILES:
+            raise ValueError(f"Batch exceeds {PARSE_BATCH_MAX_FILES} files")
+    return uploads
+
+def _batch_entry(index, name, body=None, cache_status=None, error=None):
+    """One per-file result as JSON bytes, splicing the (cached) parse body in unparsed."""
+    meta = {'index': index, 'fileName': name, 'success': error is None}
+    if error is not None:
+        meta['error'] = error
+        return app.json.dumps_bytes(meta)
+    meta['cache'] = cache_status
+    head = app.json.dumps_bytes(meta)
+    return head[:-1] + b',"result":' + body.rstrip(b'\n') + b'}'
+
+def _parse_batch_item(index, name, data, options):
+    try:
+        body, cache_status = parse_cached(data, options)
+        return index, _batch_entry(index, name, body, cache_status), True
+    except Exception as e:
+        if not isinstance(e, (ParserPoolExhausted, WorkerPoolBusy, WorkerParseError)):
+            traceback.print_exc()
+        return index, _batch_entry(index, name, error=str(e)), False
+
+@app.route('/parse/batch', methods=['POST'])
+def parse_batch():
+    """Parse several files (multipart "files", or a zip archive) concurrently.
+
+    Returns {"success", "results": [...], "summary"} with one entry per file in
+    upload order, each carrying either "result" (the /parse body) or "error".
+    With ?format=ndjson each entry is streamed as its parse finishes instead,
+    followed by a summary line.
+    """
+    try:
+        options = request_options()
+        if options.get('format') == columnar.ARROW:
+            raise ValueError("Arrow output is not available for batches")
+        uploads = _batch_uploads()
+    except (ValueError, zipfile.BadZipFile) as e:
+        return jsonify(success=False, error=str(e)), 400
+    if not uploads: return jsonify(success=False, error="No file uploaded"), 400
+
+    concurrency = worker_pool.processes if worker_pool is not None else parser_pool.size
+    executor = ThreadPoolExecutor(max_workers=min(concurrency, len(uploads)), thread_name_prefix='parse-batch')
+    futures = [executor.submit(_parse_batch_item, i, name, data, options) for i, (name, data) in enumerate(uploads)]
+    executor.shutdown(wait=False)
+
+    def summary(succeeded):
+        return {'files': len(uploads), 'succeeded': succeeded, 'failed': len(uploads) - succeeded}
+
+    if request.args.get('format', '').lower() == 'ndjson':
+        def generate():
+            succeeded = 0
+            for future in as_completed(futures):
+                _, entry, ok = future.result()
+                succeeded += ok
+                yield b'{"type":"file",' + entry[1:] + b'\n'
+            line = {'type': 'summary', 'success': True, 'summary': summary(succeeded)}
+            yield app.json.dumps_bytes(line) + b'\n'
+        return app.response_class(generate(), mimetype='application/x-ndjson')
+
+    results = [future.result() for future in futures]
+    succeeded = sum(ok for _, _, ok in results)
+    body = (
+        b'{"success":true,"results":[' + b','.join(entry for _, entry, _ in results) + b'],"summary":'
+        + app.json.dumps_bytes(summary(succeeded)) + b'}\n'
+    )
+    return app.response_class(body, mimetype='application/json')
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue a parse and return its id at once; poll /jobs/<id>, then fetch /jobs/<id>/result."""
+    f = request.files.get('file')
+    if not f: return jsonify(success=False, error="No file uploaded"), 400
+
+    try:
+        options = request_options()
+    except ValueError as e:
+        return jsonify(success=False, error=str(e)), 400
+
+    data = f.read()
+    key = parse_cache.key_for(data, options_variant(options))
+    try:
+        job = jobs.complete(cache_key=key) if key in parse_cache else jobs.submit(data, options)
+    except JobQueueFull as e:
+        return jsonify(success=False, error=str(e)), 503
+    return jsonify(
+        success=True,
+        statusUrl=f"/jobs/{job.id}",
+        resultUrl=f"/jobs/{job.id}/result",
+        **job.to_dict(),
+    ), 202
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None: return jsonify(success=False, error="Unknown or expired job"), 404
+    return jsonify(success=True, **job.to_dict())
+
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    job = jobs.get(job_id)
+    if job is None: return jsonify(success=False, error="Unknown or expired job"), 404
+    if job.status == 'failed':
+        return jsonify(success=False, error=job.error), 500
+    if job.status != 'succeeded':
+        return jsonify(dict(job.to_dict(), success=False, error="Job not finished")), 409
+    body = job.result
+    if body is None and job.cache_key is not None:
+        body = parse_cache.get(job.cache_key)
+    if body is None:
+        return jsonify(success=False, error="Job result no longer available; submit the file again"), 410
+    return app.response_class(body, mimetype=columnar.body_mimetype(body))
+
+sessions = ScheduleSessions(
+    ttl=float(os.environ.get('SCHEDULE_SESSION_TTL_SECONDS', '1800')),
+    max_sessions=int(os.environ.get('SCHEDULE_SESSION_MAX', '16')),
+)
+
+@app.route('/sessions', methods=['POST'])
+def create_session():
+    """Load an upload into a what-if scheduling session; patch it via /sessions/<id>/patches."""
+    f = request.files.get('file')
+    if not f: return jsonify(success=False, error="No file uploaded"), 400
     if not init_jvm(): return jsonify(success=False, error="JVM Init Failed"), 500
 
+    data = f.read()
     try:
-        with tempfile.NamedTemporaryFile(suffix=".mpp", delete=False) as t:
-            f.save(t.name)
-            res = ProjectParser().parse_file(t.name)
-        os.remove(t.name)
-        return jsonify(res)
+        with parser_pool.acquire(timeout=PARSER_POOL_TIMEOUT) as parser, upload_source(data) as source:
+            project, structure, network = parser.read_network(source)
+    except ParserPoolExhausted as e:
+        return jsonify(success=False, error=str(e)), 503
     except Exception as e:
         traceback.print_exc()
         return jsonify(success=False, error=str(e)), 500
+    session = sessions.create(project, structure, network)
+    return jsonify(success=True, sessionUrl=f"/sessions/{session.id}", **session.to_dict()), 201
+
+@app.route('/sessions/<session_id>')
+def session_status(session_id):
+    session = sessions.get(session_id)
+    if session is None: return jsonify(success=False, error="Unknown or expired session"), 404
+    return jsonify(success=True, **session.to_dict())
+
+@app.route('/sessions/<session_id>', methods=['DELETE'])
+def delete_session(session_id):
+    if not sessions.delete(session_id): return jsonify(success=False, error="Unknown or expired session"), 404
+    return jsonify(success=True)
+
+@app.route('/sessions/<session_id>/patches', methods=['POST'])
+def patch_session(session_id):
+    """Apply what-if patches ({"patches": [...]}) and return the tasks whose schedule changed.
+
+    Ops: {"op": "duration", "task", "days"|"hours"}, {"op": "addLink", "from",
+    "to", "type", "lagDays"|"lagHours"}, {"op": "removeLink", "from", "to",
+    "type"?} and {"op": "constraint", "task", "type", "date"}. A batch is
+    applied all or nothing; one that closes a dependency cycle is a 409.
+    """
+    session = sessions.get(session_id)
+    if session is None: return jsonify(success=False, error="Unknown or expired session"), 404
+    body = request.get_json(silent=True)
+    patches = body.get('patches') if isinstance(body, dict) else body
+    if not isinstance(patches, list) or not patches:
+        return jsonify(success=False, error="Send a JSON list of patches (or {\"patches\": [...]})"), 400
+    try:
+        result = session.apply(patches)
+    except cpm.CycleError as e:
+        return jsonify(success=False, error=str(e)), 409
+    except ValueError as e:
+        return jsonify(success=False, error=str(e)), 400
+    return jsonify(success=True, sessionId=session.id, **result)
 
 if __name__ == '__main__':
+    if preload_mode():
+        start_warm_up(background=preload_mode() == 'background')
     port = int(os.environ.get('PORT', 8080))
     app.run(host='0.0.0.0', port=port)
@@ -0,0 +1,143 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class ParseCache:
+    """Size-bounded on-disk LRU cache of serialized /parse responses.
+
+    Entries are keyed by a SHA-256 of the parser version plus the uploaded
+    file bytes, so a parser upgrade naturally invalidates old results.
+    Recency is tracked in memory and mirrored to file mtimes so the LRU order
+    survives a worker restart.
+    """
+
+    def __init__(self, directory, max_bytes, version):
+        self.directory = directory
+        self.max_bytes = int(max_bytes or 0)
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        if self.enabled:
+            self._load_index()
+
+    @property
+    def enabled(self):
+        return bool(self.directory) and self.max_bytes > 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _load_index(self):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except Exception as e:
+            print(f"Parse cache disabled, cannot create {self.directory}: {e}")
+            self.max_bytes = 0
+            return
+        found = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                found.append((st.st_mtime, name[:-5], st.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        with self._lock:
+            self._evict_locked()
+
+    def key_for(self, data, variant=''):
+        h = hashlib.sha256()
+        h.update(self.version.encode('utf-8'))
+        h.update(b'\0')
+        h.update(variant.encode('utf-8'))
+        h.update(b'\0')
+        h.update(data)
+        return h.hexdigest()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as fh:
+                body = fh.read()
+            os.utime(path, None)
+        except OSError:
+            with self._lock:
+                size = self._entries.pop(key, None)
+                if size is not None:
+                    self._total_bytes -= size
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return body
+
+    def put(self, key, body):
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as fh:
+                fh.write(body)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Parse cache write failed for {key}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous
+            self._entries[key] = len(body)
+            self._total_bytes += len(body)
+            self._evict_locked()
+
+    def _evict_locked(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'maxBytes': self.max_bytes,
+            }
@@ -0,0 +1,92 @@
+import re
+import json
+import hashlib
+from collections import Counter
+
+# Snapshot ids are parse cache keys (hex SHA-256).
+SNAPSHOT_ID = re.compile(r'^[0-9a-f]{64}$')
+
+# Dependencies are compared as edges, not as part of either task.
+RELATION_KEYS = ('predecessors', 'successors')
+
+
+def task_hash(task):
+    """Content hash of a task node, ignoring its dependency lists."""
+    content = {k: v for k, v in task.items() if k not in RELATION_KEYS}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def _project(task, keep):
+    if keep is None:
+        return task
+    return {key: task[key] for key in keep if key in task}
+
+
+def _edges(tasks):
+    edges = Counter()
+    for task in tasks:
+        for p in task.get('predecessors') or ():
+            edges[(p.get('predecessorTaskId'), task['id'], p.get('relationship'), p.get('lagDays'))] += 1
+    return edges
+
+
+def _edge_dict(edge):
+    source, target, relationship, lag = edge
+    return {'from': source, 'to': target, 'relationship': relationship, 'lagDays': lag}
+
+
+def diff(old, new, keep=None):
+    """Changes from parse result ``old`` to ``new`` (both full /parse bodies, decoded).
+
+    Tasks are matched by id and compared by the content hash of the whole
+    task, so the hashes stay the same whatever ``keep`` is. Added and
+    modified entries carry the new task (limited to ``keep`` keys when given)
+    and its hash; modified ones also list per-field {"from", "to"} changes
+    among the kept keys. Dependencies are diffed as (from, to, relationship,
+    lagDays) edges, so a changed lag shows as one removed and one added edge.
+    """
+    old_tasks = {task['id']: task for task in old.get('tasks') or ()}
+    added = []
+    modified = []
+    unchanged = 0
+    seen = set()
+    for task in new.get('tasks') or ():
+        task_id = task['id']
+        seen.add(task_id)
+        previous = old_tasks.get(task_id)
+        digest = task_hash(task)
+        if previous is None:
+            added.append({'id': task_id, 'hash': digest, 'task': _project(task, keep)})
+            continue
+        if digest == task_hash(previous):
+            unchanged += 1
+            continue
+        changes = {
+            key: {'from': previous.get(key), 'to': task.get(key)}
+            for key in dict.fromkeys(list(previous) + list(task))
+            if key not in RELATION_KEYS and (keep is None or key in keep)
+            and previous.get(key) != task.get(key)
+        }
+        modified.append({'id': task_id, 'hash': digest, 'changes': changes, 'task': _project(task, keep)})
+    removed = [task_id for task_id in old_tasks if task_id not in seen]
+
+    delta = {
+        'success': True,
+        'mode': 'delta',
+        'project': new.get('project'),
+        'summary': new.get('summary'),
+        'tasks': {
+            'added': added,
+            'modified': modified,
+            'removed': removed,
+            'unchanged': unchanged,
+        },
+    }
+    if keep is None or 'predecessors' in keep:
+        old_edges = _edges(old.get('tasks') or ())
+        new_edges = _edges(new.get('tasks') or ())
+        delta['edges'] = {
+            'added': [_edge_dict(edge) for edge in (new_edges - old_edges).elements()],
+            'removed': [_edge_dict(edge) for edge in (old_edges - new_edges).elements()],
+        }
+    return delta
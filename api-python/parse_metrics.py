@@ -0,0 +1,201 @@
+import time
+import threading
+
+import jpype
+
+# Stage names recorded by ProjectParser.iter_parse, in pipeline order; the
+# caller adds "serialize" for the JSON encoding of the result. Timings and
+# the stage histogram are listed in this order, any other stage after them.
+STAGES = (
+    'read', 'schedule', 'custom_field_scan', 'collect', 'structure', 'folders',
+    'rollups', 'fields', 'resources', 'assignments', 'relations', 'custom_fields', 'serialize',
+)
+_STAGE_INDEX = {stage: i for i, stage in enumerate(STAGES)}
+COUNTS = ('tasks', 'relations', 'assignments')
+
+
+def stage_order(stage):
+    """Sort key putting stages in pipeline order, unknown ones last by name."""
+    return (_STAGE_INDEX.get(stage, len(STAGES)), str(stage))
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+TASK_BUCKETS = (10, 50, 100, 500, 1000, 2500, 5000, 10000, 20000, 50000)
+
+
+class ParseTimings:
+    """Per-parse stage durations (seconds) and item counts."""
+
+    __slots__ = ('stages', 'counts', 'started')
+
+    def __init__(self):
+        self.stages = {}
+        self.counts = dict.fromkeys(COUNTS, 0)
+        self.started = time.perf_counter()
+
+    def add(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def timed(self, stage, iterable):
+        """Iterate ``iterable``, charging the time spent producing items to ``stage``."""
+        it = iter(iterable)
+        while True:
+            t0 = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                self.add(stage, time.perf_counter() - t0)
+                return
+            self.add(stage, time.perf_counter() - t0)
+            yield item
+
+    def to_dict(self):
+        return {
+            'totalSeconds': round(time.perf_counter() - self.started, 6),
+            'stages': {k: round(self.stages[k], 6) for k in sorted(self.stages, key=stage_order)},
+            'counts': dict(self.counts),
+        }
+
+
+def _label_text(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+
+def _num(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets, label=None, order=str):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.label = label
+        self.order = order
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, label_value=None):
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [[0] * len(self.buckets), 0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += 1
+            series[2] += value
+
+    def render(self, lines):
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} histogram")
+        with self._lock:
+            for label_value, (counts, count, total) in sorted(self._series.items(), key=lambda kv: self.order(kv[0])):
+                labels = [(self.label, label_value)] if self.label else []
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f"{self.name}_bucket{_label_text(labels + [('le', _num(bound))])} {bucket_count}")
+                lines.append(f"{self.name}_bucket{_label_text(labels + [('le', '+Inf')])} {count}")
+                lines.append(f"{self.name}_sum{_label_text(labels)} {_num(total)}")
+                lines.append(f"{self.name}_count{_label_text(labels)} {count}")
+
+
+class Counter:
+    def __init__(self, name, help_text, label=None):
+        self.name = name
+        self.help = help_text
+        self.label = label
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, label_value=None):
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0) + amount
+
+    def render(self, lines):
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} counter")
+        with self._lock:
+            for label_value, value in sorted(self._values.items(), key=lambda kv: str(kv[0])):
+                labels = [(self.label, label_value)] if self.label else []
+                lines.append(f"{self.name}{_label_text(labels)} {_num(value)}")
+
+
+def gauge(lines, name, help_text, samples, kind='gauge'):
+    """Append a gauge; ``samples`` is a list of (labels, value)."""
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+    for labels, value in samples:
+        lines.append(f"{name}{_label_text(labels)} {_num(value)}")
+
+
+def counter(lines, name, help_text, samples):
+    """Append a counter kept elsewhere (a total since start); ``samples`` as for gauge."""
+    gauge(lines, name, help_text, samples, kind='counter')
+
+
+parse_seconds = Histogram('mpp_parse_seconds', 'Wall time of a full parse, serialization included.', SECONDS_BUCKETS)
+stage_seconds = Histogram('mpp_parse_stage_seconds', 'Time spent per parse stage.', SECONDS_BUCKETS,
+                          label='stage', order=stage_order)
+tasks_per_parse = Histogram('mpp_parse_tasks', 'Tasks emitted per parse.', TASK_BUCKETS)
+parses_total = Counter('mpp_parses_total', 'Parses attempted, by outcome.', label='outcome')
+items_total = Counter('mpp_parse_items_total', 'Tasks, relations and assignments extracted.', label='kind')
+
+
+def observe_parse(timings):
+    """Record one successful parse from a ParseTimings.to_dict() result."""
+    parses_total.inc(label_value='success')
+    parse_seconds.observe(timings['totalSeconds'])
+    for stage, seconds in timings['stages'].items():
+        stage_seconds.observe(seconds, stage)
+    tasks_per_parse.observe(timings['counts'].get('tasks', 0))
+    for kind, count in timings['counts'].items():
+        items_total.inc(count, kind)
+
+
+def observe_failure():
+    parses_total.inc(label_value='error')
+
+
+def jvm_snapshot():
+    """Heap usage and cumulative GC counts/time of this process's JVM, or None."""
+    if not jpype.isJVMStarted():
+        return None
+    ManagementFactory = jpype.JClass('java.lang.management.ManagementFactory')
+    heap = ManagementFactory.getMemoryMXBean().getHeapMemoryUsage()
+    return {
+        'heapUsed': int(heap.getUsed()),
+        'heapCommitted': int(heap.getCommitted()),
+        'heapMax': int(heap.getMax()),
+        'gc': {
+            str(gc.getName()): (int(gc.getCollectionCount()), int(gc.getCollectionTime()) / 1000.0)
+            for gc in ManagementFactory.getGarbageCollectorMXBeans()
+        },
+    }
+
+
+def render(jvm_snapshots=(), extra=None):
+    """Prometheus text exposition of the parse metrics.
+
+    ``jvm_snapshots`` is a list of (process label, jvm_snapshot()) pairs;
+    ``extra(lines)`` may append further samples.
+    """
+    lines = []
+    for metric in (parse_seconds, stage_seconds, tasks_per_parse, parses_total, items_total):
+        metric.render(lines)
+    snapshots = [(process, snap) for process, snap in jvm_snapshots if snap]
+    if snapshots:
+        for key, name in (('heapUsed', 'used'), ('heapCommitted', 'committed'), ('heapMax', 'max')):
+            gauge(lines, f'mpp_jvm_heap_{name}_bytes', f'JVM heap {name} bytes.',
+                  [([('process', process)], snap[key]) for process, snap in snapshots])
+        gc_samples = [
+            ([('process', process), ('gc', gc)], values)
+            for process, snap in snapshots for gc, values in sorted(snap['gc'].items())
+        ]
+        counter(lines, 'mpp_jvm_gc_collections_total', 'JVM garbage collections.',
+                [(labels, count) for labels, (count, _) in gc_samples])
+        counter(lines, 'mpp_jvm_gc_seconds_total', 'JVM time spent in garbage collection.',
+                [(labels, seconds) for labels, (_, seconds) in gc_samples])
+    if extra is not None:
+        extra(lines)
+    return '\n'.join(lines) + '\n'
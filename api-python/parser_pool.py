@@ -0,0 +1,90 @@
+import queue
+import threading
+from contextlib import contextmanager
+
+
+class ParserPoolExhausted(Exception):
+    pass
+
+
+class ParserPool:
+    """Fixed-size pool of ready ProjectParser instances.
+
+    Instances (and the MPXJ reader each one holds) are created lazily up to
+    ``size`` and then handed out to one request thread at a time, so the JPype
+    class resolution and reader construction happen once per slot instead of
+    once per request. Size it to gunicorn's ``--threads`` so no request waits.
+    """
+
+    def __init__(self, factory, size):
+        self._factory = factory
+        self.size = max(1, int(size))
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self.checkouts = 0
+        self.waits = 0
+
+    def _checkout(self, timeout):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+                self.waits += 1
+        if create:
+            try:
+                return self._factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise ParserPoolExhausted(f"No parser available within {timeout}s")
+
+    @contextmanager
+    def acquire(self, timeout=None):
+        parser = self._checkout(timeout)
+        with self._lock:
+            self._in_use += 1
+            self.checkouts += 1
+        try:
+            yield parser
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._idle.put(parser)
+
+    def prefill(self):
+        """Create every slot up front (e.g. at worker boot)."""
+        while True:
+            with self._lock:
+                if self._created >= self.size:
+                    return
+                self._created += 1
+            try:
+                parser = self._factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+            self._idle.put(parser)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'created': self._created,
+                'inUse': self._in_use,
+                'idle': self._idle.qsize(),
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+            }
@@ -0,0 +1,155 @@
+import jpype
+
+from task_fields import int_list
+
+HELPER_CLASS = 'com.pinnacle.mpp.RelationExtractor'
+
+# Codes used by RelationExtractor and the exposed edge table.
+TYPE_NAMES = ('FS', 'SS', 'FF', 'SF')
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+
+# relations= request option: legacy per-task lists, the edge table, or both.
+LEGACY = 'legacy'
+EDGES = 'edges'
+BOTH = 'both'
+MODES = (LEGACY, EDGES, BOTH)
+
+
+class EdgeTable:
+    """Every dependency once: parallel arrays indexed by edge number.
+
+    ``source``/``target`` are task positions in the parse's task order
+    (-1 when that end is outside the collected tasks; its id, name and
+    external flag are then kept in ``unresolved[edge]``). Edges are read
+    from the collected tasks' predecessor lists, plus their successor links
+    to tasks outside them, which no collected predecessor list holds. ``lag`` is the raw
+    lag value as reported in ``lagDays``; ``lag_hours`` the same lag converted
+    to hours like task durations, for scheduling.
+    """
+
+    __slots__ = ('source', 'target', 'type', 'lag', 'unresolved', 'lag_hours')
+
+    def __init__(self, source, target, type_codes, lag, unresolved, lag_hours=None):
+        self.source = source
+        self.target = target
+        self.type = type_codes
+        self.lag = lag
+        self.unresolved = unresolved
+        self.lag_hours = lag if lag_hours is None else lag_hours
+
+    def __len__(self):
+        return len(self.source)
+
+    def group(self, ends, task_count):
+        """Edge numbers per task for the given end array, in edge order."""
+        groups = [[] for _ in range(task_count)]
+        for edge, task in enumerate(ends):
+            if task >= 0:
+                groups[task].append(edge)
+        return groups
+
+    def to_dict(self):
+        table = {
+            'count': len(self.source),
+            'from': self.source,
+            'to': self.target,
+            'type': self.type,
+            'lagDays': self.lag,
+            'typeNames': list(TYPE_NAMES),
+        }
+        if self.unresolved:
+            table['unresolved'] = [
+                {'edge': edge, 'end': 'to' if self.target[edge] < 0 else 'from', **info}
+                for edge, info in sorted(self.unresolved.items())
+            ]
+        return table
+
+
+def _endpoint_info(parser, task):
+    return {
+        'id': parser._task_id(task, fallback=''),
+        'name': str(task.getName() or ''),
+        'isExternal': bool(task.getExternalTask()),
+    }
+
+
+def read_edges(parser, index):
+    """Read each relation once from ``index.tasks`` (see EdgeTable)."""
+    if getattr(parser, 'relation_extractor', None) is not None:
+        try:
+            return _read_edges_java(parser, index)
+        except Exception as e:
+            print(f"Relation extractor failed ({e}); reading relations per task.")
+    return _read_edges_python(parser, index)
+
+
+def _read_edges_java(parser, index):
+    source, target, types, lag, unresolved_edges, unresolved_tasks, lag_hours = parser.relation_extractor.extract(
+        jpype.JArray(jpype.JObject)(index.tasks))
+    unresolved = {
+        int(edge): _endpoint_info(parser, task)
+        for edge, task in zip(int_list(unresolved_edges), unresolved_tasks)
+    }
+    return EdgeTable(
+        int_list(source),
+        int_list(target),
+        int_list(types),
+        memoryview(lag).tolist(),
+        unresolved,
+        memoryview(lag_hours).tolist(),
+    )
+
+
+def _read_edges_python(parser, index):
+    source, target, types, lag, lag_hours, unresolved = [], [], [], [], [], {}
+    position = index.position
+
+    def add(from_pos, to_pos, relation, outside):
+        lag_duration = relation.getLag()
+        lag_days = 0.0
+        hours = 0.0
+        if lag_duration:
+            try:
+                lag_days = parser._to_float(lag_duration.getDuration())
+            except Exception:
+                lag_days = 0.0
+            hours = parser._to_duration_hours(lag_duration) or 0.0
+        if outside is not None:
+            unresolved[len(source)] = _endpoint_info(parser, outside)
+        source.append(from_pos)
+        target.append(to_pos)
+        types.append(TYPE_CODES[parser._normalize_relation_type(relation)])
+        lag.append(lag_days)
+        lag_hours.append(hours)
+
+    for idx, task in enumerate(index.tasks):
+        try:
+            relations = task.getPredecessors()
+        except Exception as e:
+            print(f"  Warning: getPredecessors() failed for task {idx}: {e}")
+            relations = None
+        for relation in relations or ():
+            try:
+                predecessor_task, _ = parser._extract_relation_tasks(relation)
+                if predecessor_task is None:
+                    continue
+                pos = position.get(predecessor_task, -1)
+                add(pos, idx, relation, predecessor_task if pos < 0 else None)
+            except Exception as rel_err:
+                print(f"  Warning: Could not parse relation for task {idx}: {rel_err}")
+
+        # Links into collected tasks were read from their predecessors.
+        try:
+            relations = task.getSuccessors()
+        except Exception as e:
+            print(f"  Warning: getSuccessors() failed for task {idx}: {e}")
+            continue
+        for relation in relations or ():
+            try:
+                _, successor_task = parser._extract_relation_tasks(relation)
+                if successor_task is None or successor_task in position:
+                    continue
+                add(idx, -1, relation, successor_task)
+            except Exception as rel_err:
+                print(f"  Warning: Could not parse successor relation for task {idx}: {rel_err}")
+    return EdgeTable(source, target, types, lag, unresolved, lag_hours)
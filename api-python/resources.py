@@ -0,0 +1,102 @@
+# resources= request option: resource names and ids repeated in every
+# assignment (legacy), one ('resources', table) event with assignments
+# pointing into it, or both.
+LEGACY = 'legacy'
+TABLE = 'table'
+BOTH = 'both'
+MODES = (LEGACY, TABLE, BOTH)
+
+
+class ResourceTable:
+    """Every resource once: parallel lists indexed by resource number.
+
+    ``id`` is the id reported as an assignment's ``resourceId``;
+    ``assignments[r]`` lists the (task position, assignment number) pairs
+    using resource ``r``, filled in by add_assignment as tasks are read.
+    """
+
+    __slots__ = ('position', 'id', 'name', 'type', 'max_units', 'standard_rate', 'rate_units', 'calendar',
+                 'assignments')
+
+    def __init__(self):
+        self.position = {}  # resource unique ID -> resource number
+        self.id = []
+        self.name = []
+        self.type = []
+        self.max_units = []
+        self.standard_rate = []
+        self.rate_units = []
+        self.calendar = []
+        self.assignments = []
+
+    def __len__(self):
+        return len(self.id)
+
+    def resource_of(self, assignment):
+        """Resource number of a Java ResourceAssignment; None when it has no (known) resource."""
+        try:
+            uid = assignment.getResourceUniqueID()
+        except Exception:
+            return None
+        if uid is None:
+            return None
+        return self.position.get(int(uid))
+
+    def add_assignment(self, resource, task, number):
+        self.assignments[resource].append((task, number))
+
+    def to_dict(self):
+        return {
+            'count': len(self.id),
+            'id': self.id,
+            'name': self.name,
+            'type': self.type,
+            'maxUnits': self.max_units,
+            'standardRate': self.standard_rate,
+            'standardRateUnits': self.rate_units,
+            'calendar': self.calendar,
+            'assignments': self.assignments,
+        }
+
+
+def read_resources(parser, project):
+    """Read ``project.getResources()`` once into a ResourceTable.
+
+    A resource that cannot be read is left out, so its assignments fall back
+    to reading the resource through the assignment, as before the table.
+    """
+    table = ResourceTable()
+    try:
+        project_resources = project.getResources()
+    except Exception as e:
+        print(f"  Warning: getResources() failed: {e}")
+        return table
+    for r in project_resources:
+        try:
+            uid = r.getUniqueID()
+            if uid is None or int(uid) in table.position:
+                continue
+            name = str(r.getName() or "")
+            resource_type = r.getType()
+            max_units = r.getMaxUnits()
+            max_units = parser._to_float(max_units) if max_units is not None else None
+            rate = r.getStandardRate()
+            rate_units = rate.getUnits() if rate is not None else None
+            standard_rate = float(rate.getAmount()) if rate is not None else None
+        except Exception as e:
+            print(f"  Warning: Could not read a resource: {e}")
+            continue
+        try:
+            calendar = r.getCalendar()
+        except Exception:
+            calendar = None
+        table.position[int(uid)] = len(table.id)
+        table.id.append(str(uid))
+        table.name.append(name)
+        table.type.append(str(resource_type) if resource_type is not None else None)
+        table.max_units.append(max_units)
+        table.standard_rate.append(standard_rate)
+        table.rate_units.append(str(rate_units) if rate_units is not None else None)
+        table.calendar.append(str(calendar.getName() or "") if calendar is not None else None)
+        table.assignments.append([])
+    return table
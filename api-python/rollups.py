@@ -0,0 +1,107 @@
+import numpy as np
+
+# Leaf values summed into each summary task.
+SUM_KEYS = (
+    'baselineHours', 'actualHours', 'remainingHours', 'projectedHours',
+    'baselineCost', 'actualCost', 'remainingCost',
+)
+# ISO date fields rolled up as the earliest / latest leaf value.
+MIN_DATE_KEYS = ('startDate', 'baselineStartDate', 'actualStartDate')
+MAX_DATE_KEYS = ('endDate', 'baselineEndDate', 'actualEndDate')
+# Task fields a rollup reads (besides is_summary).
+FIELD_KEYS = SUM_KEYS + ('percentComplete', 'isCritical') + MIN_DATE_KEYS + MAX_DATE_KEYS
+
+
+def _bounds(hierarchy):
+    """reduceat indices covering each task's subtree: enter/exit pairs, interleaved.
+
+    Reducing values laid out in pre-order gives one result per task (in task
+    order). Every subtree is non-empty, so each pair reduces exactly
+    ``order[enter:exit]``; the odd slots in between are thrown away.
+    """
+    bounds = np.empty(2 * len(hierarchy.order), dtype=np.intp)
+    bounds[0::2] = hierarchy.enter
+    bounds[1::2] = hierarchy.exit
+    return bounds
+
+
+def _segment(ufunc, values, bounds, fill):
+    # One padding row keeps an exit of len(order) a valid reduceat index.
+    padded = np.concatenate((values, np.full((1,) + values.shape[1:], fill, dtype=values.dtype)))
+    return ufunc.reduceat(padded, bounds, axis=0)[0::2]
+
+
+def _date_extreme(strings, bounds, latest):
+    """Earliest (or latest) ISO string per subtree; None where no leaf has one.
+
+    ISO-8601 local date-times sort chronologically as text, so strings are
+    ranked once and the ranks reduced, keeping the original text.
+    """
+    labels = sorted({value for value in strings if value})
+    rank = {label: r for r, label in enumerate(labels)}
+    missing = -1 if latest else len(labels)
+    ranks = np.fromiter((rank.get(value, missing) for value in strings), dtype=np.int64, count=len(strings))
+    best = _segment(np.maximum if latest else np.minimum, ranks, bounds, missing)
+    return [labels[r] if 0 <= r < len(labels) else None for r in best.tolist()]
+
+
+def compute(hierarchy, is_summary, columns):
+    """Bottom-up rollups of the leaf tasks' ``columns`` (a field reader's read_columns) over ``hierarchy``.
+
+    Returns one dict per summary task (None for leaves): summed hours and
+    costs (plus totalHours/scheduledCost as actual + remaining), percent
+    complete weighted by work (an equal-weight mean when a subtree has no
+    work), earliest starts and latest finishes, and leaf / critical leaf
+    counts. Every aggregate is a reduceat over pre-order subtree ranges, so
+    there is no per-node recursion; summary tasks' own values are ignored.
+    """
+    task_count = len(is_summary)
+    if not task_count:
+        return []
+    order = np.asarray(hierarchy.order, dtype=np.intp)
+    bounds = _bounds(hierarchy)
+    summary = np.asarray(is_summary, dtype=bool)
+    leaf = ~summary[order]
+
+    values = np.nan_to_num(np.column_stack([np.asarray(columns[key], dtype=np.float64) for key in SUM_KEYS]))[order]
+    values[~leaf] = 0.0
+    percent = np.nan_to_num(np.asarray(columns['percentComplete'], dtype=np.float64))[order] * leaf
+    critical = np.nan_to_num(np.asarray(columns['isCritical'], dtype=np.float64))[order] != 0.0
+    work = values[:, SUM_KEYS.index('projectedHours')]
+    sums = _segment(np.add, np.column_stack((
+        values, work * percent, percent, leaf.astype(np.float64), (leaf & critical).astype(np.float64),
+    )), bounds, 0.0)
+    totals = sums[:, :len(SUM_KEYS)]
+    weighted, plain, leaves, criticals = sums[:, len(SUM_KEYS):].T
+    total_work = totals[:, SUM_KEYS.index('projectedHours')]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent_complete = np.where(total_work > 0, weighted / total_work,
+                                    np.where(leaves > 0, plain / leaves, 0.0))
+
+    ordered = list(zip(order.tolist(), leaf.tolist()))
+    dates = {}
+    for key in MIN_DATE_KEYS + MAX_DATE_KEYS:
+        column = columns[key]
+        strings = [column[i] if is_leaf else None for i, is_leaf in ordered]
+        dates[key] = _date_extreme(strings, bounds, key in MAX_DATE_KEYS)
+
+    rows = np.flatnonzero(summary)
+    summed = np.column_stack((
+        totals,
+        totals[:, SUM_KEYS.index('actualHours')] + totals[:, SUM_KEYS.index('remainingHours')],
+        totals[:, SUM_KEYS.index('actualCost')] + totals[:, SUM_KEYS.index('remainingCost')],
+    ))[rows]
+    summed = np.round(summed, 6).tolist()
+    percent_complete = np.round(percent_complete[rows], 2).tolist()
+    leaves = leaves[rows].astype(np.int64).tolist()
+    criticals = criticals[rows].astype(np.int64).tolist()
+    result = [None] * task_count
+    for n, i in enumerate(rows.tolist()):
+        rollup = dict(zip(SUM_KEYS + ('totalHours', 'scheduledCost'), summed[n]))
+        rollup['percentComplete'] = percent_complete[n]
+        for key, column in dates.items():
+            rollup[key] = column[i]
+        rollup['leafTasks'] = leaves[n]
+        rollup['criticalTasks'] = criticals[n]
+        result[i] = rollup
+    return result
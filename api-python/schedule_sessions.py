@@ -0,0 +1,201 @@
+import math
+import time
+import uuid
+import threading
+
+import cpm
+from relations import TYPE_CODES
+
+# Patch operations accepted by ScheduleSession.apply.
+DURATION = 'duration'
+ADD_LINK = 'addLink'
+REMOVE_LINK = 'removeLink'
+CONSTRAINT = 'constraint'
+OPS = (DURATION, ADD_LINK, REMOVE_LINK, CONSTRAINT)
+
+
+def _number(patch, key, default=None):
+    value = patch.get(key, default)
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be a number")
+    if not math.isfinite(number):
+        raise ValueError(f"{key} must be a finite number")
+    return number
+
+
+def _hours(patch, days_key, hours_key, default=None):
+    if hours_key in patch:
+        return _number(patch, hours_key)
+    if days_key in patch or default is not None:
+        return _number(patch, days_key, default) * cpm.HOURS_PER_DAY
+    raise ValueError(f"{days_key} or {hours_key} is required")
+
+
+def _relation_type(patch, default=None):
+    name = str(patch.get('type') or default or '').upper()
+    if not name:
+        return None
+    if name not in TYPE_CODES:
+        raise ValueError(f"type must be one of: {', '.join(TYPE_CODES)}")
+    return TYPE_CODES[name]
+
+
+def _constraint_name(raw):
+    name = str(raw or '').strip().upper().replace(' ', '_')
+    return 'AS_SOON_AS_POSSIBLE' if name in ('', 'ASAP') else name
+
+
+class ScheduleSession:
+    """A parsed project's dependency network, kept in memory for what-if patches."""
+
+    __slots__ = ('id', 'project', 'ids', 'names', 'position', 'start_date', 'network',
+                 'created', 'last_used', 'patches', 'lock')
+
+    def __init__(self, project, structure, network):
+        self.id = uuid.uuid4().hex
+        self.project = project
+        self.ids = [row['id'] for row in structure]
+        self.names = [row['name'] for row in structure]
+        self.position = {task_id: i for i, task_id in enumerate(self.ids) if task_id}
+        self.start_date = project.get('startDate') or time.strftime('%Y-%m-%d')
+        self.network = network
+        self.created = self.last_used = time.time()
+        self.patches = 0
+        self.lock = threading.Lock()
+
+    def to_dict(self):
+        network = self.network
+        result = network.result
+        return {
+            'sessionId': self.id,
+            'project': self.project,
+            'taskCount': network.task_count,
+            'linkCount': len(network.source),
+            'projectFinish': result.finish_date(self.start_date),
+            'criticalTasks': int((result.critical & network.active).sum()),
+            'cycleTasks': result.cycle_tasks,
+            'patchesApplied': self.patches,
+            'createdAt': self.created,
+            'lastUsedAt': self.last_used,
+        }
+
+    def _task(self, patch, key):
+        task_id = patch.get(key)
+        position = self.position.get(str(task_id)) if task_id is not None else None
+        if position is None:
+            raise ValueError(f"Unknown task {task_id!r}")
+        return position
+
+    def _apply_one(self, network, patch):
+        if not isinstance(patch, dict):
+            raise ValueError("Each patch must be an object")
+        op = patch.get('op')
+        if op == DURATION:
+            network.set_duration(self._task(patch, 'task'), _hours(patch, 'days', 'hours'))
+        elif op == ADD_LINK:
+            network.add_link(self._task(patch, 'from'), self._task(patch, 'to'),
+                             _relation_type(patch, 'FS'), _hours(patch, 'lagDays', 'lagHours', 0.0))
+        elif op == REMOVE_LINK:
+            source, target = self._task(patch, 'from'), self._task(patch, 'to')
+            if not network.remove_link(source, target, _relation_type(patch)):
+                raise ValueError(f"No link from {patch.get('from')!r} to {patch.get('to')!r}")
+        elif op == CONSTRAINT:
+            name = _constraint_name(patch.get('type'))
+            date = patch.get('date')
+            hours = cpm.working_hours(date, self.start_date) if date else None
+            network.set_constraint(self._task(patch, 'task'), name, hours)
+        else:
+            raise ValueError(f"op must be one of: {', '.join(OPS)}")
+
+    def apply(self, patches):
+        """Apply ``patches`` (all or none) and reschedule incrementally.
+
+        Returns the tasks whose dates, slack or critical flag changed plus the
+        new project finish. Raises ValueError (cpm.CycleError for a patch that
+        closes a dependency cycle), leaving the session unchanged.
+        """
+        with self.lock:
+            t0 = time.perf_counter()
+            network = self.network.copy()
+            for patch in patches:
+                self._apply_one(network, patch)
+            previous = network.result
+            result, forward, backward = network.reschedule()
+            rows = result.changed_rows(previous)
+            columns = result.columns(self.start_date, rows)
+            changed = []
+            for k, row in enumerate(rows.tolist()):
+                task = {'id': self.ids[row], 'name': self.names[row], 'duration': float(result.duration[row])}
+                for key in cpm.SCHEDULE_KEYS:
+                    task[key] = columns[key][k]
+                changed.append(task)
+            self.network = network
+            self.patches += len(patches)
+            return {
+                'changed': changed,
+                'projectFinish': result.finish_date(self.start_date),
+                'criticalTasks': int((result.critical & network.active).sum()),
+                'recomputed': {'forward': forward, 'backward': backward},
+                'milliseconds': round((time.perf_counter() - t0) * 1000.0, 3),
+            }
+
+
+class ScheduleSessions:
+    """In-memory what-if sessions keyed by id.
+
+    Sessions idle for ``ttl`` seconds are dropped; past ``max_sessions`` the
+    least recently used one is evicted to make room.
+    """
+
+    def __init__(self, ttl=1800, max_sessions=16):
+        self.ttl = float(ttl)
+        self.max_sessions = max(1, int(max_sessions))
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def _sweep_locked(self):
+        cutoff = time.time() - self.ttl
+        for session_id in [s.id for s in self._sessions.values() if s.last_used < cutoff]:
+            del self._sessions[session_id]
+            self.expired += 1
+
+    def create(self, project, structure, network):
+        session = ScheduleSession(project, structure, network)
+        with self._lock:
+            self._sweep_locked()
+            while len(self._sessions) >= self.max_sessions:
+                oldest = min(self._sessions.values(), key=lambda s: s.last_used)
+                del self._sessions[oldest.id]
+                self.evicted += 1
+            self._sessions[session.id] = session
+            self.created += 1
+        return session
+
+    def get(self, session_id):
+        with self._lock:
+            self._sweep_locked()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_used = time.time()
+            return session
+
+    def delete(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def stats(self):
+        with self._lock:
+            self._sweep_locked()
+            return {
+                'sessions': len(self._sessions),
+                'maxSessions': self.max_sessions,
+                'ttlSeconds': self.ttl,
+                'created': self.created,
+                'expired': self.expired,
+                'evicted': self.evicted,
+            }
@@ -0,0 +1,347 @@
+import os
+import math
+
+import jpype
+import numpy as np
+
+TEXT = 'text'
+NUMBER = 'number'
+COST = 'cost'
+WORK = 'work'
+HOURS = 'hours'
+BOOL = 'bool'
+INT = 'int'
+CALENDAR = 'calendar'
+CONSTRAINT = 'constraint'
+
+# Kind codes understood by com.pinnacle.mpp.BulkTaskExtractor.
+JAVA_KINDS = {
+    TEXT: 0,
+    CONSTRAINT: 0,
+    NUMBER: 1,
+    COST: 1,
+    INT: 1,
+    WORK: 2,
+    HOURS: 3,
+    BOOL: 4,
+    CALENDAR: 5,
+}
+
+HELPER_CLASS = 'com.pinnacle.mpp.BulkTaskExtractor'
+HELPER_CLASSPATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'java', 'classes')
+BULK_CHUNK_SIZE = int(os.environ.get('PARSER_BULK_CHUNK', '1000'))
+
+
+class FieldSpec:
+    __slots__ = ('key', 'getter', 'kind', 'default')
+
+    def __init__(self, key, getter, kind, default=None):
+        self.key = key
+        self.getter = getter
+        self.kind = kind
+        self.default = default
+
+
+# Scalar task fields, in the order they were historically read. Keys starting
+# with an underscore are inputs for the id fallback and never reach the JSON.
+TASK_FIELDS = [
+    FieldSpec('_uniqueId', 'getUniqueID', INT),
+    FieldSpec('_taskId', 'getID', INT),
+    FieldSpec('name', 'getName', TEXT, ''),
+    FieldSpec('outline_level', 'getOutlineLevel', INT, 0),
+    FieldSpec('is_summary', 'getSummary', BOOL, False),
+    FieldSpec('projectedHours', 'getWork', WORK, 0.0),
+    FieldSpec('actualHours', 'getActualWork', WORK, 0.0),
+    FieldSpec('remainingHours', 'getRemainingWork', WORK),
+    FieldSpec('baselineHours', 'getBaselineWork', WORK, 0.0),
+    FieldSpec('baselineCost', 'getBaselineCost', COST, 0.0),
+    FieldSpec('actualCost', 'getActualCost', COST, 0.0),
+    FieldSpec('remainingCost', 'getRemainingCost', COST),
+    FieldSpec('wbsCode', 'getWBS', TEXT),
+    FieldSpec('outlineNumber', 'getOutlineNumber', TEXT),
+    FieldSpec('constraintType', 'getConstraintType', CONSTRAINT),
+    FieldSpec('constraintDate', 'getConstraintDate', TEXT),
+    FieldSpec('baselineStartDate', 'getBaselineStart', TEXT),
+    FieldSpec('baselineEndDate', 'getBaselineFinish', TEXT),
+    FieldSpec('actualStartDate', 'getActualStart', TEXT),
+    FieldSpec('actualEndDate', 'getActualFinish', TEXT),
+    FieldSpec('duration', 'getDuration', HOURS),
+    FieldSpec('baselineDuration', 'getBaselineDuration', HOURS),
+    FieldSpec('actualDuration', 'getActualDuration', HOURS),
+    FieldSpec('remainingDuration', 'getRemainingDuration', HOURS),
+    FieldSpec('earlyStart', 'getEarlyStart', TEXT),
+    FieldSpec('earlyFinish', 'getEarlyFinish', TEXT),
+    FieldSpec('lateStart', 'getLateStart', TEXT),
+    FieldSpec('lateFinish', 'getLateFinish', TEXT),
+    FieldSpec('freeSlack', 'getFreeSlack', WORK),
+    FieldSpec('cost', 'getCost', COST),
+    FieldSpec('fixedCost', 'getFixedCost', COST),
+    FieldSpec('costVariance', 'getCostVariance', COST),
+    FieldSpec('workVariance', 'getWorkVariance', WORK),
+    FieldSpec('durationVariance', 'getDurationVariance', WORK),
+    FieldSpec('isMilestone', 'getMilestone', BOOL, False),
+    FieldSpec('isEstimated', 'getEstimated', BOOL, False),
+    FieldSpec('isRecurring', 'getRecurring', BOOL, False),
+    FieldSpec('isExternal', 'getExternalTask', BOOL, False),
+    FieldSpec('priority', 'getPriority', TEXT),
+    FieldSpec('deadline', 'getDeadline', TEXT),
+    FieldSpec('calendarName', 'getCalendar', CALENDAR),
+    FieldSpec('calendarUniqueId', 'getCalendarUniqueID', INT),
+    FieldSpec('percentWorkComplete', 'getPercentageWorkComplete', NUMBER),
+    FieldSpec('physicalPercentComplete', 'getPhysicalPercentComplete', NUMBER),
+    FieldSpec('contact', 'getContact', TEXT),
+    FieldSpec('manager', 'getManager', TEXT),
+    FieldSpec('hyperlinkAddress', 'getHyperlinkAddress', TEXT),
+    FieldSpec('hyperlinkSubAddress', 'getHyperlinkSubAddress', TEXT),
+    FieldSpec('subprojectFile', 'getSubprojectFile', TEXT),
+    FieldSpec('subprojectTaskId', 'getSubprojectTaskID', INT),
+    FieldSpec('startDate', 'getStart', TEXT),
+    FieldSpec('endDate', 'getFinish', TEXT),
+    FieldSpec('percentComplete', 'getPercentageComplete', NUMBER, 0.0),
+    FieldSpec('isCritical', 'getCritical', BOOL, False),
+    FieldSpec('totalSlack', 'getTotalSlack', WORK, 0.0),
+    FieldSpec('comments', 'getNotes', TEXT, ''),
+]
+
+# Read for every task before any node is built (ids, hierarchy, folders and
+# the endpoint details of dependency lists);
+# everything else is read chunk by chunk while tasks are emitted.
+STRUCTURE_KEYS = ('_uniqueId', '_taskId', 'name', 'outline_level', 'is_summary', 'outlineNumber', 'isExternal')
+STRUCTURE_FIELDS = [spec for spec in TASK_FIELDS if spec.key in STRUCTURE_KEYS]
+DETAIL_FIELDS = [spec for spec in TASK_FIELDS if spec.key not in STRUCTURE_KEYS]
+
+# Keys of a task node in the /parse output, in emission order.
+OUTPUT_KEYS = (
+    'id', 'name', 'outline_level', 'hierarchy_type', 'is_summary', 'parent_id', 'startDate', 'endDate',
+    'percentComplete', 'baselineHours', 'actualHours', 'projectedHours', 'remainingHours', 'baselineCost',
+    'actualCost', 'remainingCost', 'assignedResource', 'isCritical', 'totalSlack', 'comments',
+    'predecessors', 'successors', 'wbsCode', 'outlineNumber', 'constraintType', 'constraintDate',
+    'baselineStartDate', 'baselineEndDate', 'actualStartDate', 'actualEndDate', 'duration',
+    'baselineDuration', 'actualDuration', 'remainingDuration', 'earlyStart', 'earlyFinish', 'lateStart',
+    'lateFinish', 'freeSlack', 'cost', 'fixedCost', 'costVariance', 'workVariance', 'durationVariance',
+    'isMilestone', 'isEstimated', 'isRecurring', 'isExternal', 'priority', 'deadline', 'calendarName',
+    'calendarUniqueId', 'percentWorkComplete', 'physicalPercentComplete', 'contact', 'manager',
+    'hyperlinkAddress', 'hyperlinkSubAddress', 'subprojectFile', 'subprojectTaskId', 'resourceAssignments',
+    'baselineCount', 'baselineMetric', 'baselineUom', 'actualCount', 'actualMetric', 'actualUom',
+    'customFields', 'folder',
+)
+CUSTOM_KEYS = ('baselineCount', 'baselineMetric', 'baselineUom', 'actualCount', 'actualMetric', 'actualUom', 'customFields')
+
+_CORE = (
+    'id', 'name', 'outline_level', 'hierarchy_type', 'is_summary', 'parent_id', 'outlineNumber', 'wbsCode',
+    'folder', 'startDate', 'endDate', 'percentComplete', 'isMilestone', 'isCritical', 'assignedResource',
+)
+# fields= presets; "full" (every key) is the default.
+FIELD_PRESETS = {
+    'core': _CORE,
+    'schedule': _CORE + (
+        'baselineStartDate', 'baselineEndDate', 'actualStartDate', 'actualEndDate', 'duration',
+        'baselineDuration', 'actualDuration', 'remainingDuration', 'earlyStart', 'earlyFinish', 'lateStart',
+        'lateFinish', 'totalSlack', 'freeSlack', 'constraintType', 'constraintDate', 'deadline',
+        'calendarName', 'calendarUniqueId', 'predecessors', 'successors',
+    ),
+    'cost': _CORE + (
+        'baselineHours', 'actualHours', 'projectedHours', 'remainingHours', 'baselineCost', 'actualCost',
+        'remainingCost', 'cost', 'fixedCost', 'costVariance', 'workVariance', 'durationVariance',
+        'percentWorkComplete', 'physicalPercentComplete', 'resourceAssignments',
+    ) + CUSTOM_KEYS,
+    # What lib/ingest/mpp-mapper.ts reads.
+    'ingest': (
+        'id', 'name', 'outline_level', 'is_summary', 'startDate', 'endDate', 'baselineStartDate',
+        'baselineEndDate', 'actualStartDate', 'actualEndDate', 'percentComplete', 'baselineHours',
+        'actualHours', 'projectedHours', 'remainingHours', 'actualCost', 'remainingCost', 'isCritical',
+        'isMilestone', 'totalSlack', 'assignedResource', 'constraintType', 'constraintDate', 'earlyStart',
+        'earlyFinish', 'lateStart', 'lateFinish', 'priority', 'wbsCode', 'folder', 'predecessors',
+    ) + CUSTOM_KEYS[:-1],
+    'full': OUTPUT_KEYS,
+}
+
+
+def resolve_fields(spec):
+    """Output keys for a fields= value (comma-separated presets and keys), or None for all of them.
+
+    The id is always included. Raises ValueError on an unknown name.
+    """
+    names = [name.strip() for name in (spec or '').split(',') if name.strip()]
+    if not names:
+        return None
+    keys = {'id'}
+    for name in names:
+        if name in FIELD_PRESETS:
+            keys.update(FIELD_PRESETS[name])
+        elif name in OUTPUT_KEYS:
+            keys.add(name)
+        else:
+            raise ValueError(f"Unknown field or preset: {name}")
+    if len(keys) == len(OUTPUT_KEYS):
+        return None
+    return tuple(key for key in OUTPUT_KEYS if key in keys)
+
+
+def add_helper_classpath():
+    """Put the compiled Java helper on the classpath (before the JVM starts)."""
+    if os.path.isdir(HELPER_CLASSPATH):
+        jpype.addClassPath(HELPER_CLASSPATH)
+
+
+class PythonFieldReader:
+    """Reads TASK_FIELDS one JPype call per getter (the original code path)."""
+
+    name = 'python'
+
+    def __init__(self, parser, specs):
+        self.parser = parser
+        self.specs = specs
+
+    def read(self, tasks):
+        for task in tasks:
+            yield {spec.key: self._read(task, spec) for spec in self.specs}
+
+    def read_columns(self, tasks):
+        """The fields column-wise, defaults applied: float arrays for numbers and flags (NaN where unset
+        without a default), lists for text."""
+        columns = {spec.key: [] for spec in self.specs}
+        for row in self.read(tasks):
+            for key, value in row.items():
+                columns[key].append(value)
+        for spec in self.specs:
+            if JAVA_KINDS[spec.kind] not in (0, 5):
+                columns[spec.key] = np.array(
+                    [np.nan if value is None else float(value) for value in columns[spec.key]], dtype=np.float64)
+        return columns
+
+    def _read(self, task, spec):
+        try:
+            value = getattr(task, spec.getter)()
+        except Exception:
+            return spec.default
+        if value is None:
+            return spec.default
+        p = self.parser
+        kind = spec.kind
+        try:
+            if kind == TEXT:
+                return str(value)
+            if kind == NUMBER:
+                return p._to_float(value)
+            if kind == COST:
+                return p._to_cost(value)
+            if kind == WORK:
+                return p._to_float(value.getDuration()) if hasattr(value, 'getDuration') else p._to_float(value)
+            if kind == HOURS:
+                hours = p._to_duration_hours(value)
+                return spec.default if hours is None else hours
+            if kind == BOOL:
+                return bool(value)
+            if kind == INT:
+                return int(value)
+            if kind == CALENDAR:
+                return str(value.getName() or "") if hasattr(value, 'getName') else str(value)
+            if kind == CONSTRAINT:
+                return p._constraint_type_to_string(value)
+        except Exception:
+            return spec.default
+        return value
+
+
+class BulkFieldReader:
+    """Reads TASK_FIELDS through BulkTaskExtractor, one JPype call per chunk."""
+
+    name = 'bulk'
+
+    def __init__(self, parser, specs, chunk_size=BULK_CHUNK_SIZE):
+        self.parser = parser
+        self.specs = specs
+        self.chunk_size = max(1, chunk_size)
+        extractor_class = jpype.JClass(HELPER_CLASS)
+        self.extractor = extractor_class(
+            jpype.JArray(jpype.JString)([spec.getter for spec in specs]),
+            jpype.JArray(jpype.JInt)([JAVA_KINDS[spec.kind] for spec in specs]),
+        )
+        self.text_columns = int(self.extractor.getTextColumns())
+        self.number_columns = int(self.extractor.getNumberColumns())
+        self.layout = []
+        text_slot = number_slot = 0
+        for spec in specs:
+            if JAVA_KINDS[spec.kind] in (0, 5):
+                self.layout.append((spec, True, text_slot))
+                text_slot += 1
+            else:
+                self.layout.append((spec, False, number_slot))
+                number_slot += 1
+
+    def read(self, tasks):
+        constraint_to_string = self.parser._constraint_type_to_string
+        for start in range(0, len(tasks), self.chunk_size):
+            chunk = tasks[start:start + self.chunk_size]
+            text_array, number_array = self.extractor.extract(jpype.JArray(jpype.JObject)(chunk))
+            text = list(text_array)
+            numbers = memoryview(number_array).tolist()
+            for row in range(len(chunk)):
+                text_base = row * self.text_columns
+                number_base = row * self.number_columns
+                values = {}
+                for spec, is_text, slot in self.layout:
+                    if is_text:
+                        value = text[text_base + slot]
+                        if value is None:
+                            value = spec.default
+                        elif spec.kind == CONSTRAINT:
+                            value = constraint_to_string(value)
+                    else:
+                        value = numbers[number_base + slot]
+                        if math.isnan(value):
+                            value = spec.default
+                        elif spec.kind == BOOL:
+                            value = value != 0.0
+                        elif spec.kind == INT:
+                            value = int(value)
+                    values[spec.key] = value
+                yield values
+
+    def read_columns(self, tasks):
+        """Like PythonFieldReader.read_columns, slicing each chunk's number block instead of building rows."""
+        text_parts = [[] for _ in range(self.text_columns)]
+        number_parts = []
+        for start in range(0, len(tasks), self.chunk_size):
+            chunk = tasks[start:start + self.chunk_size]
+            text_array, number_array = self.extractor.extract(jpype.JArray(jpype.JObject)(chunk))
+            text = list(text_array)
+            for slot, part in enumerate(text_parts):
+                part.extend(text[slot::self.text_columns])
+            number_parts.append(np.array(memoryview(number_array), dtype=np.float64).reshape(-1, self.number_columns))
+        numbers = (np.concatenate(number_parts) if number_parts
+                   else np.empty((0, self.number_columns), dtype=np.float64))
+        constraint_to_string = self.parser._constraint_type_to_string
+        columns = {}
+        for spec, is_text, slot in self.layout:
+            if not is_text:
+                column = numbers[:, slot]
+                if spec.default is not None:
+                    column = np.where(np.isnan(column), float(spec.default), column)
+                columns[spec.key] = column
+            elif spec.kind == CONSTRAINT:
+                columns[spec.key] = [spec.default if value is None else constraint_to_string(value)
+                                     for value in text_parts[slot]]
+            else:
+                columns[spec.key] = [spec.default if value is None else str(value) for value in text_parts[slot]]
+        return columns
+
+
+def int_list(java_array):
+    """A Java int[] as a Python list (JPype's '=i' buffer format is not accepted by tolist())."""
+    return memoryview(java_array).cast('B').cast('i').tolist()
+
+
+def bulk_extract_enabled():
+    return os.environ.get('PARSER_BULK_EXTRACT', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+
+
+def make_field_reader(parser, specs):
+    """Prefer the Java bulk reader; fall back to per-getter JPype calls."""
+    if bulk_extract_enabled():
+        try:
+            return BulkFieldReader(parser, specs)
+        except Exception as e:
+            print(f"Bulk task extractor unavailable ({e}); using per-getter extraction.")
+    return PythonFieldReader(parser, specs)
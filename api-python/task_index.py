@@ -0,0 +1,224 @@
+import sys
+import itertools
+
+
+HIERARCHY_ANCHOR = 2
+
+
+def hierarchy_type(level, max_level, anchor=HIERARCHY_ANCHOR):
+    """Classify an outline level as project/unit/phase/task/sub_task."""
+    if level <= 1:
+        return 'project'
+    if level == anchor:
+        return 'unit'
+    if level == anchor + 1:
+        return 'phase'
+    if max_level >= (anchor + 3) and level == max_level:
+        return 'sub_task'
+    return 'task'
+
+
+class Hierarchy:
+    """Tree facts for a TaskIndex, from one iterative depth-first walk.
+
+    ``order`` lists the tasks in pre-order and ``enter[i]`` is task i's place
+    in it; the subtree of i is ``order[enter[i]:exit[i]]`` (i first), so
+    ancestor/descendant tests are two comparisons. ``depth[i]`` counts the
+    ancestors of i. Folder paths are built once per parent task and shared by
+    all of its children.
+    """
+
+    __slots__ = ('parent', 'depth', 'order', 'enter', 'exit')
+
+    def __init__(self, index):
+        task_count = len(index)
+        parent = index.parent
+        depth = [0] * task_count
+        enter = [-1] * task_count
+        order = []
+        child_offsets = index.child_offsets
+        child_indices = index.child_indices
+        # Roots first; the second sweep only picks up tasks a broken parent
+        # chain left unreachable, which then start subtrees of their own.
+        for start in itertools.chain((i for i in range(task_count) if parent[i] < 0), range(task_count)):
+            if enter[start] >= 0:
+                continue
+            stack = [start]
+            while stack:
+                i = stack.pop()
+                enter[i] = len(order)
+                order.append(i)
+                children = child_indices[child_offsets[i]:child_offsets[i + 1]]
+                child_depth = depth[i] + 1
+                for child in reversed(children):
+                    if enter[child] < 0:
+                        depth[child] = child_depth
+                        stack.append(child)
+        size = [1] * task_count
+        for i in reversed(order):
+            p = parent[i]
+            if p >= 0 and enter[p] < enter[i]:
+                size[p] += size[i]
+        self.parent = parent
+        self.depth = depth
+        self.order = order
+        self.enter = enter
+        self.exit = [e + n for e, n in zip(enter, size)]
+
+    def is_ancestor(self, ancestor, i):
+        """Whether ``ancestor`` is a proper ancestor of task ``i``."""
+        return self.enter[ancestor] < self.enter[i] < self.exit[ancestor]
+
+    def descendants(self, i):
+        """Tasks below ``i``, in pre-order."""
+        return self.order[self.enter[i] + 1:self.exit[i]]
+
+    def subtree_size(self, i):
+        return self.exit[i] - self.enter[i]
+
+    def ancestors(self, i):
+        """Parent, grandparent, ... of ``i`` up to its root."""
+        found = []
+        p = self.parent[i]
+        while p >= 0 and len(found) <= self.depth[i]:
+            found.append(p)
+            p = self.parent[p]
+        return found
+
+    def types(self, levels=None):
+        """hierarchy_type per task from outline ``levels`` (default depth + 1)."""
+        if levels is None:
+            levels = [d + 1 for d in self.depth]
+        max_level = max(levels) if levels else 0
+        by_level = {}
+        return [by_level.get(level) or by_level.setdefault(level, hierarchy_type(level, max_level))
+                for level in levels]
+
+    def folders(self, labels):
+        """'Root / ... / Parent' path of each task's ancestors ('' at the top).
+
+        Parents come before their children in pre-order, so each parent's path
+        is one join onto its own parent's; children share the parent's string.
+        """
+        task_count = len(self.order)
+        folder = [''] * task_count
+        path = {}
+        parent = self.parent
+        for i in self.order:
+            p = parent[i]
+            if p < 0 or self.enter[p] > self.enter[i]:
+                continue
+            shared = path.get(p)
+            if shared is None:
+                above = folder[p]
+                shared = path[p] = sys.intern(f"{above} / {labels[p]}" if above else labels[p])
+            folder[i] = shared
+        return folder
+
+
+class TaskIndex:
+    """Collected tasks in output order plus the hierarchy found while walking them.
+
+    ``parent[i]`` is the index of task i's parent (-1 for top-level tasks) and
+    the children of task i are ``child_indices[child_offsets[i]:child_offsets[i + 1]]``
+    in output order. ``position`` maps each Java task object to its index and
+    ``uid_index`` maps stable task id -> index once ids are known (see
+    ProjectParser._task_structure). ``hierarchy`` (built on first use) adds
+    depths, pre-order ranges and folder paths.
+    """
+
+    __slots__ = ('tasks', 'parent', 'child_offsets', 'child_indices', 'position', 'uid_index', '_hierarchy')
+
+    def __init__(self, tasks, parent, position=None):
+        self.tasks = tasks
+        self.parent = parent
+        self.position = position if position is not None else {task: i for i, task in enumerate(tasks)}
+        self.uid_index = {}
+        self._hierarchy = None
+        counts = [0] * (len(tasks) + 1)
+        for p in parent:
+            if p >= 0:
+                counts[p + 1] += 1
+        for i in range(len(tasks)):
+            counts[i + 1] += counts[i]
+        self.child_offsets = counts
+        fill = counts[:-1]
+        child_indices = [0] * len(tasks)
+        for i, p in enumerate(parent):
+            if p >= 0:
+                child_indices[fill[p]] = i
+                fill[p] += 1
+        self.child_indices = child_indices[:counts[-1]]
+
+    def __len__(self):
+        return len(self.tasks)
+
+    @property
+    def hierarchy(self):
+        if self._hierarchy is None:
+            self._hierarchy = Hierarchy(self)
+        return self._hierarchy
+
+    def children(self, i):
+        return self.child_indices[self.child_offsets[i]:self.child_offsets[i + 1]]
+
+    def without(self, alias):
+        """Copy without the tasks keyed in ``alias``; links to a dropped task go to ``alias[dropped]``."""
+        keep = [i for i in range(len(self.tasks)) if i not in alias]
+        new_pos = {old: new for new, old in enumerate(keep)}
+        parent = []
+        for i in keep:
+            p = self.parent[i]
+            while p in alias:
+                p = alias[p]
+            parent.append(new_pos[p] if p >= 0 else -1)
+        return TaskIndex([self.tasks[i] for i in keep], parent)
+
+
+def collect_task_index(project):
+    """Every task of ``project`` exactly once, as a TaskIndex.
+
+    Order matches the historical collector: the tasks listed by
+    getAllTasks()/getTasks() first, then any task reachable only through
+    getChildTasks() in depth-first pre-order (for files whose flat task list
+    is incomplete). Each task's children are fetched once, so the walk is
+    linear in the task count however deep the outline is.
+    """
+    index_of = {}
+    tasks = []
+    primary = []
+    for getter in ('getAllTasks', 'getTasks'):
+        try:
+            found = getattr(project, getter)()
+            if found:
+                primary.extend(t for t in found if t is not None)
+        except Exception:
+            pass
+    for task in primary:
+        if task not in index_of:
+            index_of[task] = len(tasks)
+            tasks.append(task)
+
+    parent = {}
+    expanded = set()
+    for root in list(tasks):
+        stack = [(root, None)]
+        while stack:
+            task, parent_idx = stack.pop()
+            idx = index_of.get(task)
+            if idx is None:
+                idx = index_of[task] = len(tasks)
+                tasks.append(task)
+            if parent_idx is not None and idx not in parent:
+                parent[idx] = parent_idx
+            if idx in expanded:
+                continue
+            expanded.add(idx)
+            try:
+                children = task.getChildTasks()
+            except Exception:
+                children = None
+            if children:
+                stack.extend((child, idx) for child in reversed(list(children)) if child is not None)
+
+    return TaskIndex(tasks, [parent.get(i, -1) for i in range(len(tasks))], index_of)
@@ -0,0 +1,123 @@
+"""Content-Encoding negotiation and compression of parse responses.
+
+Run from api-python/: python -m unittest discover tests
+Brotli and zstd cases are skipped when their module is not installed.
+"""
+import os
+import sys
+import unittest
+import zlib
+
+from werkzeug.http import parse_accept_header
+from werkzeug.wrappers import Response
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import content_encoding
+from content_encoding import BROTLI, GZIP, ZSTD, ResponseEncoder
+
+BODY = b'{"tasks":[' + b','.join(b'{"id":"%d","name":"Task %d"}' % (i, i) for i in range(2000)) + b']}'
+
+
+def decompressor(encoding):
+    """Incremental decode callable for one body in ``encoding``."""
+    if encoding == GZIP:
+        return zlib.decompressobj(31).decompress
+    if encoding == BROTLI:
+        return content_encoding.brotli.Decompressor().process
+    return content_encoding.zstandard.ZstdDecompressor().decompressobj().decompress
+
+
+def encode(encoder, response, accept):
+    return encoder.encode(response, parse_accept_header(accept))
+
+
+class NegotiationTests(unittest.TestCase):
+
+    def setUp(self):
+        self.encoder = ResponseEncoder(encodings=(GZIP,))
+
+    def test_q_values_are_respected(self):
+        encoder = ResponseEncoder()
+        if BROTLI in encoder.encodings:
+            self.assertEqual(encoder.negotiate(parse_accept_header('gzip;q=0.5, br;q=0.9')), BROTLI)
+        self.assertEqual(encoder.negotiate(parse_accept_header(', '.join(
+            f'{e};q={"1.0" if e == GZIP else "0.1"}' for e in encoder.encodings))), GZIP)
+        self.assertIsNone(encoder.negotiate(parse_accept_header('gzip;q=0, identity')))
+
+    def test_server_preference_breaks_ties(self):
+        encoder = ResponseEncoder()
+        self.assertEqual(encoder.negotiate(parse_accept_header('gzip, br, zstd')), encoder.encodings[0])
+
+    def test_no_accept_encoding_is_identity(self):
+        response = encode(self.encoder, Response(BODY), '')
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.get_data(), BODY)
+        self.assertIn('Accept-Encoding', response.vary)
+
+    def test_body_under_min_bytes_passes_through(self):
+        encoder = ResponseEncoder(encodings=(GZIP,), min_bytes=len(BODY) + 1)
+        response = encode(encoder, Response(BODY), 'gzip')
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.get_data(), BODY)
+
+    def test_error_responses_pass_through(self):
+        response = encode(self.encoder, Response(BODY, status=500), 'gzip')
+        self.assertNotIn('Content-Encoding', response.headers)
+
+
+class RoundTripTests(unittest.TestCase):
+
+    def check_round_trip(self, encoding):
+        if encoding not in content_encoding.available():
+            self.skipTest(f'{encoding} compressor not installed')
+        encoder = ResponseEncoder(encodings=(encoding,))
+        response = encode(encoder, Response(BODY), encoding)
+        self.assertEqual(response.headers['Content-Encoding'], encoding)
+        self.assertNotIn('Content-Length', response.headers)
+        compressed = b''.join(response.response)
+        self.assertLess(len(compressed), len(BODY))
+        self.assertEqual(decompressor(encoding)(compressed), BODY)
+        stats = encoder.stats()
+        self.assertEqual(stats['responses'][encoding], 1)
+        self.assertEqual(stats['bytesIn'], len(BODY))
+        self.assertEqual(stats['bytesOut'], len(compressed))
+
+    def check_streamed_lines(self, encoding):
+        if encoding not in content_encoding.available():
+            self.skipTest(f'{encoding} compressor not installed')
+        lines = [b'{"type":"task","id":"%d"}\n' % i for i in range(20)]
+        encoder = ResponseEncoder(encodings=(encoding,), min_bytes=1 << 20)
+        response = encode(encoder, Response(iter(lines), mimetype='application/x-ndjson'), encoding)
+        self.assertEqual(response.headers['Content-Encoding'], encoding)
+        decode = decompressor(encoding)
+        decoded = b''
+        pieces = iter(response.response)
+        for sent, piece in zip(range(1, len(lines) + 1), pieces):
+            decoded += decode(piece)
+            self.assertEqual(decoded, b''.join(lines[:sent]), f'after line {sent}')
+        for piece in pieces:
+            decoded += decode(piece)
+        self.assertEqual(decoded, b''.join(lines))
+
+    def test_gzip_round_trip(self):
+        self.check_round_trip(GZIP)
+
+    def test_brotli_round_trip(self):
+        self.check_round_trip(BROTLI)
+
+    def test_zstd_round_trip(self):
+        self.check_round_trip(ZSTD)
+
+    def test_gzip_stream_decodes_line_by_line(self):
+        self.check_streamed_lines(GZIP)
+
+    def test_brotli_stream_decodes_line_by_line(self):
+        self.check_streamed_lines(BROTLI)
+
+    def test_zstd_stream_decodes_line_by_line(self):
+        self.check_streamed_lines(ZSTD)
+
+
+if __name__ == '__main__':
+    unittest.main()
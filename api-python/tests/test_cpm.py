@@ -0,0 +1,125 @@
+"""Native critical-path engine against small hand-computed networks.
+
+Run from api-python/: python -m unittest discover tests
+Durations and lags are working hours; expected times are worked out by hand.
+"""
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cpm
+from cpm import FS, SS, FF, SF
+
+
+def schedule(durations, links):
+    """Full pass over ``links`` given as (source, target, type, lag) tuples."""
+    source, target, types, lag = zip(*links) if links else ((), (), (), ())
+    return cpm.schedule(durations, source, target, types, lag)
+
+
+class PassTests(unittest.TestCase):
+
+    def assertTimes(self, result, early_start, early_finish, late_start, late_finish):
+        np.testing.assert_allclose(result.early_start, early_start)
+        np.testing.assert_allclose(result.early_finish, early_finish)
+        np.testing.assert_allclose(result.late_start, late_start)
+        np.testing.assert_allclose(result.late_finish, late_finish)
+
+    def test_finish_to_start_with_lag(self):
+        # A(8) -FS+4-> B(16); C(4) unlinked.
+        result = schedule([8, 16, 4], [(0, 1, FS, 4)])
+        self.assertTimes(result, [0, 12, 0], [8, 28, 4], [0, 12, 24], [8, 28, 28])
+        self.assertEqual(result.finish, 28)
+        np.testing.assert_allclose(result.total_slack, [0, 0, 24])
+        np.testing.assert_allclose(result.free_slack, [0, 0, 24])
+        self.assertEqual(result.critical.tolist(), [True, True, False])
+
+    def test_finish_to_start_with_lead(self):
+        # A(8) -FS-4-> B(8): B overlaps the last half of A.
+        result = schedule([8, 8], [(0, 1, FS, -4)])
+        self.assertTimes(result, [0, 4], [8, 12], [0, 4], [8, 12])
+
+    def test_start_to_start(self):
+        # A(8) -SS+2-> B(4): B runs 2-6 and can slip to 4-8.
+        result = schedule([8, 4], [(0, 1, SS, 2)])
+        self.assertTimes(result, [0, 2], [8, 6], [0, 4], [8, 8])
+        np.testing.assert_allclose(result.total_slack, [0, 2])
+        np.testing.assert_allclose(result.free_slack, [0, 2])
+
+    def test_finish_to_finish(self):
+        # A(8) -FF+0-> B(4): B ends with A.
+        result = schedule([8, 4], [(0, 1, FF, 0)])
+        self.assertTimes(result, [0, 4], [8, 8], [0, 4], [8, 8])
+        self.assertEqual(result.critical.tolist(), [True, True])
+
+    def test_start_to_finish(self):
+        # A(8) -SF+10-> B(4): B finishes 10 hours after A starts.
+        result = schedule([8, 4], [(0, 1, SF, 10)])
+        self.assertTimes(result, [0, 6], [8, 10], [0, 6], [8, 10])
+        self.assertEqual(result.finish, 10)
+        np.testing.assert_allclose(result.free_slack, [0, 0])
+
+    def test_merge_takes_latest_predecessor(self):
+        # A(8) and B(16) both FS into C(8); A has 8 hours of slack.
+        result = schedule([8, 16, 8], [(0, 2, FS, 0), (1, 2, FS, 0)])
+        self.assertTimes(result, [0, 0, 16], [8, 16, 24], [8, 0, 16], [16, 16, 24])
+        np.testing.assert_allclose(result.free_slack, [8, 0, 0])
+
+    def test_links_outside_the_network_are_ignored(self):
+        result = schedule([8, 8], [(-1, 0, FS, 0), (0, -1, FS, 0), (1, 1, FS, 0)])
+        self.assertTimes(result, [0, 0], [8, 8], [0, 0], [8, 8])
+
+    def test_dates_on_the_standard_calendar(self):
+        result = schedule([8, 16], [(0, 1, FS, 4)])
+        columns = result.columns('2024-01-01')  # a Monday
+        self.assertEqual(columns['earlyStart'], ['2024-01-01T08:00', '2024-01-02T13:00'])
+        self.assertEqual(columns['earlyFinish'], ['2024-01-01T17:00', '2024-01-04T12:00'])
+        self.assertEqual(columns['totalSlack'], [0.0, 0.0])
+
+
+class CycleTests(unittest.TestCase):
+
+    def test_cycle_tasks_are_left_unscheduled(self):
+        # A <-> B form a cycle; C is independent.
+        result = schedule([8, 8, 4], [(0, 1, FS, 0), (1, 0, FS, 0)])
+        self.assertEqual(result.cycle_tasks, 2)
+        self.assertTrue(np.isnan(result.early_start[:2]).all())
+        self.assertEqual(result.early_start[2], 0)
+        self.assertEqual(result.finish, 4)
+        self.assertEqual(result.columns('2024-01-01')['isCritical'], [None, None, True])
+
+    def test_link_closing_a_cycle_raises(self):
+        network = cpm.Network([8, 8, 8], [0, 1], [1, 2], [FS, FS], [0, 0])
+        network.schedule()
+        network.add_link(2, 0)
+        with self.assertRaises(cpm.CycleError):
+            network.reschedule()
+
+
+class RescheduleTests(unittest.TestCase):
+
+    def test_reschedule_matches_a_full_pass(self):
+        # A(8) -FS-> B(8) -SS+2-> C(4), D(8) -FF-> C.
+        durations = [8, 8, 4, 8]
+        links = [(0, 1, FS, 0), (1, 2, SS, 2), (3, 2, FF, 0)]
+        network = cpm.Network(durations, *zip(*links))
+        network.schedule()
+        network.set_duration(0, 16)
+        network.add_link(3, 1, SF, 4)
+        result, forward, backward = network.reschedule()
+
+        durations[0] = 16
+        expected = schedule(durations, links + [(3, 1, SF, 4)])
+        for name in ('early_start', 'early_finish', 'late_start', 'late_finish', 'total_slack', 'free_slack'):
+            np.testing.assert_allclose(getattr(result, name), getattr(expected, name), err_msg=name)
+        self.assertEqual(result.finish, 24)  # A 0-16, B 16-24, C 18-22
+        self.assertGreater(forward, 0)
+        self.assertGreater(backward, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""orjson response encoding against json.dumps on a parse-shaped body.
+
+Run from api-python/: python -m unittest discover tests
+Skipped when orjson is not installed (the stdlib encoder is then used anyway).
+"""
+import json
+import os
+import sys
+import unittest
+
+from flask import Flask
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_encoder
+from task_records import Record, RecordBuilder
+
+
+class RecordJSONProvider(json_encoder.FastJSONProvider):
+    """As mpp_parser.ParseJSONProvider, without importing the JVM side."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, Record):
+            return o.to_dict()
+        return json_encoder.FastJSONProvider.default(o)
+
+
+def parse_body():
+    build = RecordBuilder()
+    tasks = [
+        build({
+            'id': '1', 'name': 'Planung – Phase 1', 'outline_level': 1, 'is_summary': True,
+            'startDate': '2024-01-01T08:00', 'duration': 5.0, 'percentComplete': 12.5,
+            'cost': 1234.56, 'baselineCount': None, 'isCritical': False,
+            'notes': 'tab\there, quote " and backslash \\, DEL \x7f, emoji \U0001F680, 日本',
+            'predecessors': [], 'successors': [{'successorTaskId': '2', 'relationship': 'FS', 'lagDays': 0.0}],
+            'customFields': {'Zone': 'Ü-7', 'Count': 3},
+        }),
+        build({
+            'id': '2', 'name': 'Build', 'outline_level': 2, 'is_summary': False,
+            'startDate': '2024-01-08T08:00', 'duration': 0.333, 'percentComplete': 0,
+            'cost': -0.5, 'baselineCount': 40, 'isCritical': True, 'notes': '',
+            'predecessors': [{'predecessorTaskId': '1', 'relationship': 'FS', 'lagDays': -1.5}],
+            'successors': [], 'customFields': None,
+        }),
+    ]
+    return {
+        'success': True,
+        'project': {'name': 'Démo', 'startDate': '2024-01-01T08:00', 'totalHours': 2**40},
+        'summary': {'totalTasks': 2, 'relations': 1},
+        'tasks': tasks,
+        'timings': {'totalSeconds': 0.012345, 'stages': {'read': 0.25, 'fields': 0.001}},
+    }
+
+
+def stdlib_dumps(obj):
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), default=RecordJSONProvider.default).encode('utf-8')
+
+
+@unittest.skipUnless(json_encoder.ORJSON in json_encoder.available(), 'orjson not installed')
+class ParityTests(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.provider = RecordJSONProvider(self.app, json_encoder.ORJSON)
+
+    def test_parse_body_bytes_match_json_dumps(self):
+        body = parse_body()
+        self.assertEqual(self.provider.dumps_bytes(body), stdlib_dumps(body))
+        self.assertEqual(self.provider.stats()['fast'], 1)
+        self.assertEqual(self.provider.stats()['fallbacks'], 0)
+
+    def test_text_dumps_match_json_dumps(self):
+        body = parse_body()
+        self.assertEqual(self.provider.dumps(body, separators=(',', ':')), stdlib_dumps(body).decode('ascii'))
+
+    def test_known_float_spellings_differ(self):
+        # Values are equal; only the spelling differs from json.dumps.
+        for value, fast, stdlib in ((1e16, b'1e16', b'1e+16'), (1e20, b'1e20', b'1e+20'),
+                                    (1e-5, b'0.00001', b'1e-05'), (1e-6, b'1e-6', b'1e-06')):
+            self.assertEqual(self.provider.dumps_bytes([value]), b'[' + fast + b']')
+            self.assertEqual(stdlib_dumps([value]), b'[' + stdlib + b']')
+            self.assertEqual(json.loads(self.provider.dumps_bytes([value])), [value])
+
+    def test_non_finite_floats_are_null(self):
+        body = {'a': float('nan'), 'b': float('inf'), 'c': float('-inf')}
+        self.assertEqual(self.provider.dumps_bytes(body), b'{"a":null,"b":null,"c":null}')
+        self.assertEqual(stdlib_dumps(body), b'{"a":NaN,"b":Infinity,"c":-Infinity}')
+
+    def test_unsupported_values_fall_back_to_stdlib(self):
+        body = {'big': 2**70, 'byId': {1: 'int key'}}
+        self.assertEqual(self.provider.dumps_bytes(body), stdlib_dumps(body))
+        self.assertEqual(self.provider.stats()['fallbacks'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
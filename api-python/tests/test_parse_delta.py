@@ -0,0 +1,91 @@
+"""Snapshot deltas (/parse?since=) on small hand-built parse bodies.
+
+Run from api-python/: python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parse_delta
+
+
+def task(task_id, name, duration=8, predecessors=()):
+    return {
+        'id': task_id,
+        'name': name,
+        'duration': duration,
+        'predecessors': [
+            {'predecessorTaskId': source, 'relationship': relationship, 'lagDays': lag}
+            for source, relationship, lag in predecessors
+        ],
+    }
+
+
+def body(*tasks):
+    return {'success': True, 'project': {'name': 'Demo'}, 'summary': {'totalTasks': len(tasks)}, 'tasks': list(tasks)}
+
+
+OLD = body(
+    task('1', 'Design'),
+    task('2', 'Build', 16, [('1', 'FS', 0)]),
+    task('3', 'Retire'),
+)
+NEW = body(
+    task('1', 'Design'),
+    task('2', 'Build', 24, [('1', 'FS', 2)]),
+    task('4', 'Test', 8, [('2', 'FS', 0)]),
+)
+
+
+class DiffTests(unittest.TestCase):
+
+    def test_added_removed_and_modified_tasks(self):
+        delta = parse_delta.diff(OLD, NEW)
+        tasks = delta['tasks']
+        self.assertEqual(delta['mode'], 'delta')
+        self.assertEqual(delta['project'], {'name': 'Demo'})
+        self.assertEqual([entry['id'] for entry in tasks['added']], ['4'])
+        self.assertEqual(tasks['added'][0]['task'], NEW['tasks'][2])
+        self.assertEqual(tasks['removed'], ['3'])
+        self.assertEqual(tasks['unchanged'], 1)
+        [modified] = tasks['modified']
+        self.assertEqual(modified['id'], '2')
+        self.assertEqual(modified['changes'], {'duration': {'from': 16, 'to': 24}})
+        self.assertEqual(modified['hash'], parse_delta.task_hash(NEW['tasks'][1]))
+
+    def test_changed_lag_is_one_removed_and_one_added_edge(self):
+        edges = parse_delta.diff(OLD, NEW)['edges']
+        self.assertEqual(edges['removed'], [{'from': '1', 'to': '2', 'relationship': 'FS', 'lagDays': 0}])
+        self.assertEqual(edges['added'], [
+            {'from': '1', 'to': '2', 'relationship': 'FS', 'lagDays': 2},
+            {'from': '2', 'to': '4', 'relationship': 'FS', 'lagDays': 0},
+        ])
+
+    def test_relations_alone_do_not_modify_a_task(self):
+        old = body(task('1', 'Design'), task('2', 'Build', predecessors=[('1', 'FS', 0)]))
+        new = body(task('1', 'Design'), task('2', 'Build', predecessors=[('1', 'SS', 0)]))
+        delta = parse_delta.diff(old, new)
+        self.assertEqual(delta['tasks']['modified'], [])
+        self.assertEqual(delta['tasks']['unchanged'], 2)
+        self.assertEqual(len(delta['edges']['added']), 1)
+
+    def test_fields_projection_without_predecessors(self):
+        full = parse_delta.diff(OLD, NEW)
+        delta = parse_delta.diff(OLD, NEW, ['id', 'name'])
+        self.assertNotIn('edges', delta)
+        tasks = delta['tasks']
+        self.assertEqual(tasks['added'][0]['task'], {'id': '4', 'name': 'Test'})
+        # The change is outside the kept fields: still modified, same hash as
+        # the unprojected delta, with no kept field to report.
+        [modified] = tasks['modified']
+        self.assertEqual(modified['task'], {'id': '2', 'name': 'Build'})
+        self.assertEqual(modified['changes'], {})
+        self.assertEqual(modified['hash'], full['tasks']['modified'][0]['hash'])
+        self.assertEqual(tasks['added'][0]['hash'], full['tasks']['added'][0]['hash'])
+        self.assertEqual(tasks['unchanged'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+import os
+import queue
+import threading
+import time
+import traceback
+import multiprocessing
+
+
+class WorkerPoolBusy(Exception):
+    pass
+
+
+class WorkerParseError(Exception):
+    pass
+
+
+class WorkerCrashed(WorkerParseError):
+    pass
+
+
+def _rss_mb():
+    try:
+        with open('/proc/self/statm') as fh:
+            resident_pages = int(fh.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except Exception:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _worker_main(conn, heap, max_parses, max_rss_mb):
+    """Child process loop: own JVM, one ProjectParser, serve parse requests.
+
+    Requests are (source, include_timings); replies are (status, payload,
+    recycle, meta) where meta carries the parse timings and a JVM heap/GC
+    snapshot. The child exits after replying with recycle=True so the
+    supervisor can start a fresh process in its place.
+    """
+    os.environ['_JAVA_OPTIONS'] = f"-Xmx{heap}"
+    import mpp_parser
+    import parse_metrics
+
+    parser = None
+    if mpp_parser.init_jvm():
+        parser = mpp_parser.ProjectParser()
+
+    parses = 0
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        if message is None:
+            return
+        if parser is None:
+            conn.send(('error', "JVM Init Failed", True, None))
+            return
+        source, options, include_timings = message
+        meta = {}
+        try:
+            timings = parse_metrics.ParseTimings()
+            res = parser.parse_file(source, timings=timings, options=options)
+            body, meta['timings'] = mpp_parser.serialize_result(res, timings, include_timings)
+            reply = ('ok', body)
+        except Exception as e:
+            traceback.print_exc()
+            reply = ('error', str(e))
+        meta['jvm'] = parse_metrics.jvm_snapshot()
+        parses += 1
+        recycle = (max_parses > 0 and parses >= max_parses) or (max_rss_mb > 0 and _rss_mb() > max_rss_mb)
+        conn.send(reply + (recycle, meta))
+        if recycle:
+            return
+
+
+class _Worker:
+    def __init__(self, ctx, heap, max_parses, max_rss_mb):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, heap, max_parses, max_rss_mb),
+            name='mpp-parse-worker',
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def stop(self, graceful=True):
+        if graceful and self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except Exception:
+                pass
+            self.process.join(2)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(2)
+        self.conn.close()
+
+
+class ParseWorkerPool:
+    """Supervised pool of parse processes, each with its own bounded-heap JVM.
+
+    Request threads borrow an idle worker, send it a file path or the upload
+    bytes and block for the serialized JSON body, so neither the GIL nor a
+    single JVM is shared between concurrent parses. At most ``max_queue`` requests may wait for a
+    worker before WorkerPoolBusy is raised. A worker is replaced after
+    ``max_parses`` parses, when its RSS passes ``max_rss_mb``, when it times
+    out, or when it dies (e.g. on a pathological file). ``timeout`` bounds
+    the whole call, waiting for a worker included, and should stay below the
+    caller's own timeout (callParser gives up after 120s) so no worker keeps
+    parsing for a client that has gone.
+    """
+
+    def __init__(self, processes, max_queue=8, max_parses=50, max_rss_mb=0, heap='256m', timeout=100):
+        self.processes = max(1, int(processes))
+        self.max_queue = max(0, int(max_queue))
+        self.max_parses = int(max_parses)
+        self.max_rss_mb = float(max_rss_mb)
+        self.heap = heap
+        self.timeout = float(timeout)
+        self._ctx = multiprocessing.get_context('spawn')
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._waiting = 0
+        self._jvm = {}
+        self.completed = 0
+        self.failed = 0
+        self.recycled = 0
+        self.crashed = 0
+        self.rejected = 0
+
+    def _spawn(self):
+        return _Worker(self._ctx, self.heap, self.max_parses, self.max_rss_mb)
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            workers = [self._spawn() for _ in range(self.processes)]
+            for worker in workers:
+                self._idle.put(worker)
+            self._started = True
+
+    def _checkout(self, deadline):
+        with self._lock:
+            if self._idle.empty() and self._waiting >= self.max_queue:
+                self.rejected += 1
+                raise WorkerPoolBusy(f"All {self.processes} parse workers busy and {self._waiting} requests queued")
+            self._waiting += 1
+        try:
+            return self._idle.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            with self._lock:
+                self.rejected += 1
+            raise WorkerPoolBusy(f"No parse worker available within {self.timeout}s")
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def parse(self, source, include_timings=False, options=None):
+        """Parse ``source`` (path or bytes) in a worker; returns (JSON body, timings dict)."""
+        deadline = time.monotonic() + self.timeout
+        self.start()
+        worker = self._checkout(deadline)
+        replace = False
+        try:
+            try:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    with self._lock:
+                        self.rejected += 1
+                    raise WorkerPoolBusy(f"No parse worker available within {self.timeout}s")
+                worker.conn.send((source, options, include_timings))
+                if not worker.conn.poll(remaining):
+                    replace = True
+                    with self._lock:
+                        self.crashed += 1
+                    raise WorkerCrashed(f"Parse worker timed out after {self.timeout}s")
+                status, payload, recycle, meta = worker.conn.recv()
+            except (EOFError, OSError) as e:
+                replace = True
+                with self._lock:
+                    self.crashed += 1
+                raise WorkerCrashed(f"Parse worker exited unexpectedly: {e or worker.process.exitcode}")
+            if recycle:
+                replace = True
+                with self._lock:
+                    self.recycled += 1
+            with self._lock:
+                if meta and meta.get('jvm'):
+                    self._jvm[worker.process.pid] = meta['jvm']
+                if status == 'ok':
+                    self.completed += 1
+                else:
+                    self.failed += 1
+            if status != 'ok':
+                raise WorkerParseError(payload)
+            return payload, meta['timings']
+        finally:
+            if replace:
+                with self._lock:
+                    self._jvm.pop(worker.process.pid, None)
+                worker.stop(graceful=False)
+                worker = self._spawn()
+            self._idle.put(worker)
+
+    def shutdown(self):
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            worker.stop()
+
+    def jvm_snapshots(self):
+        """Latest JVM heap/GC snapshot reported by each live worker."""
+        with self._lock:
+            return [(f"worker-{pid}", snap) for pid, snap in sorted(self._jvm.items())]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'processes': self.processes,
+                'started': self._started,
+                'idle': self._idle.qsize(),
+                'waiting': self._waiting,
+                'maxQueue': self.max_queue,
+                'completed': self.completed,
+                'failed': self.failed,
+                'recycled': self.recycled,
+                'crashed': self.crashed,
+                'rejected': self.rejected,
+            }
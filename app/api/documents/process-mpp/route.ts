@@ -1,12 +1,25 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { query, execute, refreshRollups } from '@/lib/db';
+import { query, execute, refreshProjectRollup, refreshRollups } from '@/lib/db';
 import { downloadFile } from '@/lib/azure-storage';
-import { mapMppOutput } from '@/lib/ingest/mpp-mapper';
+import { createMppOutputMapper, mapMppOutput, type MppTask } from '@/lib/ingest/mpp-mapper';
+import { forEachColumnarTask } from '@/lib/ingest/mpp-columns';
 import { toIsoDateOnly } from '@/lib/date-utils';
 
 const DEFAULT_MPP_PARSER_URL = 'http://localhost:8080';
+// Parser field preset covering what mapMppOutput reads; other fields are not extracted.
+const PARSER_FIELDS = 'fields=ingest';
 
-async function callParser(parserUrl: string, fileName: string, fileBuffer: Buffer) {
+// With MPP_PARSER_ROLLUPS=true the parser also rolls hours, costs and dates up
+// to every summary task, so only this project's own row is refreshed here.
+function parserRollups(): boolean {
+  return process.env.MPP_PARSER_ROLLUPS === 'true';
+}
+
+function parserQuery(): string {
+  return parserRollups() ? `${PARSER_FIELDS}&rollups=1` : PARSER_FIELDS;
+}
+
+async function callParser(parserUrl: string, fileName: string, fileBuffer: Buffer, query = `?${parserQuery()}`) {
   const controller = new AbortController();
   const timeoutId = setTimeout(() => controller.abort(), 120000);
 
@@ -18,7 +31,7 @@ async function callParser(parserUrl: string, fileName: string, fileBuffer: Buffe
       fileName,
     );
 
-    const response = await fetch(`${parserUrl.replace(/\/$/, '')}/parse`, {
+    const response = await fetch(`${parserUrl.replace(/\/$/, '')}/parse${query}`, {
       method: 'POST',
       body: parserFormData,
       signal: controller.signal,
@@ -42,6 +55,124 @@ async function callParser(parserUrl: string, fileName: string, fileBuffer: Buffe
   }
 }
 
+/**
+ * Calls the parser in NDJSON mode (`/parse?format=ndjson`) and hands each task
+ * to `onTask` as soon as its line arrives, so mapping overlaps the parse.
+ */
+async function callParserStream(
+  parserUrl: string,
+  fileName: string,
+  fileBuffer: Buffer,
+  onTask: (task: MppTask) => void,
+) {
+  const controller = new AbortController();
+  const timeoutId = setTimeout(() => controller.abort(), 120000);
+
+  try {
+    const parserFormData = new FormData();
+    parserFormData.append(
+      'file',
+      new Blob([new Uint8Array(fileBuffer)], { type: 'application/octet-stream' }),
+      fileName,
+    );
+
+    const response = await fetch(`${parserUrl.replace(/\/$/, '')}/parse?format=ndjson&${parserQuery()}`, {
+      method: 'POST',
+      body: parserFormData,
+      signal: controller.signal,
+    });
+
+    if (!response.ok || !response.body) {
+      const text = await response.text().catch(() => '');
+      throw new Error(`Parser failed: ${text || `HTTP ${response.status}`}`);
+    }
+
+    let project: unknown = null;
+    let summary: unknown = null;
+    let buffered = '';
+    const decoder = new TextDecoder();
+    const handleLine = (line: string) => {
+      if (!line.trim()) return;
+      const row = JSON.parse(line);
+      if (row.type === 'task') onTask(row.task);
+      else if (row.type === 'project') project = row.project;
+      else if (row.type === 'summary') summary = row.summary;
+      else if (row.type === 'error') throw new Error(row.error || 'Parser stream failed');
+    };
+
+    const reader = response.body.getReader();
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffered += decoder.decode(value, { stream: true });
+      let newline = buffered.indexOf('\n');
+      while (newline !== -1) {
+        handleLine(buffered.slice(0, newline));
+        buffered = buffered.slice(newline + 1);
+        newline = buffered.indexOf('\n');
+      }
+    }
+    handleLine(buffered + decoder.decode());
+
+    if (!summary) throw new Error('Parser stream ended before the summary line');
+    return { success: true, project, summary };
+  } catch (err: unknown) {
+    const msg = err instanceof Error ? err.message : String(err);
+    throw new Error(`Parser fetch failed via MPP_PARSER_URL (${parserUrl}): ${msg}`);
+  } finally {
+    clearTimeout(timeoutId);
+  }
+}
+
+/**
+ * Submits the file to the parser's job queue (`POST /jobs`) and polls until the
+ * result is ready, so a long parse does not hold one request open for minutes.
+ */
+async function callParserJob(parserUrl: string, fileName: string, fileBuffer: Buffer) {
+  const baseUrl = parserUrl.replace(/\/$/, '');
+  const deadline = Date.now() + Number(process.env.MPP_PARSER_JOB_TIMEOUT_MS || 900000);
+
+  try {
+    const parserFormData = new FormData();
+    parserFormData.append(
+      'file',
+      new Blob([new Uint8Array(fileBuffer)], { type: 'application/octet-stream' }),
+      fileName,
+    );
+
+    const submitted = await fetch(`${baseUrl}/jobs?${parserQuery()}`, { method: 'POST', body: parserFormData });
+    if (!submitted.ok) {
+      const text = await submitted.text().catch(() => '');
+      throw new Error(`Parser job submit failed: ${text || `HTTP ${submitted.status}`}`);
+    }
+    const { jobId } = await submitted.json();
+
+    for (;;) {
+      const statusResponse = await fetch(`${baseUrl}/jobs/${jobId}`);
+      if (!statusResponse.ok) throw new Error(`Parser job status failed: HTTP ${statusResponse.status}`);
+      const job = await statusResponse.json();
+      if (job.status === 'failed') throw new Error(job.error || 'Parser job failed');
+      if (job.status === 'succeeded') break;
+      if (Date.now() > deadline) throw new Error(`Parser job ${jobId} timed out (${job.progress?.stage})`);
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+    }
+
+    const response = await fetch(`${baseUrl}/jobs/${jobId}/result`);
+    if (!response.ok) {
+      const text = await response.text().catch(() => '');
+      throw new Error(`Parser failed: ${text || `HTTP ${response.status}`}`);
+    }
+    const payload = await response.json();
+    if (!payload?.success) {
+      throw new Error(payload?.error || 'Parser returned invalid payload');
+    }
+    return payload;
+  } catch (err: unknown) {
+    const msg = err instanceof Error ? err.message : String(err);
+    throw new Error(`Parser fetch failed via MPP_PARSER_URL (${parserUrl}): ${msg}`);
+  }
+}
+
 const columnTypeCache = new Map<string, Map<string, string>>();
 
 async function getColumnTypes(table: string): Promise<Map<string, string>> {
@@ -156,10 +287,23 @@ export async function POST(req: NextRequest) {
       process.env.MPP_PARSER_URL ||
       process.env.NEXT_PUBLIC_MPP_PARSER_URL ||
       DEFAULT_MPP_PARSER_URL;
-    const parsed = await callParser(parserUrl, doc.file_name, fileBuffer as Buffer);
-
-    const parserTasks = parsed.tasks || parsed.data?.tasks || [];
-    const mapped = mapMppOutput(parserTasks, projectId);
+    let mapped: ReturnType<typeof mapMppOutput>;
+    if (process.env.MPP_PARSER_STREAM === 'true') {
+      const mapper = createMppOutputMapper(projectId);
+      await callParserStream(parserUrl, doc.file_name, fileBuffer as Buffer, (task) => mapper.push(task));
+      mapped = mapper.result();
+    } else if (process.env.MPP_PARSER_FORMAT === 'columns') {
+      const mapper = createMppOutputMapper(projectId);
+      const parsed = await callParser(parserUrl, doc.file_name, fileBuffer as Buffer, `?format=columns&${parserQuery()}`);
+      forEachColumnarTask(parsed, (task) => mapper.push(task));
+      mapped = mapper.result();
+    } else {
+      const parsed = process.env.MPP_PARSER_JOBS === 'true'
+        ? await callParserJob(parserUrl, doc.file_name, fileBuffer as Buffer)
+        : await callParser(parserUrl, doc.file_name, fileBuffer as Buffer);
+      const parserTasks = parsed.tasks || parsed.data?.tasks || [];
+      mapped = mapMppOutput(parserTasks, projectId);
+    }
 
     await execute('DELETE FROM sub_tasks WHERE project_id = $1', [projectId]);
     await execute('DELETE FROM tasks WHERE project_id = $1', [projectId]);
@@ -181,7 +325,11 @@ export async function POST(req: NextRequest) {
        WHERE project_id = $2`,
       [doc.id, projectId],
     );
-    try { await refreshRollups(); } catch { /* non-fatal */ }
+    if (parserRollups()) {
+      try { await refreshProjectRollup(projectId); } catch { /* non-fatal */ }
+    } else {
+      try { await refreshRollups(); } catch { /* non-fatal */ }
+    }
 
     return NextResponse.json({ success: true, processedDocumentId: doc.id, ...counts });
   } catch (err: unknown) {
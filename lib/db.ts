@@ -45,6 +45,36 @@ export async function refreshRollups(): Promise<void> {
   }
 }
 
+/**
+ * Rolls one project's units up into its own row (step 5 of refresh_rollups,
+ * for a single project), for ingests whose units, phases and tasks already
+ * carry the parser's rollups. Sites and above catch up on the next full refresh.
+ */
+export async function refreshProjectRollup(projectId: string): Promise<void> {
+  await getPool().query(
+    `UPDATE projects pr SET
+       actual_hours = s.sum_ah, remaining_hours = s.sum_rh, total_hours = s.sum_th,
+       actual_cost = s.sum_ac, remaining_cost = s.sum_rc, scheduled_cost = s.sum_sc,
+       projected_hours = s.sum_ph,
+       baseline_start = s.min_bs, baseline_end = s.max_be,
+       actual_start = s.min_as, actual_end = s.max_ae,
+       progress = s.avg_prog,
+       days = CASE WHEN s.min_bs IS NOT NULL AND s.max_be IS NOT NULL THEN s.max_be - s.min_bs ELSE 0 END,
+       percent_complete = CASE WHEN COALESCE(s.sum_th,0) > 0 THEN ROUND(COALESCE(s.sum_ah,0) / s.sum_th * 100, 2) ELSE 0 END
+     FROM (
+       SELECT project_id,
+         SUM(actual_hours) sum_ah, SUM(remaining_hours) sum_rh, SUM(total_hours) sum_th,
+         SUM(actual_cost) sum_ac, SUM(remaining_cost) sum_rc, SUM(scheduled_cost) sum_sc,
+         SUM(projected_hours) sum_ph,
+         MIN(baseline_start) min_bs, MAX(baseline_end) max_be,
+         MIN(actual_start) min_as, MAX(actual_end) max_ae,
+         AVG(progress) avg_prog
+       FROM units WHERE project_id = $1 GROUP BY project_id
+     ) s WHERE s.project_id = pr.id`,
+    [projectId],
+  );
+}
+
 const VALID_TABLES = new Set([
   'employees', 'portfolios', 'customers', 'sites', 'projects',
   'units', 'phases', 'tasks', 'sub_tasks',
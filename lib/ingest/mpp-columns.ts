@@ -0,0 +1,118 @@
+/**
+ * Reads the parser's columnar output (`/parse?format=columns`): one array per
+ * task field instead of one object per task, with repetitive strings
+ * dictionary-encoded and all-null fields sent as `null`.
+ */
+
+import type { MppRollup, MppTask } from '@/lib/ingest/mpp-mapper';
+
+type DictionaryColumn = { dictionary: unknown[]; indices: Array<number | null> };
+type Column = unknown[] | DictionaryColumn | null;
+
+export interface MppColumnarOutput {
+  success: boolean;
+  format: 'columns';
+  project?: Record<string, unknown>;
+  summary?: Record<string, unknown>;
+  taskCount: number;
+  schema: Record<string, string>;
+  columns: Record<string, Column>;
+  edges: {
+    count: number;
+    from: number[];
+    to: number[];
+    type: number[];
+    lagDays: number[];
+    typeNames: string[];
+    unresolved?: Array<{ edge: number; end: 'from' | 'to'; id: string; name: string; isExternal: boolean }>;
+  };
+  assignments: {
+    count: number;
+    offsets: number[];
+    schema: Record<string, string>;
+    columns: Record<string, Column>;
+  };
+  customFields: Record<string, { rows: number[]; values: unknown[] }>;
+  /** Present with `rollups=1`: one row per summary task. */
+  rollups?: {
+    rows: number[];
+    schema: Record<string, string>;
+    columns: Record<string, Column>;
+  };
+}
+
+function decode(column: Column, length: number): unknown[] {
+  if (column == null) return new Array(length).fill(null);
+  if (Array.isArray(column)) return column;
+  const { dictionary, indices } = column;
+  return indices.map((index) => (index == null ? null : dictionary[index]));
+}
+
+/**
+ * Rebuilds the row-shaped tasks the mapper expects, in parser order. Only the
+ * predecessor side of each dependency is filled in, as the mapper reads nothing else.
+ */
+export function forEachColumnarTask(output: MppColumnarOutput, visit: (task: MppTask) => void): void {
+  const n = output.taskCount;
+  const fields = Object.keys(output.columns).map((key) => [key, decode(output.columns[key], n)] as const);
+
+  const ids = decode(output.columns.id ?? null, n);
+  const names = decode(output.columns.name ?? null, n);
+  const unresolved = new Map((output.edges.unresolved || []).map((u) => [u.edge, u]));
+  const predecessors: NonNullable<MppTask['predecessors']>[] = Array.from({ length: n }, () => []);
+  for (let e = 0; e < output.edges.count; e++) {
+    // Successor links to tasks outside the parse have no task to attach to.
+    const to = output.edges.to[e];
+    if (to < 0) continue;
+    const from = output.edges.from[e];
+    const other = from >= 0
+      ? { id: ids[from], name: names[from] }
+      : unresolved.get(e);
+    if (!other || !other.id) continue;
+    predecessors[to].push({
+      predecessorTaskId: String(other.id),
+      predecessorName: String(other.name ?? ''),
+      relationship: output.edges.typeNames[output.edges.type[e]],
+      lagDays: output.edges.lagDays[e],
+    });
+  }
+
+  const assignmentFields = Object.keys(output.assignments.columns).map(
+    (key) => [key, decode(output.assignments.columns[key], output.assignments.count)] as const,
+  );
+  const custom: Array<Record<string, unknown> | null> = new Array(n).fill(null);
+  for (const [alias, { rows, values }] of Object.entries(output.customFields || {})) {
+    rows.forEach((row, k) => {
+      (custom[row] ??= {})[alias] = values[k];
+    });
+  }
+
+  const rollups: Array<MppRollup | null> = new Array(n).fill(null);
+  if (output.rollups) {
+    const { rows, columns } = output.rollups;
+    const rollupFields = Object.keys(columns).map((key) => [key, decode(columns[key], rows.length)] as const);
+    rows.forEach((row, k) => {
+      const rollup: Record<string, unknown> = {};
+      for (const [key, values] of rollupFields) rollup[key] = values[k];
+      rollups[row] = rollup as unknown as MppRollup;
+    });
+  }
+
+  for (let row = 0; row < n; row++) {
+    const task: MppTask = {};
+    for (const [key, values] of fields) task[key] = values[row];
+    const resourceAssignments: Record<string, unknown>[] = [];
+    for (let a = output.assignments.offsets[row]; a < output.assignments.offsets[row + 1]; a++) {
+      const assignment: Record<string, unknown> = {};
+      for (const [key, values] of assignmentFields) {
+        if (values[a] != null) assignment[key] = values[a];
+      }
+      resourceAssignments.push(assignment);
+    }
+    task.predecessors = predecessors[row];
+    task.resourceAssignments = resourceAssignments;
+    task.customFields = custom[row];
+    task.rollup = rollups[row];
+    visit(task);
+  }
+}
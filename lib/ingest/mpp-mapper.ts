@@ -16,8 +16,33 @@ function i(val: unknown): number {
 function d(val: unknown): string | null {
   return toIsoDateOnly(val);
 }
+function days(start: string | null, end: string | null): number {
+  return start && end ? Math.round((Date.parse(end) - Date.parse(start)) / 86400000) : 0;
+}
+
+/** Parser-side totals over a summary task's leaf tasks (`/parse?rollups=1`). */
+export interface MppRollup {
+  baselineHours: number;
+  actualHours: number;
+  remainingHours: number;
+  projectedHours: number;
+  baselineCost: number;
+  actualCost: number;
+  remainingCost: number;
+  totalHours: number;
+  scheduledCost: number;
+  percentComplete: number;
+  startDate: string | null;
+  endDate: string | null;
+  baselineStartDate: string | null;
+  baselineEndDate: string | null;
+  actualStartDate: string | null;
+  actualEndDate: string | null;
+  leafTasks: number;
+  criticalTasks: number;
+}
 
-interface MppTask {
+export interface MppTask {
   id?: string;
   name?: string;
   outline_level?: number;
@@ -91,6 +116,7 @@ interface MppTask {
   actualUom?: string | null;
   actual_uom?: string | null;
   customFields?: Record<string, unknown> | null;
+  rollup?: MppRollup | null;
   predecessors?: Array<{
     taskId?: string;
     predecessorTaskId?: string;
@@ -105,10 +131,17 @@ interface MppTask {
   [key: string]: unknown;
 }
 
-export function mapMppOutput(
-  parserTasks: MppTask[],
-  projectId: string,
-): { units: Raw[]; phases: Raw[]; tasks: Raw[]; sub_tasks: Raw[] } {
+export interface MppOutputMapper {
+  /** Map one parser task; tasks must arrive in parser (outline) order. */
+  push(t: MppTask): void;
+  result(): { units: Raw[]; phases: Raw[]; tasks: Raw[]; sub_tasks: Raw[] };
+}
+
+/**
+ * Incremental form of mapMppOutput, so tasks can be mapped while the parser
+ * is still streaming them (NDJSON mode).
+ */
+export function createMppOutputMapper(projectId: string): MppOutputMapper {
   const units: Raw[] = [];
   const phases: Raw[] = [];
   const tasks: Raw[] = [];
@@ -119,9 +152,9 @@ export function mapMppOutput(
   let currentPhaseId = '';
   let currentTaskId = '';
 
-  for (const t of parserTasks) {
+  function push(t: MppTask): void {
     const level = i(t.outline_level ?? t.outlineLevel ?? 0);
-    if (level < 2) continue;
+    if (level < 2) return;
 
     const pred = Array.isArray(t.predecessors)
       ? t.predecessors.find((p) =>
@@ -177,6 +210,29 @@ export function mapMppOutput(
       actual_uom: s(t.actualUom ?? t.actual_uom) || null,
     };
 
+    // Summary rows take the parser's rollup, as refresh_rollups() would
+    // compute it from their children.
+    const r = t.rollup;
+    if (r) {
+      Object.assign(base, {
+        baseline_start: d(r.baselineStartDate ?? r.startDate),
+        baseline_end: d(r.baselineEndDate ?? r.endDate),
+        actual_start: d(r.actualStartDate ?? r.startDate),
+        actual_end: d(r.actualEndDate ?? r.endDate),
+        baseline_hours: n(r.baselineHours),
+        actual_hours: n(r.actualHours),
+        remaining_hours: n(r.remainingHours),
+        projected_hours: n(r.projectedHours),
+        total_hours: n(r.totalHours),
+        actual_cost: n(r.actualCost),
+        remaining_cost: n(r.remainingCost),
+        scheduled_cost: n(r.scheduledCost),
+        progress: n(r.percentComplete),
+        percent_complete: n(r.percentComplete),
+      });
+      base.days = days(base.baseline_start as string | null, base.baseline_end as string | null);
+    }
+
     if (level === 2) {
       unitIdx++;
       currentUnitId = s(t.id) || `${projectId}-U${unitIdx}`;
@@ -208,5 +264,17 @@ export function mapMppOutput(
     }
   }
 
-  return { units, phases, tasks, sub_tasks: subTasks };
+  return {
+    push,
+    result: () => ({ units, phases, tasks, sub_tasks: subTasks }),
+  };
+}
+
+export function mapMppOutput(
+  parserTasks: MppTask[],
+  projectId: string,
+): { units: Raw[]; phases: Raw[]; tasks: Raw[]; sub_tasks: Raw[] } {
+  const mapper = createMppOutputMapper(projectId);
+  for (const t of parserTasks) mapper.push(t);
+  return mapper.result();
 }